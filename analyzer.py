@@ -0,0 +1,667 @@
+import argparse
+import json
+import os
+import sys
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from heapq import heapify, heappop
+from operator import itemgetter
+from os import cpu_count
+from feedback_table import EQUAL, load_table, mask_to_ids
+from scoring import pack_feedback
+from symmetry import Symmetry
+from game_logic import CONFIGURATIONS, COMBINATION_LENGTH, SETTINGS
+path_to_file = os.path.dirname(__file__)
+RESULTS_PATH = os.path.join(path_to_file, "optimal.json")
+# Results stored with --save, compared with bots by tournament
+INFINITY = float("inf")
+LANE_LIMIT = 255  # Most combinations, whose part sizes fit in byte lanes
+_analyzers = {}  # Analyzers of this process, they keep their memos
+
+
+class Analyzer:
+    """
+    Computes optimal strategies of the codebreaker for one configuration.
+    States are sets of possible combinations kept as bitsets, which are
+    canonical keys of memoized results. In every state only one guess
+    from every symmetry class of previous guesses is evaluated.
+    Searches use lower bounds to skip guesses, which cannot be better
+    than the best guess found so far. For small states lower bounds
+    of all guesses are computed at once in lanes of big integers
+
+    Attributes:
+        size (int): Number of combinations
+        _table (FeedbackTable): Feedback for every pair of combinations
+        _win (int): Packed feedback of the guessed combination
+        _levels (int): Number of feedbacks other than win, the most
+        children a state can have
+        _lower_bounds (list): Lower bound of total number of guesses
+        for every number of combinations
+        _totals (dict): Minimal total number of guesses for solved states
+        _total_bounds (dict): Lower bounds of total number of guesses
+        for states whose search was cut off
+        _depths (dict): Numbers of guesses sufficient for states
+        _depth_bounds (dict): Numbers of guesses not sufficient for states
+        _feedbacks (list): All packed feedbacks
+        _bounds_low (bytes): Low bytes of lower bounds, indexed by number
+        of combinations up to LANE_LIMIT
+        _bounds_high (bytes): High bytes of these lower bounds
+        _ones (int): One in every 4-byte lane
+        _guess_lanes (int): Guess id in every 4-byte lane
+        _lanes (list): Byte lanes of guesses giving every feedback,
+        for every combination, None until they are needed
+        _symmetries (dict): Symmetries for every set of previous guesses
+        _representatives (dict): Guesses worth evaluating for every set
+        of previous guesses
+
+    Methods:
+        __init__: creates analyzer object
+        lower_bound: returns lower bound of total number of guesses
+        capacity: returns maximal number of combinations solvable in
+    given number of guesses
+        guess_bound: returns lower bound of total number of guesses
+    starting with given guess
+        after: returns symmetries left after one more guess
+        _guess_ids: returns ids of guesses worth evaluating
+        _perfect_guess: checks whether possible combination splits state
+    into single combinations
+        partitions: returns sizes of parts made by guesses worth evaluating
+        _feedback_lanes: returns byte lanes of guesses giving every
+    feedback for combination
+        _lane_keys: returns keys ordering all guesses by lower bound,
+    joined with guess ids
+        candidates: yields guesses worth evaluating, the most promising first
+        children: returns parts of state made by guess
+        total: returns minimal total number of guesses needed to solve
+    every combination of state
+        solvable: checks whether every combination of state can be solved
+    in given number of guesses
+        depth: returns minimal worst-case number of guesses for state
+    """
+    def __init__(self, no_of_colours, duplicates, le):
+        """
+        Creates analyzer object
+
+        Args:
+            no_of_colours (int): Number of allowed colours
+            duplicates (bool): True if duplicates are enabled, False otherwise
+            le (int): Length of combination
+        """
+        self._table = load_table(no_of_colours, duplicates, le)
+        self.size = self._table.size
+        self._win = pack_feedback(le, 0)
+        self._feedbacks = [pack_feedback(red, white)
+                           for red in range(le + 1)
+                           for white in range(le + 1 - red)
+                           if (red, white) != (le - 1, 1)]
+        self._levels = len(self._feedbacks) - 1
+        self._lower_bounds = [self.lower_bound(no_of_combinations)
+                              for no_of_combinations in range(self.size + 1)]
+        bounds = [self.lower_bound(no_of_combinations)
+                  for no_of_combinations in range(LANE_LIMIT + 1)]
+        self._bounds_low = bytes(bound & 0xFF for bound in bounds)
+        self._bounds_high = bytes(bound >> 8 for bound in bounds)
+        self._ones = int.from_bytes(b"\x01\x00\x00\x00" * self.size,
+                                    "little")
+        self._guess_lanes = int.from_bytes(array("I", range(self.size)),
+                                           sys.byteorder)
+        self._lanes = [None] * self.size
+        self._totals = {}
+        self._total_bounds = {}
+        self._depths = {}
+        self._depth_bounds = {}
+        self._symmetries = {}
+        self._representatives = {}
+
+    def lower_bound(self, no_of_combinations):
+        """
+        Returns lower bound of total number of guesses needed to solve
+        given number of combinations. At most one combination is solved
+        with the first guess and every guess has at most _levels children,
+        so combinations fill consecutive levels of the strategy tree
+
+        Args:
+            no_of_combinations (int): Number of possible combinations
+
+        Returns:
+            int: Lower bound of total number of guesses
+        """
+        total = 0
+        level = 1
+        width = 1
+        while no_of_combinations > 0:
+            solved = min(width, no_of_combinations)
+            total += solved * level
+            no_of_combinations -= solved
+            level += 1
+            width *= self._levels
+        return total
+
+    def capacity(self, guesses):
+        """
+        Returns maximal number of combinations solvable in given
+        number of guesses
+
+        Args:
+            guesses (int): Number of guesses
+
+        Returns:
+            int: Maximal number of combinations
+        """
+        return sum(self._levels ** level for level in range(guesses))
+
+    def guess_bound(self, no_of_combinations, sizes):
+        """
+        Returns lower bound of total number of guesses for state solved
+        starting with guess, which makes parts of given sizes
+
+        Args:
+            no_of_combinations (int): Number of possible combinations
+            sizes (dict): Size of part for every feedback
+
+        Returns:
+            int: Lower bound of total number of guesses
+        """
+        total = no_of_combinations + sum(map(self._lower_bounds.__getitem__,
+                                             sizes.values()))
+        return total - 1 if self._win in sizes else total
+
+    def after(self, symmetry, guess_id):
+        """
+        Returns symmetries left after one more guess. They do not depend
+        on order of guesses, so they are shared by all states
+        with the same set of previous guesses
+
+        Args:
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+            guess_id (int): Id of the guess
+
+        Returns:
+            Symmetry: Symmetries keeping also the new guess unchanged
+        """
+        guess = self._table.code(guess_id)
+        key = frozenset(symmetry.guesses + (guess,))
+        if key not in self._symmetries:
+            self._symmetries[key] = symmetry.after(guess)
+        return self._symmetries[key]
+
+    def _guess_ids(self, symmetry):
+        """
+        Returns ids of one guess from every symmetry class
+
+        Args:
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+
+        Returns:
+            list or range: Ids of guesses worth evaluating
+        """
+        key = frozenset(symmetry.guesses)
+        if key not in self._representatives:
+            self._representatives[key] = symmetry.representatives(
+                self._table.codebook)
+        return self._representatives[key]
+
+    def _perfect_guess(self, ids):
+        """
+        Checks whether one of possible combinations gives different
+        feedback for all of them. Such a guess reaches the lower bound
+        of total number of guesses for up to _levels + 1 combinations
+
+        Args:
+            ids (array): Ids of possible combinations, at least two
+
+        Returns:
+            bool: True if there is such a combination. Otherwise False
+        """
+        pick = itemgetter(*ids)
+        row = self._table.row
+        return any(len(set(pick(row(guess_id)))) == len(ids)
+                   for guess_id in ids)
+
+    def partitions(self, mask, symmetry, ids=None):
+        """
+        Returns sizes of parts of the state made by one guess from every
+        symmetry class. Guesses giving the same feedback pattern are
+        equivalent and only the first of them is kept. Guesses, which
+        do not split the state, are skipped
+
+        Args:
+            mask (int): Bitset of possible combinations
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+            ids (array, optional): Ids of possible combinations, at least
+            two. Defaults to None, which means ids extracted from mask
+
+        Returns:
+            list: Pairs of guess id and dict of part size for every
+            feedback
+        """
+        if ids is None:
+            ids = mask_to_ids(mask, self.size)
+        pick = itemgetter(*ids)
+        row = self._table.row
+        patterns = {}
+        for guess_id in self._guess_ids(symmetry):
+            patterns.setdefault(bytes(pick(row(guess_id))), guess_id)
+        result = []
+        for pattern, guess_id in patterns.items():
+            sizes = {feedback: pattern.count(feedback)
+                     for feedback in set(pattern)}
+            if len(sizes) > 1 or self._win in sizes:
+                result.append((guess_id, sizes))
+        return result
+
+    def _feedback_lanes(self, code_id):
+        """
+        Returns byte lanes marking guesses, which give every feedback
+        for the combination. They are computed once and reused by
+        all states containing the combination
+
+        Args:
+            code_id (int): Id of the combination
+
+        Returns:
+            list: Big integer with 1 in lanes of guesses giving feedback,
+            for every feedback of _feedbacks
+        """
+        lanes = self._lanes[code_id]
+        if lanes is None:
+            row = self._table.row(code_id)
+            lanes = [int.from_bytes(row.translate(EQUAL[feedback]), "little")
+                     for feedback in self._feedbacks]
+            self._lanes[code_id] = lanes
+        return lanes
+
+    def _lane_keys(self, ids):
+        """
+        Returns keys ordering all guesses by lower bound of total number
+        of guesses, then possible guesses first, then lower ids. Part sizes
+        of all guesses are counted at once: every guess gets one byte lane
+        inside a big integer, like in build_table, and lower bounds of parts
+        are summed in the upper half of 4-byte lanes, whose lower half
+        holds guess id
+
+        Args:
+            ids (array): Ids of possible combinations, at most LANE_LIMIT
+
+        Returns:
+            list: Twice the lower bound, plus one for impossible guesses,
+            shifted by 16 bits and joined with guess id, for every guess
+        """
+        wide = bytearray(4 * self.size)
+        bounds = 0
+        for feedback, lanes in zip(self._feedbacks,
+                                   zip(*map(self._feedback_lanes, ids))):
+            sizes = sum(lanes)
+            if not sizes:
+                continue
+            sizes = sizes.to_bytes(self.size, "little")
+            wide[2::4] = sizes.translate(self._bounds_low)
+            wide[3::4] = sizes.translate(self._bounds_high)
+            bounds += int.from_bytes(wide, "little")
+            if feedback == self._win:
+                wide[2::4] = sizes
+                wide[3::4] = bytes(self.size)
+                possible = int.from_bytes(wide, "little")
+        # Guess bound is len(ids) + bounds - 1 for possible guesses
+        keys = (2 * bounds + (2 * len(ids) + 1 << 16) * self._ones -
+                3 * possible + self._guess_lanes)
+        return array("I", keys.to_bytes(4 * self.size,
+                                        sys.byteorder)).tolist()
+
+    def candidates(self, mask, symmetry, ids):
+        """
+        Yields guesses worth evaluating in order of their lower bounds,
+        possible guesses and then lower ids first, as partitions does.
+        For small states bounds of all guesses are found by _lane_keys and
+        guess is partitioned and checked against symmetries only when it is
+        reached, so that guesses cut off by the search cost almost nothing
+
+        Args:
+            mask (int): Bitset of possible combinations
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+            ids (array): Ids of possible combinations, at least two
+
+        Yields:
+            tuple: Lower bound of total number of guesses, guess id
+            and dict of part size for every feedback
+        """
+        no_of_combinations = len(ids)
+        if no_of_combinations > LANE_LIMIT:
+            candidates = sorted(
+                (self.guess_bound(no_of_combinations, sizes),
+                 self._win not in sizes, guess_id, sizes)
+                for guess_id, sizes in self.partitions(mask, symmetry, ids))
+            for guess_bound, _, guess_id, sizes in candidates:
+                yield guess_bound, guess_id, sizes
+            return
+        keys = self._lane_keys(ids)
+        heapify(keys)
+        pick = itemgetter(*ids)
+        row = self._table.row
+        code = self._table.code
+        trivial = symmetry.is_trivial()
+        patterns = set()
+        while keys:
+            key = heappop(keys)
+            guess_id = key & 0xFFFF
+            pattern = bytes(pick(row(guess_id)))
+            if pattern in patterns or not (
+                    trivial or symmetry.is_canonical(code(guess_id))):
+                continue
+            patterns.add(pattern)
+            sizes = {feedback: pattern.count(feedback)
+                     for feedback in set(pattern)}
+            if len(sizes) > 1 or self._win in sizes:
+                yield key >> 17, guess_id, sizes
+
+    def children(self, mask, guess_id, sizes):
+        """
+        Returns parts of the state made by guess, the biggest first
+
+        Args:
+            mask (int): Bitset of possible combinations
+            guess_id (int): Id of the guess
+            sizes (dict): Size of part for every feedback
+
+        Returns:
+            list: Pairs of part size and bitset of part, without win
+        """
+        return [(size, mask & self._table.mask(guess_id, feedback))
+                for size, feedback in sorted(((size, feedback) for feedback,
+                                              size in sizes.items()),
+                                             reverse=True)
+                if feedback != self._win]
+
+    def total(self, mask, symmetry, limit=INFINITY):
+        """
+        Returns minimal total number of guesses needed to solve every
+        combination of the state. Search is cut off at the limit
+
+        Args:
+            mask (int): Bitset of possible combinations
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+            limit (int, optional): Totals not lower than the limit are not
+            needed. Defaults to INFINITY.
+
+        Returns:
+            int: Minimal total if it is lower than the limit,
+            otherwise lower bound not lower than the limit
+        """
+        no_of_combinations = mask.bit_count()
+        if no_of_combinations <= 2:
+            return 2 * no_of_combinations - 1
+        if mask in self._totals:
+            return self._totals[mask]
+        bound = max(self._total_bounds.get(mask, 0),
+                    self._lower_bounds[no_of_combinations])
+        if bound >= limit:
+            return bound
+        ids = mask_to_ids(mask, self.size)
+        if no_of_combinations <= self._levels + 1 and \
+                self._perfect_guess(ids):
+            self._totals[mask] = bound
+            return bound
+        best = limit
+        found = False
+        cut_off = INFINITY  # The lowest bound of guesses not reaching best
+        for guess_bound, guess_id, sizes in self.candidates(mask, symmetry,
+                                                            ids):
+            if guess_bound >= best:
+                cut_off = min(cut_off, guess_bound)
+                break
+            child_symmetry = self.after(symmetry, guess_id)
+            total = guess_bound
+            for size, child in self.children(mask, guess_id, sizes):
+                child_bound = self._lower_bounds[size]
+                child_total = self.total(child, child_symmetry,
+                                         best - total + child_bound)
+                total += child_total - child_bound
+                if total >= best:
+                    cut_off = min(cut_off, total)
+                    break
+            else:
+                best = total
+                found = True
+        if found:
+            self._totals[mask] = best
+            return best
+        self._total_bounds[mask] = cut_off
+        return cut_off
+
+    def solvable(self, mask, symmetry, guesses):
+        """
+        Checks whether every combination of the state can be solved
+        in given number of guesses
+
+        Args:
+            mask (int): Bitset of possible combinations
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+            guesses (int): Number of guesses
+
+        Returns:
+            bool: True if state can be solved in time. Otherwise False
+        """
+        no_of_combinations = mask.bit_count()
+        if no_of_combinations <= 1:
+            return no_of_combinations <= guesses
+        if guesses >= self._depths.get(mask, INFINITY):
+            return True
+        if guesses <= self._depth_bounds.get(mask, 0) or \
+                no_of_combinations > self.capacity(guesses):
+            return False
+        ids = mask_to_ids(mask, self.size)
+        if no_of_combinations <= self._levels + 1 and \
+                self._perfect_guess(ids):
+            self._depths[mask] = 2
+            return True
+        limit = self.capacity(guesses - 1)
+        candidates = []
+        for guess_id, sizes in self.partitions(mask, symmetry, ids):
+            biggest = max((size for feedback, size in sizes.items()
+                           if feedback != self._win), default=0)
+            if biggest <= limit:
+                candidates.append((biggest, self._win not in sizes,
+                                   guess_id, sizes))
+        candidates.sort()
+        for _, _, guess_id, sizes in candidates:
+            child_symmetry = self.after(symmetry, guess_id)
+            if all(self.solvable(child, child_symmetry, guesses - 1)
+                   for _, child in self.children(mask, guess_id, sizes)):
+                self._depths[mask] = guesses
+                return True
+        self._depth_bounds[mask] = guesses
+        return False
+
+    def depth(self, mask, symmetry):
+        """
+        Returns minimal worst-case number of guesses for the state
+
+        Args:
+            mask (int): Bitset of possible combinations
+            symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+
+        Returns:
+            int: Minimal worst-case number of guesses
+        """
+        guesses = 1
+        while not self.solvable(mask, symmetry, guesses):
+            guesses += 1
+        return guesses
+
+
+def _analyzer(no_of_colours, duplicates, le):
+    """
+    Returns analyzer of this process for given configuration
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+
+    Returns:
+        Analyzer: Analyzer keeping memos of earlier jobs
+    """
+    key = (no_of_colours, duplicates, le)
+    if key not in _analyzers:
+        _analyzers[key] = Analyzer(no_of_colours, duplicates, le)
+    return _analyzers[key]
+
+
+def _analyze_child(job):
+    """
+    Solves one part of the state left after the first guess.
+    Used by worker processes
+
+    Args:
+        job (tuple): Configuration, id of the first guess, bitset of part,
+        limit of total number of guesses and limit of worst-case
+        number of guesses
+
+    Returns:
+        tuple: Minimal total number of guesses (or its lower bound if it
+        reaches the limit) and minimal worst-case number of guesses
+        (or None if it exceeds the limit)
+    """
+    configuration, guess_id, child, total_limit, depth_limit = job
+    analyzer = _analyzer(*configuration)
+    symmetry = Symmetry(configuration[0], configuration[2])
+    symmetry = symmetry.after(analyzer._table.code(guess_id))
+    total = analyzer.total(child, symmetry, total_limit)
+    if analyzer.solvable(child, symmetry, depth_limit):
+        return total, analyzer.depth(child, symmetry)
+    return total, None
+
+
+def analyze(no_of_colours, duplicates, le, workers=None):
+    """
+    Computes optimal average and worst-case number of guesses for
+    given configuration. Parts of the state left after every class of
+    the first guess are solved in a process pool. The most promising
+    first guess is solved first, so that its results cut off
+    searches of the others
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        workers (int, optional): Number of processes. Defaults to None,
+        which means number of processors
+
+    Returns:
+        dict: Number of combinations, minimal total and mean number
+        of guesses, minimal worst-case number of guesses and
+        the first guesses reaching them
+    """
+    configuration = (no_of_colours, duplicates, le)
+    analyzer = _analyzer(*configuration)
+    mask = (1 << analyzer.size) - 1
+    candidates = sorted(
+        (analyzer.guess_bound(analyzer.size, sizes), guess_id, sizes)
+        for guess_id, sizes in analyzer.partitions(mask, Symmetry(
+            no_of_colours, le)))
+    best_total = best_depth = INFINITY
+    total_guess = depth_guess = None
+    with ProcessPoolExecutor(workers or cpu_count()) as pool:
+        for guess_bound, guess_id, sizes in candidates:
+            children = analyzer.children(mask, guess_id, sizes)
+            jobs = [(configuration, guess_id, child,
+                     best_total - guess_bound + analyzer.lower_bound(size),
+                     best_depth - 2 if best_depth < INFINITY
+                     else analyzer.size)
+                    for size, child in children]
+            results = list(pool.map(_analyze_child, jobs))
+            total = guess_bound + sum(child_total - analyzer.lower_bound(size)
+                                      for (size, _), (child_total, _)
+                                      in zip(children, results))
+            if total < best_total:
+                best_total, total_guess = total, guess_id
+            depths = [depth for _, depth in results]
+            if None not in depths:
+                depth = 1 + max(depths, default=0)
+                if depth < best_depth:
+                    best_depth, depth_guess = depth, guess_id
+    code = analyzer._table.code
+    return {
+        "combinations": analyzer.size,
+        "total_guesses": best_total,
+        "mean_guesses": best_total / analyzer.size,
+        "max_guesses": best_depth,
+        "mean_first_guess": list(code(total_guess)),
+        "max_first_guess": list(code(depth_guess))
+    }
+
+
+def load_results(path=RESULTS_PATH):
+    """
+    Returns stored results of analysis
+
+    Args:
+        path (str, optional): Path to results. Defaults to RESULTS_PATH.
+
+    Returns:
+        dict: Maps "colours, duplicates, length" to results,
+        empty if there are no results
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as filehandle:
+        return json.load(filehandle)
+
+
+def result_key(no_of_colours, duplicates, le):
+    """
+    Returns key of results for given configuration
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+
+    Returns:
+        str: Key of results
+    """
+    dupes = "d" if duplicates else "u"
+    return f"{no_of_colours}_{dupes}_{le}"
+
+
+def main():
+    """
+    Analyzes configurations given in command line, prints results
+    and with --save stores them for comparison with bots
+    """
+    parser = argparse.ArgumentParser(description="Mastermind optimal "
+                                     "strategy analyzer")
+    parser.add_argument("--configuration", type=int, action="append",
+                        choices=range(len(CONFIGURATIONS)),
+                        help="configuration from CONFIGURATIONS, "
+                        "all if neither it nor --colours is given")
+    parser.add_argument("--colours", type=int, help="custom configuration")
+    parser.add_argument("--length", type=int, default=COMBINATION_LENGTH)
+    parser.add_argument("--duplicates", action="store_true")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--save", action="store_true",
+                        help="store results next to the earlier ones")
+    args = parser.parse_args()
+    configurations = []
+    if args.colours:
+        configurations.append((args.colours, args.duplicates, args.length))
+    for configuration in args.configuration or ([] if args.colours
+                                                else range(len(SETTINGS))):
+        duplicates, blanks = SETTINGS[configuration]
+        configurations.append((7 if blanks else 6, duplicates,
+                               COMBINATION_LENGTH))
+    results = load_results()
+    for configuration in configurations:
+        result = analyze(*configuration, args.workers)
+        results[result_key(*configuration)] = result
+        print(f"{result_key(*configuration)}: "
+              f"mean {result['mean_guesses']:.4f} "
+              f"({result['total_guesses']}/{result['combinations']}), "
+              f"worst case {result['max_guesses']}")
+    if args.save:
+        with open(RESULTS_PATH, "w") as filehandle:
+            json.dump(results, filehandle, indent=4)
+
+
+if __name__ == "__main__":
+    main()
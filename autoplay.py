@@ -0,0 +1,245 @@
+import time
+from random import Random
+from bots import CODEBREAKERS
+from engine import play_game
+from game_logic import (
+                        CONFIGURATIONS,
+                        NO_OF_ROUNDS,
+                        RED_PIN,
+                        SETTINGS,
+                        VARIANTS,
+                        VARIANT_SIZES,
+                        WHITE_PIN,
+                        game_colours,
+                        )
+from feedback_table import load_table
+from scoring import decode, feedback_pins
+import user_interface
+PACINGS = ["zero", "delay", "step"]
+# zero - games are played at full speed
+# delay - every guess is followed by a fixed delay
+# step - every guess waits for Enter
+DELAY = 0.5  # Seconds after every guess with delay pacing
+FPS = 30  # Maximal number of frames drawn per second
+
+
+class Spectator:
+    """
+    A class used to show games between AI codemaker and AI codebreaker
+    while they are played. Guesses are decoded once and drawn incrementally,
+    and frames are drawn no more often than FPS times per second
+
+    Attributes:
+        _colours (list): Allowed colours
+        _table (FeedbackTable): Feedback for every pair of combinations
+        _title (str): Line above the board
+        _pacing (str): Pacing of guesses (one of PACINGS)
+        _delay (float): Seconds after every guess with delay pacing
+        _frame_time (float): Minimal number of seconds between frames
+        _renderer (Renderer): Draws frames
+        _clock (callable): Returns current time in seconds
+        _sleep (callable): Waits for given number of seconds
+        _guesses (list): Guesses of current game
+        _correctness (list): Correctness of guesses of current game
+        _last_frame (float): Time of the last frame, None if there was none
+
+    Methods:
+        __init__: creates spectator object
+        start: begins showing new game
+        observe: shows guess, called by engine after every guess
+        _frame_due: checks whether frame can be drawn
+        show: draws board of current game
+        finish: shows result of the game
+    """
+    def __init__(self, colours, table, title, pacing=PACINGS[0], delay=DELAY,
+                 fps=FPS, renderer=None, clock=time.monotonic,
+                 sleep=time.sleep):
+        """
+        Creates spectator object
+
+        Args:
+            colours (list): Allowed colours
+            table (FeedbackTable): Feedback for every pair of combinations
+            title (str): Line above the board
+            pacing (str, optional): Pacing of guesses (one of PACINGS).
+            Defaults to zero pacing.
+            delay (float, optional): Seconds after every guess with delay
+            pacing. Defaults to DELAY.
+            fps (float, optional): Maximal number of frames per second.
+            Defaults to FPS.
+            renderer (Renderer, optional): Draws frames. Defaults to None,
+            which means user_interface.RENDERER
+            clock (callable, optional): Returns current time in seconds.
+            Defaults to time.monotonic.
+            sleep (callable, optional): Waits for given number of seconds.
+            Defaults to time.sleep.
+        """
+        self._colours = colours
+        self._table = table
+        self._title = title
+        self._pacing = pacing
+        self._delay = delay
+        self._frame_time = 1 / fps
+        self._renderer = user_interface.RENDERER if renderer is None \
+            else renderer
+        self._clock = clock
+        self._sleep = sleep
+        self._guesses = []
+        self._correctness = []
+        self._last_frame = None
+
+    def start(self):
+        """
+        Begins showing new game. Board of the previous game is drawn
+        from scratch, even if its last frame was skipped
+        """
+        self._guesses = []
+        self._correctness = []
+        self._renderer.forget()
+
+    def observe(self, secret_id, guesses, feedback):
+        """
+        Shows the latest guess according to pacing.
+        Called by engine after every guess
+
+        Args:
+            secret_id (int): Id of the correct combination
+            guesses (list): Ids of guesses so far
+            feedback (bytearray): Packed feedback for guesses so far
+        """
+        for guess_id, result in zip(guesses[len(self._guesses):],
+                                    feedback[len(self._correctness):]):
+            self._guesses.append(decode(self._table.code(guess_id),
+                                        self._colours))
+            self._correctness.append(feedback_pins(result, RED_PIN,
+                                                   WHITE_PIN))
+        if self._pacing == PACINGS[2]:
+            self.show()
+            self._renderer.prompt("Press Enter for next guess")
+            return
+        if self._frame_due():
+            self.show()
+        if self._pacing == PACINGS[1]:
+            self._sleep(self._delay)
+
+    def _frame_due(self):
+        """
+        Checks whether enough time has passed since the last frame
+
+        Returns:
+            bool: True if frame can be drawn. Otherwise False
+        """
+        return self._last_frame is None or \
+            self._clock() - self._last_frame >= self._frame_time
+
+    def show(self):
+        """
+        Draws board of current game
+        """
+        self._renderer.board(self._title, self._guesses, self._correctness)
+        self._last_frame = self._clock()
+
+    def finish(self, record, force=False):
+        """
+        Shows result of the game, if frame can be drawn
+
+        Args:
+            record (GameRecord): Result of the game
+            force (bool, optional): Draws frame regardless of FPS.
+            Defaults to False.
+        """
+        if not (force or self._pacing != PACINGS[0] or self._frame_due()):
+            return
+        self.show()
+        secret = decode(self._table.code(record.secret), self._colours)
+        result = f"guessed in {len(record.guesses)}" if record.won else \
+            f"not guessed in {len(record.guesses)}"
+        self._renderer.line(f"Combination {result} attempts: "
+                            f"{user_interface.colourful_string_gen(secret)}")
+
+
+def autoplay(settings, codebreaker, no_of_games=1, pacing=PACINGS[0],
+             delay=DELAY, fps=FPS, seed=None, renderer=None):
+    """
+    Plays games between codemaker choosing combinations with
+    bot_set_combination and given AI codebreaker, showing them
+    without waiting for the player (unless pacing is step)
+
+    Args:
+        settings (tuple): Duplicates and blanks allowance, combination
+        length and number of colours
+        codebreaker (str): Name of AI Player guessing combinations
+        (key of CODEBREAKERS)
+        no_of_games (int, optional): Number of games. Defaults to 1.
+        pacing (str, optional): Pacing of guesses (one of PACINGS).
+        Defaults to zero pacing.
+        delay (float, optional): Seconds after every guess with delay
+        pacing. Defaults to DELAY.
+        fps (float, optional): Maximal number of frames per second.
+        Defaults to FPS.
+        seed (int, optional): Seed of codemaker and codebreaker.
+        Defaults to None, which means random seed
+        renderer (Renderer, optional): Draws frames. Defaults to None,
+        which means user_interface.RENDERER
+
+    Returns:
+        dict: Number of games, wins, mean and max number of guesses
+    """
+    duplicates, blanks, le, no_of_colours = settings
+    colours = game_colours(blanks, no_of_colours)
+    spectator = Spectator(colours, load_table(len(colours), duplicates, le),
+                          f"{codebreaker} guesses:", pacing, delay, fps,
+                          renderer)
+    rng = Random(seed)
+    games = wins = total_guesses = max_guesses = 0
+    for number in range(no_of_games):
+        spectator.start()
+        record = play_game(colours, duplicates, le, CODEBREAKERS[codebreaker],
+                           max_rounds=NO_OF_ROUNDS, rng=rng,
+                           observer=spectator.observe)
+        spectator.finish(record, force=number == no_of_games - 1)
+        games += 1
+        wins += record.won
+        total_guesses += len(record.guesses)
+        max_guesses = max(max_guesses, len(record.guesses))
+    return {
+        "games": games,
+        "wins": wins,
+        "mean_guesses": total_guesses / games if games else 0.0,
+        "max_guesses": max_guesses
+    }
+
+
+def main():
+    """
+    Shows games between AI Players with parameters given in command line
+    and prints their statistics
+    """
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Mastermind games between AI Players")
+    parser.add_argument("--codebreaker", choices=CODEBREAKERS,
+                        default="Bot_knuth")
+    parser.add_argument("--configuration", type=int, default=2,
+                        choices=range(len(CONFIGURATIONS)))
+    parser.add_argument("--variant", type=int, default=0,
+                        choices=range(len(VARIANTS)))
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--pacing", choices=PACINGS, default=PACINGS[1])
+    parser.add_argument("--delay", type=float, default=DELAY,
+                        help="seconds after every guess with delay pacing")
+    parser.add_argument("--fps", type=float, default=FPS,
+                        help="maximal number of frames per second")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.fps <= 0:
+        parser.error("--fps must be positive")
+    settings = SETTINGS[args.configuration] + VARIANT_SIZES[args.variant]
+    statistics = autoplay(settings, args.codebreaker, args.games,
+                          args.pacing, args.delay, args.fps, args.seed)
+    for name, value in statistics.items():
+        print(f"{name}: {value}")
+
+
+if __name__ == "__main__":
+    main()
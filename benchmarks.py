@@ -0,0 +1,146 @@
+import argparse
+import json
+import os
+import sys
+import timeit
+from random import Random
+from bots import Bot_clever, bot_set_combination
+from game_logic import (
+                        CONFIGURATIONS,
+                        COMBINATION_LENGTH,
+                        MODES,
+                        RED_PIN,
+                        SETTINGS,
+                        Game,
+                        )
+path_to_file = os.path.dirname(__file__)
+BASELINE_PATH = os.path.join(path_to_file, "benchmarks_baseline.json")
+TOLERANCE = 1.5  # Slowdown above which benchmark is reported as regression
+REPEAT = 3  # Number of timing runs, the fastest one is used
+
+
+def _cases(configuration):
+    """
+    Returns benchmarked functions for given configuration.
+    Combinations are drawn from seeded generator, so that every run
+    measures the same work
+
+    Args:
+        configuration (int): Number of configuration from CONFIGURATIONS
+
+    Returns:
+        dict: Maps name of benchmark to function without arguments
+    """
+    duplicates, blanks = SETTINGS[configuration]
+    rng = Random(configuration)
+    game = Game(MODES[1], duplicates, blanks)
+    colours = game.allowed_colours()
+    game._combination = bot_set_combination(colours, duplicates,
+                                            COMBINATION_LENGTH, rng)
+    guess = bot_set_combination(colours, duplicates, COMBINATION_LENGTH, rng)
+    game._guesses.append(guess)
+    bot = Bot_clever(colours, duplicates, COMBINATION_LENGTH)
+    bot._last_guess = guess
+    feedback = [RED_PIN, "White"]
+
+    def update_possible_combinations():
+        bot.update_possible_combinations(feedback, RED_PIN)
+        bot._possible_combinations = range(bot._table.size)
+
+    return {
+        "Game.check_combination": game.check_combination,
+        "Game.check_duplicates": lambda: game.check_duplicates(guess),
+        "Bot_clever.__init__": lambda: Bot_clever(colours,
+                                                  duplicates,
+                                                  COMBINATION_LENGTH),
+        "Bot_clever._possibilities": lambda: list(
+            bot._possibilities(feedback, RED_PIN)),
+        "Bot_clever.update_possible_combinations":
+            update_possible_combinations,
+        "bot_set_combination": lambda: bot_set_combination(colours,
+                                                           duplicates,
+                                                           COMBINATION_LENGTH,
+                                                           rng)
+    }
+
+
+def measure(function):
+    """
+    Measures time of one call of a function. Number of calls is chosen
+    so that one run lasts at least 0.2 s, the fastest of REPEAT runs is used
+
+    Args:
+        function (callable): Function without arguments
+
+    Returns:
+        float: Seconds per call
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(REPEAT, number)) / number
+
+
+def run_benchmarks():
+    """
+    Runs all benchmarks for all configurations
+
+    Returns:
+        dict: Maps "configuration number: benchmark name" to seconds per call
+    """
+    results = {}
+    for configuration in range(len(CONFIGURATIONS)):
+        for name, function in _cases(configuration).items():
+            results[f"{configuration}: {name}"] = measure(function)
+    return results
+
+
+def find_regressions(results, baseline, tolerance=TOLERANCE):
+    """
+    Compares results with baseline
+
+    Args:
+        results (dict): Current seconds per call
+        baseline (dict): Stored seconds per call
+        tolerance (float, optional): Allowed slowdown. Defaults to TOLERANCE.
+
+    Returns:
+        dict: Maps names of slowed down benchmarks to their slowdown
+    """
+    regressions = {}
+    for name, seconds in results.items():
+        if name in baseline and seconds > baseline[name] * tolerance:
+            regressions[name] = seconds / baseline[name]
+    return regressions
+
+
+def main():
+    """
+    Runs benchmarks, prints them next to baseline and reports regressions.
+    With --save, stores results as new baseline
+    """
+    parser = argparse.ArgumentParser(description="Mastermind benchmarks")
+    parser.add_argument("--save", action="store_true",
+                        help="store results as new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    args = parser.parse_args()
+    results = run_benchmarks()
+    baseline = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, "r") as filehandle:
+            baseline = json.load(filehandle)
+    for name, seconds in results.items():
+        base = baseline.get(name)
+        base_info = f"{base * 1e6:12.2f} us" if base else f"{'-':>15}"
+        print(f"{name:<52}{seconds * 1e6:12.2f} us{base_info}")
+    if args.save:
+        with open(BASELINE_PATH, "w") as filehandle:
+            json.dump(results, filehandle, indent=4)
+        return 0
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for name, slowdown in regressions.items():
+        print(f"Regression: {name} is {slowdown:.2f}x slower than baseline")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,19 @@
-from random import choice, sample, choices
-from itertools import product, permutations, combinations
+import random
+import threading
+from collections import Counter
+from math import log2
+from os import cpu_count
+from time import monotonic
+from feedback_table import (
+                            TABLE_LIMIT,
+                            ids_to_mask,
+                            load_table,
+                            mask_to_ids,
+                            nth_id,
+                            )
+from scoring import encode, decode, pins_feedback
+from symmetry import Symmetry
+import opening_book
 
 
 class Bot():
@@ -10,12 +24,20 @@ class Bot():
         _colours (list): List of allowed colours
         _duplicates (bool): True if duplicates are enabled, False otherwise
         _comb_len (int): Combination length
+        _rng (Random): Source of randomness of the bot
+        _deadline (float): Time of time.monotonic, by which the next guess
+        has to be chosen, None if there is no limit
 
     Methods:
         __init__: creates bot object
         guess_combination: placeholder for inheriting classes
+        update_possible_combinations: placeholder for inheriting classes
+        set_deadline: sets time limit for choosing the next guess
+        _out_of_time: checks whether deadline has passed
+        provisional_guess: returns the best guess found so far
+        set_last_guess: records guess played instead of the computed one
     """
-    def __init__(self, colours, duplicates, le):
+    def __init__(self, colours, duplicates, le, rng=None):
         """
         Creates bot object
 
@@ -23,10 +45,14 @@ class Bot():
             colours (list): List of allowed colours
             duplicates (bool): True if duplicates are enabled, False otherwise
             le (int): Length of combination to be guessed
+            rng (Random, optional): Source of randomness. Defaults to None,
+            which means global random module
         """
         self._colours = colours
         self._duplicates = duplicates
         self._comb_len = le
+        self._rng = random if rng is None else rng
+        self._deadline = None
 
     def guess_combination(self):
         """
@@ -34,6 +60,57 @@ class Bot():
         """
         pass
 
+    def update_possible_combinations(self, guess_correctness, RED_PIN):
+        """
+        Placeholder for inheriting classes, which learn from
+        correctness of previous guess
+
+        Args:
+            guess_correctness (list): Correctness of previous guess
+            RED_PIN (str): Literal used to represent red pin
+        """
+        pass
+
+    def set_deadline(self, deadline):
+        """
+        Sets time limit for choosing the next guess. Searching bots return
+        the best guess found by then
+
+        Args:
+            deadline (float): Time of time.monotonic, None if there is
+            no limit
+        """
+        self._deadline = deadline
+
+    def _out_of_time(self):
+        """
+        Checks whether deadline has passed
+
+        Returns:
+            bool: True if deadline is set and has passed. Otherwise False
+        """
+        return self._deadline is not None and monotonic() >= self._deadline
+
+    def provisional_guess(self):
+        """
+        Returns guess to be played if choosing the next guess is
+        interrupted. Called from another thread while guess is computed
+
+        Returns:
+            list: The best guess found so far, None if bot has none
+        """
+        return None
+
+    def set_last_guess(self, guess):
+        """
+        Records guess played instead of the one computed by the bot,
+        so that the next feedback refers to it
+
+        Args:
+            guess (list): Played combination
+        """
+        pass
+
 
 class Bot_random(Bot):
     """
@@ -63,7 +140,8 @@ class Bot_random(Bot):
         """
         return bot_set_combination(self._colours,
                                    self._duplicates,
-                                   self._comb_len)
+                                   self._comb_len,
+                                   self._rng)
 
 
 class Bot_clever(Bot):
@@ -80,29 +158,29 @@ class Bot_clever(Bot):
         (Inherited from Bot)
         _comb_len (int): Combination length (Inherited from Bot)
         _last_guess (list): Last guess of the bot
-        _possible_combinations (list): Contains possible combinations based
-        on previous guesses
+        _table (FeedbackTable): Feedback for every pair of combinations
+        _possible_mask (int): Bitset of possible combinations based on
+        previous guesses, bit number i is set if combination i is possible
+        _possible_ids (range or array): Ids of possible combinations,
+        extracted from _possible_mask when needed. Range of all ids until
+        the first feedback, so that nothing is materialized up front
+
+    Properties:
+        _possible_combinations: Ids of possible combinations
 
     Methods:
         __init__: creates bot_clever object (Inherited from Bot)
         guess_combination: returns randomly chosen combination from
         those possible based on previous guesses
-        _possible_cols_in_guess: returns possible colours from those used
-    in the guess (only for games without duplicates)
-        _possible_cols_not_in_guess: returns possible colours from those
-    not used in the guess (only for games without duplicates)
-        _poss_col_combs: returns all possible combinations of colours
-    (only for games without duplicates)
-        _poss_combs: returns all possible combinations for given list of
-    colours combination (only for games without duplicates)
-        _rem_wrong_combs: returns a list of possible combinations based
-    on number of red pins they would produce
-        _possibilities: returns list of possible combinations according to
-    previous guess
+        _remaining: returns number of possible combinations
+        provisional_guess: returns the smallest possible combination
+        set_last_guess: records guess played instead of the computed one
+        _possibilities: returns iterator over possible combinations
+    according to previous guess
         update_possible_combinations: Updates internal variable containing
     possible combinations according to previous guesses
     """
-    def __init__(self, colours, duplicates, le):
+    def __init__(self, colours, duplicates, le, rng=None):
         """
         Creates bot_clever object
 
@@ -110,171 +188,735 @@ class Bot_clever(Bot):
             colours (list): List of allowed colours
             duplicates (bool): True if duplicates are enabled, False otherwise
             le (int): Length of combination to be guessed
+            rng (Random, optional): Source of randomness. Defaults to None,
+            which means global random module
         """
-        super().__init__(colours, duplicates, le)
+        super().__init__(colours, duplicates, le, rng)
         self._last_guess = []
-        self._possible_combinations = []
-        if self._duplicates:
-            self._possible_combinations = list(product(self._colours,
-                                                       repeat=self._comb_len))
-        else:
-            self._possible_combinations = list(permutations(self._colours,
-                                                            self._comb_len))
+        self._table = load_table(len(self._colours),
+                                 self._duplicates,
+                                 self._comb_len)
+        self._possible_mask = (1 << self._table.size) - 1
+        self._possible_ids = range(self._table.size)
+
+    @property
+    def _possible_combinations(self):
+        """
+        Returns ids of possible combinations, extracting them from
+        bitset if it changed since the last call
+
+        Returns:
+            range or array: Ids of possible combinations
+        """
+        if self._possible_ids is None:
+            self._possible_ids = mask_to_ids(self._possible_mask,
+                                             self._table.size)
+        return self._possible_ids
+
+    @_possible_combinations.setter
+    def _possible_combinations(self, ids):
+        """
+        Sets possible combinations
+
+        Args:
+            ids (iterable): Ids of possible combinations
+        """
+        self._possible_ids = ids
+        self._possible_mask = ids_to_mask(ids, self._table.size)
 
     def guess_combination(self):
         """
         Returns randomly chosen combination from those possible based
-        on previous guesses
+        on previous guesses. Combination is taken straight from the bitset,
+        so turn does not extract ids of all possible combinations
+
+        Raises:
+            IndexError: If no combination is possible
 
         Returns:
             list: Chosen combination
         """
-        self._last_guess = choice(self._possible_combinations)
+        if self._possible_ids is not None:
+            guess_id = self._rng.choice(self._possible_ids)
+        elif not self._possible_mask:
+            raise IndexError("No combination is possible")
+        else:
+            guess_id = nth_id(self._possible_mask,
+                              self._rng.randrange(self._remaining()))
+        self._last_guess = decode(self._table.code(guess_id), self._colours)
         return self._last_guess
 
-    def _possible_cols_in_guess(self, cor_len):
+    def _remaining(self):
+        """
+        Returns number of possible combinations
+
+        Returns:
+            int: Number of possible combinations
+        """
+        return self._possible_mask.bit_count()
+
+    def provisional_guess(self):
+        """
+        Returns the smallest possible combination, which is a valid guess
+        before any searching is done
+
+        Returns:
+            list: Possible combination, None if no combination is possible
+        """
+        if not self._possible_mask:
+            return None
+        return decode(self._table.code(nth_id(self._possible_mask, 0)),
+                      self._colours)
+
+    def set_last_guess(self, guess):
+        """
+        Records guess played instead of the one computed by the bot,
+        so that the next feedback refers to it
+
+        Args:
+            guess (list): Played combination
+        """
+        self._last_guess = guess
+
+    def _consistent_mask(self, guess_correctness, RED_PIN):
+        """
+        Returns bitset of combinations, which would produce exactly the same
+        red and white pins for the previous guess
+
+        Args:
+            guess_correctness (list): Correctness of previous guess
+            RED_PIN (str): Literal used to represent red pin
+
+        Returns:
+            int: Bitset of consistent combinations
+        """
+        feedback = pins_feedback(guess_correctness, RED_PIN)
+        guess = encode(self._last_guess, self._colours)
+        return self._table.mask(self._table.rank(guess), feedback)
+
+    def _possibilities(self, guess_correctness, RED_PIN):
+        """
+        Returns iterator over possible combinations according to previous
+        guess. Combination is possible if it is still possible and
+        would produce exactly the same red and white pins for
+        the previous guess
+
+        Args:
+            guess_correctness (list): Correctness of previous guess
+            RED_PIN (str): Literal used to represent red pin
+
+        Returns:
+            iterator: Ids of possible combinations according to previous guess
+        """
+        mask = self._consistent_mask(guess_correctness, RED_PIN)
+        return iter(mask_to_ids(self._possible_mask & mask, self._table.size))
+
+    def update_possible_combinations(self, guess_correctness, RED_PIN):
+        """
+        Updates internal variable containing possible combinations according
+        to previous guesses. It is a single AND of bitsets, ids are
+        extracted only when they are needed
+
+        Args:
+            guess_correctness (list): Correctness of previous guess
+            RED_PIN (str): Literal used to represent red pin
+        """
+        self._possible_mask &= self._consistent_mask(guess_correctness,
+                                                     RED_PIN)
+        self._possible_ids = None
+
+
+class Bot_knuth(Bot_clever):
+    """
+    AI Player designed to choose combination with Knuth's minimax algorithm.
+    Every guess minimizes the worst-case number of possible combinations
+    left after the feedback. Search is anytime: with deadline set,
+    the best guess evaluated before the deadline is chosen.
+    Inherits from Bot_clever
+
+    Args:
+        Bot_clever (Bot_clever): Base class, keeps possible combinations
+
+    Attributes:
+        _colours (list): List of allowed colours (Inherited from Bot)
+        _duplicates (bool): True if duplicates are enabled, False otherwise
+        (Inherited from Bot)
+        _comb_len (int): Combination length (Inherited from Bot)
+        _last_guess (list): Last guess of the bot (Inherited from Bot_clever)
+        _table (FeedbackTable): Feedback for every pair of combinations
+        (Inherited from Bot_clever)
+        _possible_combinations (list): Contains ids of possible combinations
+        based on previous guesses (Inherited from Bot_clever)
+        _symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+        _provisional_id (int): Id of the best guess found so far by search
+        with deadline, None if there is none
+
+    Methods:
+        __init__: creates bot_knuth object
+        guess_combination: returns combination with the smallest
+    worst-case partition of possible combinations
+        _partition_sizes: returns sizes of partition of possible
+    combinations made by given guess
+        _guess_score: returns worst-case partition size for given guess
+        _guess_candidates: returns ids of one guess from every
+    symmetry class
+        _best_guess: returns id of the guess with the best score
+    found before the deadline
+        _anytime_candidates: yields ids of guesses in order of evaluation
+    with deadline
+        _guess_key: returns key ordering guesses from the best one
+        provisional_guess: returns the best guess found so far
+        update_possible_combinations: Updates internal variable containing
+    possible combinations and symmetries according to previous guesses
+    """
+    _opening_guesses = {}  # First guesses, shared by all bots
+
+    def __init__(self, colours, duplicates, le, rng=None):
         """
-        Returns possible colours from those used in the guess
-        (only for games without duplicates)
+        Creates bot_knuth object
+
         Args:
-            cor_len (int): Length of list with previous guess correctness
+            colours (list): List of allowed colours
+            duplicates (bool): True if duplicates are enabled, False otherwise
+            le (int): Length of combination to be guessed
+            rng (Random, optional): Source of randomness. Defaults to None,
+            which means global random module
+        """
+        super().__init__(colours, duplicates, le, rng)
+        self._symmetry = Symmetry(len(colours), le)
+        self._provisional_id = None
+
+    def guess_combination(self):
+        """
+        Returns combination with the smallest worst-case partition
+        of possible combinations
 
         Returns:
-            list: Possible colours from those used in the guess
+            list: Chosen combination
         """
-        return list(combinations(self._last_guess,
-                                 cor_len))
+        if self._remaining() == self._table.size:
+            key = (len(self._colours), self._duplicates, self._comb_len)
+            if key in self._opening_guesses:
+                guess_id = self._opening_guesses[key]
+            else:
+                guess_id = self._best_guess()
+                if not self._out_of_time():
+                    self._opening_guesses[key] = guess_id
+        else:
+            guess_id = self._best_guess()
+        self._last_guess = decode(self._table.code(guess_id), self._colours)
+        return self._last_guess
 
-    def _possible_cols_not_in_guess(self, cor_len):
+    def _partition_sizes(self, guess_id):
         """
-        Returns possible colours from those not used in the guess
-        (only for games without duplicates)
+        Returns sizes of partition of possible combinations made by given
+        guess. Feedback for all possible combinations is counted at once
+
         Args:
-            cor_len (int): Length of list with previous guess correctness
+            guess_id (int): Id of the guess
 
         Returns:
-            list: Possible colours from those not used in the guess
+            Counter: Number of possible combinations for every feedback
         """
-        colours_not_used = []
-        for colour in self._colours:
-            if colour not in self._last_guess:
-                colours_not_used.append(colour)
-        return list(combinations(colours_not_used,
-                                 self._comb_len-cor_len))
+        row = self._table.row(guess_id)
+        if self._remaining() == self._table.size:
+            return Counter(row)
+        return Counter(map(row.__getitem__, self._possible_combinations))
 
-    def _poss_col_combs(self, possible_from_comb, possible_not_from_comb):
+    def _guess_score(self, guess_id):
         """
-        Returns all possible combinations of colours
-        (only for games without duplicates)
+        Returns worst-case number of possible combinations left after
+        given guess. The lower, the better
 
         Args:
-            possible_from_comb (list): Possible colours combinations from guess
-            possible_not_from_comb (list): Possible colours combinations
-        not from guess
+            guess_id (int): Id of the guess
 
         Returns:
-            list: Possible combinations of colours
+            int: Size of the biggest part of partition
         """
-        possible_cols_combs = []
-        for comb in possible_from_comb:
-            for colours in possible_not_from_comb:
-                temp = list(comb)
-                temp.extend(list(colours))
-                possible_cols_combs.append(temp)
-        return possible_cols_combs
+        return max(self._partition_sizes(guess_id).values())
 
-    def _poss_combs(self, possible_cols_combs):
+    def _guess_candidates(self):
         """
-        Returns all possible combinations for given list of
-        colours combination (only for games without duplicates)
+        Returns ids of the smallest guess from every symmetry class.
+        Possible combinations are unchanged by the symmetries, so guesses
+        from one class have equal scores and are all possible or all not.
+        With deadline set, only classes found before the deadline
+        are returned
+
+        Returns:
+            list or range: Ids of guesses worth evaluating
+        """
+        if self._deadline is None:
+            return self._symmetry.representatives(self._table.codebook)
+        return list(self._symmetry.iter_representatives(
+            self._table.codebook, self._out_of_time))
+
+    def _best_guess(self, guess_ids=None):
+        """
+        Returns id of the guess with the lowest score.
+        Ties are resolved in favour of possible combinations, then lower ids.
+        With deadline set, possible combinations are evaluated first,
+        other guesses are found while they are evaluated and the search
+        stops at the deadline
 
         Args:
-            possible_cols_combs (list): Possible combinations of colours
+            guess_ids (iterable, optional): Ids of guesses to be considered.
+            Defaults to None, which means one guess from every symmetry class
 
         Returns:
-            list: Possible combinations
+            int: Id of chosen guess
+        """
+        possible = self._possible_combinations
+        if len(possible) <= 2:
+            return possible[0]
+        possible_set = set(possible)
+        if self._deadline is None:
+            if guess_ids is None:
+                guess_ids = self._guess_candidates()
+            return min(guess_ids, key=lambda guess_id:
+                       self._guess_key(guess_id, possible_set))
+        best = None
+        for guess_id in self._anytime_candidates(guess_ids, possible,
+                                                 possible_set):
+            key = self._guess_key(guess_id, possible_set)
+            if best is None or key < best:
+                best = key
+                self._provisional_id = guess_id
+            if self._out_of_time():
+                break
+        return possible[0] if best is None else best[-1]
+
+    def _anytime_candidates(self, guess_ids, possible, possible_set):
         """
-        possible_combs = []
-        for comb in possible_cols_combs:
-            possible_combs.extend(list(permutations(comb,
-                                                    self._comb_len)))
-        return possible_combs
+        Yields ids of guesses in order of evaluation with deadline,
+        possible combinations first. Representatives of symmetry classes
+        are found lazily, so no guess waits for scan of the whole codebook
+
+        Args:
+            guess_ids (iterable): Ids of guesses to be considered,
+            None for one guess from every symmetry class
+            possible (iterable): Ids of possible combinations
+            possible_set (set): Ids of possible combinations
 
-    def _rem_wrong_combs(self, possible_combs, no_of_red):
+        Yields:
+            int: Ids of guesses
         """
-        Returns a list of possible combinations based on their similarity
-        to last_guess. For example, if previous guess produced 2 red pins,
-        method return only combinations that have exactly 2 colours
-        in the same positions as last guess
+        if guess_ids is not None:
+            yield from sorted(guess_ids, key=lambda guess_id:
+                              guess_id not in possible_set)
+            return
+        everything = len(possible_set) == self._table.size
+        if not everything:
+            yield from possible
+        for guess_id in self._symmetry.iter_representatives(
+                self._table.codebook, self._out_of_time):
+            if everything or guess_id not in possible_set:
+                yield guess_id
+
+    def _guess_key(self, guess_id, possible_set):
+        """
+        Returns key ordering guesses from the best one
 
         Args:
-            possible_combs (list): Possible combinations
-            no_of_red (int): Number of red pins produced by previous guess
+            guess_id (int): Id of the guess
+            possible_set (set): Ids of possible combinations
 
         Returns:
-            list: Reduced list of possible combinations
-        """
-        temp = []
-        for combination in possible_combs:
-            red_count = 0
-            for guess_el, comb_el in zip(self._last_guess, combination):
-                if guess_el == comb_el:
-                    red_count += 1
-            if red_count == no_of_red:
-                temp.append(combination)
-        return temp
+            tuple: Score, whether guess is impossible and id of the guess
+        """
+        return (self._guess_score(guess_id), guess_id not in possible_set,
+                guess_id)
 
-    def _possibilities(self, guess_correctness, RED_PIN):
+    def provisional_guess(self):
         """
-        Returns list of possible combinations according to previous guess
+        Returns the best guess found so far by search with deadline,
+        or possible combination if none was evaluated yet
+
+        Returns:
+            list: Combination, None if no combination is possible
+        """
+        guess_id = self._provisional_id
+        if guess_id is None:
+            return super().provisional_guess()
+        return decode(self._table.code(guess_id), self._colours)
+
+    def update_possible_combinations(self, guess_correctness, RED_PIN):
+        """
+        Updates internal variable containing possible combinations and
+        symmetries according to previous guesses
 
         Args:
             guess_correctness (list): Correctness of previous guess
             RED_PIN (str): Literal used to represent red pin
+        """
+        super().update_possible_combinations(guess_correctness, RED_PIN)
+        self._symmetry = self._symmetry.after(encode(self._last_guess,
+                                                     self._colours))
+        self._provisional_id = None
+
+
+class Bot_entropy(Bot_knuth):
+    """
+    AI Player designed to choose combination bringing the most information.
+    Every guess maximizes entropy of the feedback over possible
+    combinations. For big configurations guesses are evaluated in
+    a process pool. Inherits from Bot_knuth
+
+    Args:
+        Bot_knuth (Bot_knuth): Base class, chooses guess with the best score
+
+    Attributes:
+        _colours (list): List of allowed colours (Inherited from Bot)
+        _duplicates (bool): True if duplicates are enabled, False otherwise
+        (Inherited from Bot)
+        _comb_len (int): Combination length (Inherited from Bot)
+        _last_guess (list): Last guess of the bot (Inherited from Bot_clever)
+        _table (FeedbackTable): Feedback for every pair of combinations
+        (Inherited from Bot_clever)
+        _possible_combinations (list): Contains ids of possible combinations
+        based on previous guesses (Inherited from Bot_clever)
+        _symmetry (Symmetry): Symmetries keeping previous guesses unchanged
+        (Inherited from Bot_knuth)
+        _provisional_id (int): Id of the best guess found so far by search
+        with deadline (Inherited from Bot_knuth)
+        _workers (int): Number of processes used for evaluation of guesses
+
+    Methods:
+        __init__: creates bot_entropy object
+        guess_combination: returns combination with the best score
+    (Inherited from Bot_knuth)
+        _guess_score: returns score of given guess based on entropy
+        _best_guess: returns id of the guess with the best score, evaluating
+    guesses in a process pool for big configurations
+        update_possible_combinations: Updates internal variable containing
+    possible combinations and symmetries according to previous guesses
+    (Inherited from Bot_knuth)
+    """
+    _opening_guesses = {}  # First guesses, shared by all bots
+    PARALLEL_THRESHOLD = 2000000  # Guess-secret pairs worth a process pool
+
+    def __init__(self, colours, duplicates, le, workers=None, rng=None):
+        """
+        Creates bot_entropy object
+
+        Args:
+            colours (list): List of allowed colours
+            duplicates (bool): True if duplicates are enabled, False otherwise
+            le (int): Length of combination to be guessed
+            workers (int, optional): Number of processes. Defaults to None,
+            which means number of processors
+            rng (Random, optional): Source of randomness. Defaults to None,
+            which means global random module
+        """
+        super().__init__(colours, duplicates, le, rng)
+        self._workers = workers
+
+    def _guess_score(self, guess_id):
+        """
+        Returns sum of n * log2(n) over parts of partition made by given
+        guess. Entropy of the feedback is log2(N) - sum / N, so the lower
+        the score, the more information the guess brings
+
+        Args:
+            guess_id (int): Id of the guess
 
         Returns:
-            list: Possible combinations according to previous guess
-        """
-        cor_len = len(guess_correctness)
-        possible_combs = []
-        if not self._duplicates:
-            # Find possible colours from those that were used in the guess
-            possible_from_comb = self._possible_cols_in_guess(cor_len)
-            # Find possible colours from those that weren't used in the guess
-            possible_not_from_comb = self._possible_cols_not_in_guess(cor_len)
-            # Find all possible combinations of colours
-            possible_cols_combs = self._poss_col_combs(possible_from_comb,
-                                                       possible_not_from_comb)
-            # Find all possible combinations for given colours
-            possible_combs = self._poss_combs(possible_cols_combs)
-            # Remove combinations that would produce wrong amount of red pins
-            no_of_red = guess_correctness.count(RED_PIN)
-            possible_combs = self._rem_wrong_combs(possible_combs, no_of_red)
-        else:
-            # Remove combinations that would produce wrong amount of red pins
-            no_of_red = guess_correctness.count(RED_PIN)
-            possible_combs = self._rem_wrong_combs(self._possible_combinations,
-                                                   no_of_red)
-        return possible_combs
+            float: Score of the guess
+        """
+        return sum(size * log2(size)
+                   for size in self._partition_sizes(guess_id).values())
+
+    def _best_guess(self, guess_ids=None):
+        """
+        Returns id of the guess with the lowest score.
+        If there are many pairs of guesses and possible combinations,
+        guesses are split between processes
+
+        Args:
+            guess_ids (iterable, optional): Ids of guesses to be considered.
+            Defaults to None, which means one guess from every symmetry class
+
+        Returns:
+            int: Id of chosen guess
+        """
+        possible = self._possible_combinations
+        if guess_ids is not None or len(possible) <= 2 or \
+                self._workers == 1:
+            return super()._best_guess(guess_ids)
+        guess_ids = self._guess_candidates()
+        if len(possible) * len(guess_ids) < self.PARALLEL_THRESHOLD:
+            return super()._best_guess(guess_ids)
+        from concurrent.futures import ProcessPoolExecutor
+        chunks = self._workers or cpu_count() or 1
+        with ProcessPoolExecutor(chunks) as pool:
+            jobs = [(self._colours, self._duplicates, self._comb_len,
+                     possible, guess_ids[start::chunks], self._deadline)
+                    for start in range(chunks)]
+            best = list(pool.map(_entropy_best_guess, jobs))
+        possible_set = set(possible)
+        return min(best, key=lambda guess_id:
+                   self._guess_key(guess_id, possible_set))
+
+
+def _entropy_best_guess(job):
+    """
+    Returns id of the best guess from the given part of guesses.
+    Used by processes of Bot_entropy
+
+    Args:
+        job (tuple): Colours, duplicates, length, ids of possible
+        combinations, ids of guesses to be considered and deadline
+
+    Returns:
+        int: Id of the best guess
+    """
+    colours, duplicates, le, possible, guess_ids, deadline = job
+    bot = Bot_entropy(colours, duplicates, le, workers=1)
+    bot._possible_combinations = possible
+    bot.set_deadline(deadline)
+    return bot._best_guess(guess_ids)
+
+
+class Bot_book(Bot_clever):
+    """
+    AI Player designed to choose combination from precomputed strategy tree
+    of Bot_knuth. Every move is a lookup in a shared, read-only book.
+    Inherits from Bot_clever, which is used when book has no answer
+
+    Args:
+        Bot_clever (Bot_clever): Base class, keeps possible combinations
+
+    Attributes:
+        _colours (list): List of allowed colours (Inherited from Bot)
+        _duplicates (bool): True if duplicates are enabled, False otherwise
+        (Inherited from Bot)
+        _comb_len (int): Combination length (Inherited from Bot)
+        _last_guess (list): Last guess of the bot (Inherited from Bot_clever)
+        _table (FeedbackTable): Feedback for every pair of combinations
+        (Inherited from Bot_clever)
+        _possible_combinations (list): Contains ids of possible combinations
+        based on previous guesses (Inherited from Bot_clever)
+        _book (OpeningBook): Strategy tree for the configuration, None if
+        configuration is too big for precomputed feedback table
+        _node (int): Current node of strategy tree, None if left the tree
+
+    Methods:
+        __init__: creates bot_book object
+        guess_combination: returns combination stored in the current node
+        set_last_guess: records guess played instead of the computed one,
+    leaving strategy tree if it differs from the book
+        update_possible_combinations: Updates possible combinations and
+    moves to the next node of strategy tree
+    """
+    def __init__(self, colours, duplicates, le, rng=None):
+        """
+        Creates bot_book object
+
+        Args:
+            colours (list): List of allowed colours
+            duplicates (bool): True if duplicates are enabled, False otherwise
+            le (int): Length of combination to be guessed
+            rng (Random, optional): Source of randomness used outside of
+            the book. Defaults to None, which means global random module
+        """
+        super().__init__(colours, duplicates, le, rng)
+        self._book = None
+        self._node = None
+        if self._table.size <= TABLE_LIMIT:
+            self._book = opening_book.load_book(len(self._colours),
+                                                self._duplicates,
+                                                self._comb_len)
+            self._node = self._book.root()
+
+    def guess_combination(self):
+        """
+        Returns combination stored in the current node of strategy tree.
+        Outside of the tree, falls back to Bot_clever
+
+        Returns:
+            list: Chosen combination
+        """
+        if self._node is None:
+            return super().guess_combination()
+        guess_id = self._book.guess(self._node)
+        self._last_guess = decode(self._table.code(guess_id), self._colours)
+        return self._last_guess
+
+    def set_last_guess(self, guess):
+        """
+        Records guess played instead of the one computed by the bot.
+        Strategy tree is left, if the guess is not the one from the book
+
+        Args:
+            guess (list): Played combination
+        """
+        if self._node is not None and guess != decode(
+                self._table.code(self._book.guess(self._node)),
+                self._colours):
+            self._node = None
+        super().set_last_guess(guess)
 
     def update_possible_combinations(self, guess_correctness, RED_PIN):
         """
-        Updates internal variable containing possible combinations according
-        to previous guesses
+        Updates possible combinations according to previous guess and
+        moves to the node of strategy tree reached after given feedback
+
+        Args:
+            guess_correctness (list): Correctness of previous guess
+            RED_PIN (str): Literal used to represent red pin
+        """
+        super().update_possible_combinations(guess_correctness, RED_PIN)
+        if self._node is not None:
+            feedback = pins_feedback(guess_correctness, RED_PIN)
+            self._node = self._book.child(self._node, feedback)
+
+
+class Bot_background:
+    """
+    Wrapper running AI Player in a background thread. The next guess is
+    computed as soon as feedback is known, while the user interface
+    waits for the player, and it is ready within time_budget seconds
+    from the feedback. If the bot is still searching then, its best guess
+    found so far is played
+
+    Attributes:
+        _bot (Bot): Wrapped AI Player
+        _time_budget (float): Seconds for choosing one guess, None if
+        there is no limit
+        _thread (Thread): Thread computing the next guess, None if
+        no guess is computed
+        _deadline (float): Time of time.monotonic, by which the next guess
+        has to be returned, None if there is no limit
+        _updated (Event): Set when the bot has learnt the previous feedback
+        _result (list): Computed guess or exception raised by the bot
+        _played (list): Guess played while the bot was still searching,
+        None if the bot's own guess was played
+
+    Methods:
+        __init__: creates bot_background object and starts computing
+    the first guess
+        _think: starts computing the next guess in background
+        _run: computes the next guess
+        _settle: waits for abandoned search and tells the bot
+    which guess was played
+        guess_combination: returns computed guess, waiting for it
+    until the deadline
+        update_possible_combinations: updates wrapped bot and starts
+    computing the next guess
+    """
+    def __init__(self, bot, time_budget=None):
+        """
+        Creates bot_background object and starts computing the first guess
+
+        Args:
+            bot (Bot): Wrapped AI Player
+            time_budget (float, optional): Seconds for choosing one guess.
+            Defaults to None, which means no limit
+        """
+        self._bot = bot
+        self._time_budget = time_budget
+        self._thread = None
+        self._deadline = None
+        self._updated = threading.Event()
+        self._result = []
+        self._played = None
+        self._think(None)
+
+    def _think(self, feedback):
+        """
+        Starts computing the next guess in background
+
+        Args:
+            feedback (tuple): Correctness of previous guess and literal
+            used to represent red pin, None before the first guess
+        """
+        self._settle()
+        self._deadline = None
+        if self._time_budget is not None:
+            self._deadline = monotonic() + self._time_budget
+        self._updated = threading.Event()
+        self._result = []
+        self._thread = threading.Thread(target=self._run,
+                                        args=(feedback, self._deadline),
+                                        daemon=True)
+        self._thread.start()
+
+    def _run(self, feedback, deadline):
+        """
+        Computes the next guess, storing it or exception raised by the bot
+
+        Args:
+            feedback (tuple): Correctness of previous guess and literal
+            used to represent red pin, None before the first guess
+            deadline (float): Time of time.monotonic, by which guess
+            has to be chosen, None if there is no limit
+        """
+        try:
+            self._bot.set_deadline(deadline)
+            if feedback is not None:
+                self._bot.update_possible_combinations(*feedback)
+            self._updated.set()
+            self._result.append(self._bot.guess_combination())
+        except Exception as error:
+            self._result.append(error)
+        self._updated.set()
+
+    def _settle(self):
+        """
+        Waits for search abandoned at the deadline and tells the bot
+        which guess was played instead of its own
+        """
+        if self._played is None:
+            return
+        self._thread.join()
+        self._bot.set_last_guess(self._played)
+        self._played = None
+
+    def guess_combination(self):
+        """
+        Returns guess computed in background, waiting for it no longer than
+        until the deadline. If the bot is still searching then, its best
+        guess found so far is returned
+
+        Raises:
+            Exception: If wrapped bot raised it
+
+        Returns:
+            list: Chosen combination
+        """
+        if self._thread is None:
+            self._think(None)
+        self._updated.wait()
+        timeout = None
+        if self._deadline is not None:
+            timeout = max(0, self._deadline - monotonic())
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            guess = self._bot.provisional_guess()
+            if guess is not None:
+                self._played = guess
+                return guess
+            self._thread.join()
+        self._thread = None
+        result = self._result.pop()
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def update_possible_combinations(self, guess_correctness, RED_PIN):
+        """
+        Passes correctness of previous guess to wrapped bot in background
+        and starts computing the next guess
 
         Args:
             guess_correctness (list): Correctness of previous guess
             RED_PIN (str): Literal used to represent red pin
         """
-        temp = []
-        possibilities = self._possibilities(guess_correctness, RED_PIN)
-        for combination in self._possible_combinations:
-            if combination in possibilities:
-                temp.append(combination)
-        self._possible_combinations = temp
+        self._think((guess_correctness, RED_PIN))
 
 
-def bot_set_combination(colours, duplicates, le):
+def bot_set_combination(colours, duplicates, le, rng=random):
     """
     Randomly generates a combination for given length, colours
     and duplicates allowance
@@ -283,11 +925,22 @@ def bot_set_combination(colours, duplicates, le):
         colours (list): Allowed colours
         duplicates (bool): True if duplicates are enabled, False otherwise
         le (int): Length of combination to be generated
+        rng (Random, optional): Source of randomness.
+        Defaults to global random module.
 
     Returns:
         list: Generated combination
     """
     if not duplicates:
-        return sample(colours, le)
+        return rng.sample(colours, le)
     else:
-        return choices(colours, k=le)
+        return rng.choices(colours, k=le)
+
+
+CODEBREAKERS = {
+    "Bot_random": Bot_random,
+    "Bot_clever": Bot_clever,
+    "Bot_knuth": Bot_knuth,
+    "Bot_entropy": Bot_entropy,
+    "Bot_book": Bot_book
+}  # AI Players guessing combination, by name
@@ -0,0 +1,148 @@
+from itertools import product, permutations
+from math import perm
+
+
+class Codebook:
+    """
+    Maps every legal integer-coded combination of a configuration to
+    a dense id and back. Ids follow lexicographic order of combinations,
+    so they are the same as positions in itertools.product (duplicates)
+    or itertools.permutations (no duplicates) over range(no_of_colours)
+
+    Attributes:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        size (int): Number of legal combinations
+        _weights (list): Number of combinations sharing given prefix,
+        for consecutive prefix lengths
+
+    Methods:
+        __init__: creates codebook object
+        __len__: returns number of legal combinations
+        __iter__: iterates over legal combinations in order of ids
+        is_legal: checks whether combination belongs to the configuration
+        rank: returns id of combination
+        unrank: returns combination with given id
+    """
+    def __init__(self, no_of_colours, duplicates, le):
+        """
+        Creates codebook object
+
+        Args:
+            no_of_colours (int): Number of allowed colours
+            duplicates (bool): True if duplicates are enabled, False otherwise
+            le (int): Length of combination
+        """
+        self.no_of_colours = no_of_colours
+        self.duplicates = duplicates
+        self.le = le
+        if duplicates:
+            self._weights = [no_of_colours ** (le - 1 - position)
+                             for position in range(le)]
+            self.size = no_of_colours ** le
+        else:
+            self._weights = [perm(no_of_colours - 1 - position,
+                                  le - 1 - position)
+                             for position in range(le)]
+            self.size = perm(no_of_colours, le)
+
+    def __len__(self):
+        """
+        Returns number of legal combinations
+
+        Returns:
+            int: Number of legal combinations
+        """
+        return self.size
+
+    def __iter__(self):
+        """
+        Iterates over legal combinations in order of ids
+
+        Returns:
+            iterator: Integer-coded combinations
+        """
+        if self.duplicates:
+            return product(range(self.no_of_colours), repeat=self.le)
+        return permutations(range(self.no_of_colours), self.le)
+
+    def is_legal(self, code):
+        """
+        Checks whether combination belongs to the configuration:
+        has proper length, allowed pegs and no unpermitted duplicates
+
+        Args:
+            code (tuple): Integer-coded combination
+
+        Returns:
+            bool: True if combination is legal. Otherwise False
+        """
+        if len(code) != self.le:
+            return False
+        used = 0
+        for peg in code:
+            if not 0 <= peg < self.no_of_colours:
+                return False
+            if not self.duplicates and used >> peg & 1:
+                return False
+            used |= 1 << peg
+        return True
+
+    def rank(self, code):
+        """
+        Returns id of combination in O(length). Without duplicates, every
+        peg is counted among colours not used earlier in the combination
+
+        Args:
+            code (tuple): Integer-coded combination
+
+        Raises:
+            ValueError: If combination is not legal
+
+        Returns:
+            int: Id of combination
+        """
+        if len(code) != self.le:
+            raise ValueError(f"{code} is not a legal combination")
+        no_of_colours = self.no_of_colours
+        code_id = 0
+        if self.duplicates:
+            for peg in code:
+                if not 0 <= peg < no_of_colours:
+                    raise ValueError(f"{code} is not a legal combination")
+                code_id = code_id * no_of_colours + peg
+            return code_id
+        used = 0
+        for peg, weight in zip(code, self._weights):
+            if not 0 <= peg < no_of_colours or used >> peg & 1:
+                raise ValueError(f"{code} is not a legal combination")
+            smaller_used = (used & ((1 << peg) - 1)).bit_count()
+            code_id += (peg - smaller_used) * weight
+            used |= 1 << peg
+        return code_id
+
+    def unrank(self, code_id):
+        """
+        Returns combination with given id
+
+        Args:
+            code_id (int): Id of combination
+
+        Raises:
+            ValueError: If there is no combination with such id
+
+        Returns:
+            tuple: Integer-coded combination
+        """
+        if not 0 <= code_id < self.size:
+            raise ValueError(f"{code_id} is not a valid combination id")
+        code = []
+        unused = list(range(self.no_of_colours))
+        for weight in self._weights:
+            digit, code_id = divmod(code_id, weight)
+            if self.duplicates:
+                code.append(digit)
+            else:
+                code.append(unused.pop(digit))
+        return tuple(code)
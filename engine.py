@@ -0,0 +1,98 @@
+import random
+from collections import namedtuple
+from time import perf_counter
+from feedback_table import load_table
+from scoring import encode, feedback_pins, pack_feedback
+from bots import bot_set_combination
+from game_logic import NO_OF_ROUNDS, RED_PIN, WHITE_PIN
+GameRecord = namedtuple("GameRecord",
+                        ["secret", "guesses", "feedback", "won", "think_time"])
+# secret (int) - id of the secret combination
+# guesses (tuple) - ids of consecutive guesses
+# feedback (bytes) - packed feedback for consecutive guesses
+# won (bool) - whether the secret was guessed within the limit of rounds
+# think_time (float) - seconds spent by codebreaker on choosing guesses
+# and learning from their feedback
+
+
+def play_game(colours, duplicates, le, codebreaker, secret=None,
+              max_rounds=NO_OF_ROUNDS, rng=None, observer=None):
+    """
+    Plays one game between codemaker and AI codebreaker without
+    any user interface
+
+    Args:
+        colours (list): Allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        codebreaker (type): Class of AI Player guessing the combination
+        secret (list, optional): Combination to be guessed. Defaults to None,
+        which means randomly chosen combination
+        max_rounds (int, optional): Limit of guesses.
+        Defaults to NO_OF_ROUNDS.
+        rng (Random, optional): Source of randomness for codemaker and
+        codebreaker. Defaults to None, which means global random module
+        observer (callable, optional): Called after every guess with
+        id of the secret, ids of guesses and their packed feedback so far.
+        Its time is not counted as thinking time. Defaults to None.
+
+    Raises:
+        ValueError: If max_rounds is lower than 1
+
+    Returns:
+        GameRecord: Result of the game
+    """
+    if max_rounds < 1:
+        raise ValueError("At least one round has to be played")
+    table = load_table(len(colours), duplicates, le)
+    rng = random if rng is None else rng
+    if secret is None:
+        secret = bot_set_combination(colours, duplicates, le, rng)
+    secret_id = table.rank(encode(secret, colours))
+    win = pack_feedback(le, 0)
+    ai = codebreaker(colours, duplicates, le, rng=rng)
+    guesses = []
+    feedback = bytearray()
+    think_time = 0.0
+    while len(guesses) < max_rounds:
+        start = perf_counter()
+        guess = ai.guess_combination()
+        think_time += perf_counter() - start
+        guess_id = table.rank(encode(guess, colours))
+        result = table.feedback(guess_id, secret_id)
+        guesses.append(guess_id)
+        feedback.append(result)
+        if observer is not None:
+            observer(secret_id, guesses, feedback)
+        if result == win:
+            break
+        start = perf_counter()
+        ai.update_possible_combinations(feedback_pins(result,
+                                                      RED_PIN,
+                                                      WHITE_PIN),
+                                        RED_PIN)
+        think_time += perf_counter() - start
+    return GameRecord(secret_id, tuple(guesses), bytes(feedback),
+                      feedback[-1] == win, think_time)
+
+
+def play_games(colours, duplicates, le, codebreaker, no_of_games,
+               max_rounds=NO_OF_ROUNDS):
+    """
+    Plays given number of games with randomly chosen combinations
+
+    Args:
+        colours (list): Allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        codebreaker (type): Class of AI Player guessing the combination
+        no_of_games (int): Number of games to be played
+        max_rounds (int, optional): Limit of guesses.
+        Defaults to NO_OF_ROUNDS.
+
+    Yields:
+        GameRecord: Result of consecutive game
+    """
+    for _ in range(no_of_games):
+        yield play_game(colours, duplicates, le, codebreaker,
+                        max_rounds=max_rounds)
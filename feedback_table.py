@@ -0,0 +1,575 @@
+import os
+import mmap
+from array import array
+from itertools import compress
+import scoring
+from codebook import Codebook
+from filter_cache import MASK_CACHE
+path_to_file = os.path.dirname(__file__)
+TABLE_DIR = os.environ.get("MASTERMIND_TABLE_DIR",
+                           os.path.join(path_to_file, "tables"))
+TABLE_LIMIT = 4096  # Maximal number of combinations with precomputed table
+EQUAL = [bytes(value) + b"\x01" + bytes(255 - value)
+         for value in range(256)]  # Translations marking given byte value
+AT_LEAST = [bytes(value) + b"\x01" * (256 - value)
+            for value in range(256)]  # Translations marking bytes >= value
+BINARY_DIGITS = [b"0" * value + b"1" + b"0" * (255 - value)
+                 for value in range(256)]  # Translations into "1" and "0"
+_loaded_tables = {}  # Tables already loaded in this process
+
+
+def code_space(no_of_colours, duplicates, le):
+    """
+    Returns all integer-coded combinations in a stable order
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+
+    Returns:
+        list: Integer-coded combinations (tuples)
+    """
+    return list(Codebook(no_of_colours, duplicates, le))
+
+
+def bytes_to_mask(flags):
+    """
+    Converts flags into bitset, which has bit number i set
+    if byte number i of flags is 1
+
+    Args:
+        flags (bytes): One byte (0 or 1) per combination
+
+    Returns:
+        int: Bitset of flagged combinations
+    """
+    return int(flags.translate(BINARY_DIGITS[1])[::-1] or b"0", 2)
+
+
+def mask_to_ids(mask, size):
+    """
+    Returns ids of combinations in bitset
+
+    Args:
+        mask (int): Bitset of combinations
+        size (int): Number of all combinations
+
+    Returns:
+        array: Ids of combinations, in increasing order
+    """
+    digits = format(mask, f"0{size}b").encode()[::-1]
+    typecode = "H" if size <= 1 << 16 else "I"
+    # Array is filled from list, which is faster than from iterator
+    return array(typecode, list(compress(range(size),
+                                         digits.translate(EQUAL[b"1"[0]]))))
+
+
+def ids_to_mask(ids, size):
+    """
+    Returns bitset of given combinations
+
+    Args:
+        ids (iterable): Ids of combinations
+        size (int): Number of all combinations
+
+    Returns:
+        int: Bitset of combinations
+    """
+    if isinstance(ids, range) and ids == range(size):
+        return (1 << size) - 1
+    flags = bytearray(size)
+    for code_id in ids:
+        flags[code_id] = 1
+    return bytes_to_mask(flags)
+
+
+def nth_id(mask, n):
+    """
+    Returns id of n-th combination in bitset without extracting all ids.
+    Bitset is halved until the searched bit is in a machine word,
+    so only O(log size) operations on big integers are needed
+
+    Args:
+        mask (int): Bitset of combinations
+        n (int): Position of combination among set bits, from 0
+
+    Raises:
+        IndexError: If bitset has at most n combinations
+
+    Returns:
+        int: Id of combination
+    """
+    if not 0 <= n < mask.bit_count():
+        raise IndexError("Bitset has too few combinations")
+    offset = 0
+    while mask.bit_length() > 64:
+        half = mask.bit_length() >> 1
+        low = mask & ((1 << half) - 1)
+        count = low.bit_count()
+        if n < count:
+            mask = low
+        else:
+            n -= count
+            mask >>= half
+            offset += half
+    for _ in range(n):
+        mask &= mask - 1
+    return offset + (mask & -mask).bit_length() - 1
+
+
+def build_table(codes, no_of_colours):
+    """
+    Builds feedback for every pair of combinations.
+    Byte at position guess_id * len(codes) + secret_id holds packed feedback.
+
+    Every row is computed at once: each secret gets one byte lane inside
+    a big integer, so adding lane masks counts pins for all secrets together
+
+    Args:
+        codes (list): Integer-coded combinations
+        no_of_colours (int): Number of allowed colours
+
+    Returns:
+        bytearray: Feedback table
+    """
+    size = len(codes)
+    le = len(codes[0]) if codes else 0
+
+    def lanes(condition):
+        return int.from_bytes(bytes(1 if condition(code) else 0
+                                    for code in codes), "little")
+    # position_masks[p][v] - lanes of secrets having colour v at position p
+    position_masks = [[lanes(lambda code: code[p] == v)
+                       for v in range(no_of_colours)]
+                      for p in range(le)]
+    # count_masks[v][k] - lanes of secrets having colour v at least k times
+    count_masks = [[lanes(lambda code: code.count(v) >= k)
+                    for k in range(le + 1)]
+                   for v in range(no_of_colours)]
+    # Feedback byte is red << 4 | white, where white = common - red
+    multiplier = (1 << scoring.RED_SHIFT) - 1
+    table = bytearray()
+    for guess in codes:
+        red = sum(position_masks[p][v] for p, v in enumerate(guess))
+        common = 0
+        for colour in set(guess):
+            for k in range(1, guess.count(colour) + 1):
+                common += count_masks[colour][k]
+        table += (red * multiplier + common).to_bytes(size, "little")
+    return table
+
+
+class FeedbackTable:
+    """
+    All-pairs feedback for one configuration
+
+    Attributes:
+        no_of_colours (int): Number of allowed colours
+        codebook (Codebook): Maps combinations to their ids and back
+        size (int): Number of combinations
+        _buffer (bytes, bytearray or mmap): Feedback table
+        _codes (list): Integer-coded combinations, position is combination id
+        _index (dict): Maps integer-coded combination, as tuple or bytes,
+        to its id. Tables are small, so lookup is kept O(1)
+
+    Methods:
+        __init__: creates table object
+        code: returns integer-coded combination with given id
+        rank: returns id of integer-coded combination
+        feedback: returns packed feedback for pair of combination ids
+        row: returns packed feedback of one guess against every combination
+        mask: returns bitset of combinations giving feedback for a guess
+        score: returns packed feedback for pair of integer-coded combinations
+    """
+    def __init__(self, codebook, buffer):
+        """
+        Creates table object
+
+        Args:
+            codebook (Codebook): Combinations of the configuration
+            buffer (bytes, bytearray or mmap): Feedback table
+        """
+        self.no_of_colours = codebook.no_of_colours
+        self.codebook = codebook
+        self.size = codebook.size
+        self._buffer = buffer
+        self._codes = list(codebook)
+        self._index = {}
+        for code_id, code in enumerate(self._codes):
+            self._index[code] = code_id
+            self._index[bytes(code)] = code_id
+
+    def code(self, code_id):
+        """
+        Returns integer-coded combination with given id
+
+        Args:
+            code_id (int): Id of combination
+
+        Returns:
+            tuple: Integer-coded combination
+        """
+        return self._codes[code_id]
+
+    def rank(self, code):
+        """
+        Returns id of integer-coded combination
+
+        Args:
+            code (tuple or bytes): Integer-coded combination
+
+        Raises:
+            ValueError: If combination is not legal
+
+        Returns:
+            int: Id of combination
+        """
+        code_id = self._index.get(code)
+        if code_id is None:
+            return self.codebook.rank(code)
+        return code_id
+
+    def feedback(self, guess_id, secret_id):
+        """
+        Returns packed feedback for pair of combination ids
+
+        Args:
+            guess_id (int): Id of the guess
+            secret_id (int): Id of the secret combination
+
+        Returns:
+            int: Packed feedback
+        """
+        return self._buffer[guess_id * self.size + secret_id]
+
+    def row(self, guess_id):
+        """
+        Returns packed feedback of one guess against every combination
+
+        Args:
+            guess_id (int): Id of the guess
+
+        Returns:
+            bytes: Feedback indexed by secret combination id
+        """
+        start = guess_id * self.size
+        return self._buffer[start:start + self.size]
+
+    def mask(self, guess_id, feedback):
+        """
+        Returns bitset of combinations, which give feedback for the guess.
+        Bitsets are kept in shared MASK_CACHE
+
+        Args:
+            guess_id (int): Id of the guess
+            feedback (int): Packed feedback
+
+        Returns:
+            int: Bitset with bit number i set for consistent combination i
+        """
+        return _cached_mask(self, guess_id, feedback)
+
+    def score(self, guess, secret):
+        """
+        Returns packed feedback for pair of integer-coded combinations.
+        Combinations outside of the table are scored directly
+
+        Args:
+            guess (tuple or bytes): Integer-coded guess
+            secret (tuple or bytes): Integer-coded secret combination
+
+        Returns:
+            int: Packed feedback
+        """
+        index = self._index
+        guess_id = index.get(guess)
+        secret_id = index.get(secret)
+        if guess_id is None or secret_id is None:
+            return scoring.score(guess, secret, self.no_of_colours)
+        return self._buffer[guess_id * self.size + secret_id]
+
+
+class LazyFeedbackTable:
+    """
+    Feedback for configurations too big for precomputed table.
+    Combinations are stored column by column, one byte per peg, and rows
+    of feedback are computed on demand with byte translations
+
+    Attributes:
+        no_of_colours (int): Number of allowed colours
+        codebook (Codebook): Maps combinations to their ids and back
+        size (int): Number of combinations
+        _columns (list): Pegs of all combinations at consecutive positions
+
+    Methods:
+        __init__: creates table object
+        code: returns integer-coded combination with given id
+        rank: returns id of integer-coded combination
+        feedback: returns packed feedback for pair of combination ids
+        row: returns packed feedback of one guess against every combination
+        row_for: returns packed feedback of integer-coded guess against
+    every combination
+        mask: returns bitset of combinations giving feedback for a guess
+        score: returns packed feedback for pair of integer-coded combinations
+    """
+    def __init__(self, no_of_colours, duplicates, le):
+        """
+        Creates table object. Columns of combinations with duplicates
+        are repeated patterns, combinations without duplicates are
+        selected from them
+
+        Args:
+            no_of_colours (int): Number of allowed colours
+            duplicates (bool): True if duplicates are enabled, False otherwise
+            le (int): Length of combination
+        """
+        self.no_of_colours = no_of_colours
+        self.codebook = Codebook(no_of_colours, duplicates, le)
+        columns = [b"".join(bytes([colour]) * no_of_colours ** (le - 1 - p)
+                            for colour in range(no_of_colours))
+                   * no_of_colours ** p
+                   for p in range(le)]
+        if not duplicates:
+            size = no_of_colours ** le
+            repeated = sum(int.from_bytes(
+                self._colour_counts(columns, colour, size).translate(
+                    AT_LEAST[2]), "little")
+                for colour in range(no_of_colours))
+            keep = repeated.to_bytes(size, "little").translate(EQUAL[0])
+            columns = [bytes(compress(column, keep)) for column in columns]
+        self._columns = columns
+        self.size = len(columns[0]) if columns else 0
+
+    @staticmethod
+    def _colour_counts(columns, colour, size):
+        """
+        Returns number of pegs of given colour in every combination
+
+        Args:
+            columns (list): Pegs of combinations at consecutive positions
+            colour (int): Peg value
+            size (int): Number of combinations
+
+        Returns:
+            bytes: Number of pegs of given colour, one byte per combination
+        """
+        total = sum(int.from_bytes(column.translate(EQUAL[colour]), "little")
+                    for column in columns)
+        return total.to_bytes(size, "little")
+
+    def code(self, code_id):
+        """
+        Returns integer-coded combination with given id
+
+        Args:
+            code_id (int): Id of combination
+
+        Returns:
+            tuple: Integer-coded combination
+        """
+        return tuple(column[code_id] for column in self._columns)
+
+    def rank(self, code):
+        """
+        Returns id of integer-coded combination
+
+        Args:
+            code (tuple): Integer-coded combination
+
+        Returns:
+            int: Id of combination
+        """
+        return self.codebook.rank(code)
+
+    def feedback(self, guess_id, secret_id):
+        """
+        Returns packed feedback for pair of combination ids
+
+        Args:
+            guess_id (int): Id of the guess
+            secret_id (int): Id of the secret combination
+
+        Returns:
+            int: Packed feedback
+        """
+        return self.score(self.code(guess_id), self.code(secret_id))
+
+    def row(self, guess_id):
+        """
+        Returns packed feedback of one guess against every combination
+
+        Args:
+            guess_id (int): Id of the guess
+
+        Returns:
+            bytes: Feedback indexed by secret combination id
+        """
+        return self.row_for(self.code(guess_id))
+
+    def row_for(self, guess):
+        """
+        Returns packed feedback of integer-coded guess against every
+        combination. Every combination gets one byte lane inside
+        a big integer, like in build_table
+
+        Args:
+            guess (tuple): Integer-coded guess
+
+        Returns:
+            bytes: Feedback indexed by secret combination id
+        """
+        red = sum(int.from_bytes(column.translate(EQUAL[peg]), "little")
+                  for column, peg in zip(self._columns, guess))
+        common = 0
+        for colour in set(guess):
+            counts = self._colour_counts(self._columns, colour, self.size)
+            for k in range(1, guess.count(colour) + 1):
+                common += int.from_bytes(counts.translate(AT_LEAST[k]),
+                                         "little")
+        multiplier = (1 << scoring.RED_SHIFT) - 1
+        return (red * multiplier + common).to_bytes(self.size, "little")
+
+    def mask(self, guess_id, feedback):
+        """
+        Returns bitset of combinations, which give feedback for the guess.
+        Bitsets are kept in shared MASK_CACHE
+
+        Args:
+            guess_id (int): Id of the guess
+            feedback (int): Packed feedback
+
+        Returns:
+            int: Bitset with bit number i set for consistent combination i
+        """
+        return _cached_mask(self, guess_id, feedback)
+
+    def score(self, guess, secret):
+        """
+        Returns packed feedback for pair of integer-coded combinations
+
+        Args:
+            guess (tuple): Integer-coded guess
+            secret (tuple): Integer-coded secret combination
+
+        Returns:
+            int: Packed feedback
+        """
+        return scoring.score(guess, secret, self.no_of_colours)
+
+
+def _cached_mask(table, guess_id, feedback):
+    """
+    Returns bitset of combinations, which give feedback for the guess,
+    from shared MASK_CACHE. Missing bitset is computed from row of table
+
+    Args:
+        table (FeedbackTable or LazyFeedbackTable): Table of configuration
+        guess_id (int): Id of the guess
+        feedback (int): Packed feedback
+
+    Returns:
+        int: Bitset with bit number i set for consistent combination i
+    """
+    codebook = table.codebook
+    key = (codebook.no_of_colours, codebook.duplicates, codebook.le,
+           guess_id, feedback)
+    mask = MASK_CACHE.get(key)
+    if mask is None:
+        mask = bytes_to_mask(table.row(guess_id).translate(EQUAL[feedback]))
+        MASK_CACHE.put(key, mask)
+    return mask
+
+
+def table_path(no_of_colours, duplicates, le, directory=TABLE_DIR):
+    """
+    Returns path of the file storing table for given configuration
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        directory (str, optional): Directory with tables.
+        Defaults to TABLE_DIR.
+
+    Returns:
+        str: Path to table file
+    """
+    dupes = "d" if duplicates else "u"
+    return os.path.join(directory,
+                        f"feedback_{no_of_colours}_{dupes}_{le}.bin")
+
+
+def _map_file(path, expected_size):
+    """
+    Memory-maps table file if it exists and has expected size
+
+    Args:
+        path (str): Path to table file
+        expected_size (int): Expected size of file in bytes
+
+    Returns:
+        mmap: Mapped table or None if file is missing or damaged
+    """
+    try:
+        with open(path, "rb") as filehandle:
+            if os.fstat(filehandle.fileno()).st_size != expected_size:
+                return None
+            return mmap.mmap(filehandle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+
+def save_buffer(path, buffer):
+    """
+    Saves buffer atomically, so that concurrent workers never see
+    partially written file. Failure to save is not an error
+
+    Args:
+        path (str): Path to file
+        buffer (bytearray): Data to be saved
+    """
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(temp_path, "wb") as filehandle:
+            filehandle.write(buffer)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def load_table(no_of_colours, duplicates, le, directory=TABLE_DIR):
+    """
+    Returns feedback table for given configuration. Table is memory-mapped
+    from disk if it was saved before, otherwise it is built and saved.
+    Configurations with more than TABLE_LIMIT combinations get
+    LazyFeedbackTable instead
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        directory (str, optional): Directory with tables.
+        Defaults to TABLE_DIR.
+
+    Returns:
+        FeedbackTable: Table for given configuration
+    """
+    key = (no_of_colours, duplicates, le, directory)
+    if key in _loaded_tables:
+        return _loaded_tables[key]
+    codebook = Codebook(no_of_colours, duplicates, le)
+    if codebook.size > TABLE_LIMIT:
+        table = LazyFeedbackTable(no_of_colours, duplicates, le)
+        _loaded_tables[key] = table
+        return table
+    path = table_path(no_of_colours, duplicates, le, directory)
+    buffer = _map_file(path, codebook.size ** 2)
+    if buffer is None:
+        buffer = build_table(list(codebook), no_of_colours)
+        save_buffer(path, buffer)
+    table = FeedbackTable(codebook, buffer)
+    _loaded_tables[key] = table
+    return table
@@ -0,0 +1,146 @@
+import os
+from collections import OrderedDict
+from threading import Lock
+DEFAULT_MAX_BYTES = int(os.environ.get("MASTERMIND_FILTER_CACHE_BYTES",
+                                       64 * 1024 * 1024))
+
+
+class FilterCache:
+    """
+    Size-bounded cache of candidate filters (bitsets of combinations
+    consistent with a guess and its feedback). When the total size of
+    bitsets exceeds the limit, the least recently used ones are evicted.
+    Cache can be used by many threads
+
+    Attributes:
+        max_bytes (int): Limit of total size of cached bitsets
+        hits (int): Number of lookups answered from cache
+        misses (int): Number of lookups that had to compute the bitset
+        evictions (int): Number of bitsets removed to respect the limit
+        _bytes (int): Total size of cached bitsets
+        _entries (OrderedDict): Cached bitsets, least recently used first
+        _lock (Lock): Guards entries and statistics
+
+    Methods:
+        __init__: creates cache object
+        get: returns cached bitset
+        put: stores bitset
+        resize: changes limit of total size of cached bitsets
+        clear: removes all bitsets and resets statistics
+        stats: returns statistics of the cache
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Creates cache object
+
+        Args:
+            max_bytes (int, optional): Limit of total size of cached bitsets.
+            Defaults to DEFAULT_MAX_BYTES.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._bytes = 0
+        self._entries = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key):
+        """
+        Returns cached bitset and marks it as recently used
+
+        Args:
+            key (tuple): Configuration, guess id and feedback
+
+        Returns:
+            int or None: Bitset for the key, None if it is not cached
+        """
+        with self._lock:
+            mask = self._entries.get(key)
+            if mask is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return mask
+
+    def put(self, key, mask):
+        """
+        Stores bitset and evicts least recently used ones above the limit
+
+        Args:
+            key (tuple): Configuration, guess id and feedback
+            mask (int): Bitset for the key
+        """
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = mask
+            self._bytes += _size(mask)
+            self._evict()
+
+    def resize(self, max_bytes):
+        """
+        Changes limit of total size of cached bitsets
+
+        Args:
+            max_bytes (int): New limit
+        """
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        """
+        Removes all bitsets and resets statistics
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """
+        Returns statistics of the cache
+
+        Returns:
+            dict: Hits, misses, evictions, hit rate, number of entries,
+            their total size and the limit
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes
+        }
+
+    def _evict(self):
+        """
+        Removes least recently used bitsets until limit is respected
+        """
+        while self._bytes > self.max_bytes and self._entries:
+            _, mask = self._entries.popitem(last=False)
+            self._bytes -= _size(mask)
+            self.evictions += 1
+
+
+def _size(mask):
+    """
+    Returns size of bitset in bytes
+
+    Args:
+        mask (int): Bitset
+
+    Returns:
+        int: Size of bitset
+    """
+    return (mask.bit_length() + 7) // 8
+
+
+MASK_CACHE = FilterCache()  # Shared by all tables and bots in the process
@@ -0,0 +1,281 @@
+import atexit
+import os
+import struct
+from collections import namedtuple
+from codebook import Codebook
+from scoring import decode, feedback_pins
+import game_logic
+import user_interface
+GAME_LOG = os.environ.get("MASTERMIND_GAME_LOG")
+# Path of log, to which games played through Game.guessing_phase are
+# appended. Games are not logged if it is not set
+BUFFER_SIZE = 1 << 16  # Bytes buffered by writer and reader
+MAGIC = b"MMLG"
+FILE_HEADER = struct.Struct("<4sB")  # magic, version
+VERSION = 1
+RECORD = struct.Struct("<BBBBBI")
+# mode, flags, colours without blank, length, rounds, secret id;
+# followed by guess ids (2 or 4 bytes each) and packed feedback (1 byte each)
+DUPLICATES = 1  # Flags of record
+BLANKS = 2
+WIDE_IDS = 4
+WON = 8
+LoggedGame = namedtuple("LoggedGame",
+                        ["mode", "no_of_colours", "blanks", "duplicates",
+                         "le", "secret", "guesses", "feedback", "won"])
+# mode (int) - running mode of the game
+# no_of_colours (int) - number of colours from PALETTE
+# blanks (bool) - whether empty spaces were allowed
+# duplicates (bool) - whether duplicates were allowed
+# le (int) - length of combination
+# secret (int) - id of the correct combination
+# guesses (tuple) - ids of consecutive guesses
+# feedback (bytes) - packed feedback for consecutive guesses
+# won (bool) - whether the correct combination was guessed
+_default_writer = None  # Writer of GAME_LOG, opened with the first game
+_wide_ids = {}  # Whether ids need 4 bytes, for every configuration
+_id_structs = {}  # Structs of guess ids, for id code and number of rounds
+
+
+def _ids_struct(id_code, rounds):
+    """
+    Returns struct packing given number of guess ids
+
+    Args:
+        id_code (str): "H" for 2-byte ids, "I" for 4-byte ids
+        rounds (int): Number of guesses
+
+    Returns:
+        Struct: Struct of guess ids
+    """
+    key = (id_code, rounds)
+    if key not in _id_structs:
+        _id_structs[key] = struct.Struct(f"<{rounds}{id_code}")
+    return _id_structs[key]
+
+
+def pack_game(entry):
+    """
+    Serializes one game
+
+    Args:
+        entry (LoggedGame): Game to be serialized
+
+    Returns:
+        bytes: Record of the game
+    """
+    rounds = len(entry.guesses)
+    configuration = (entry.no_of_colours + entry.blanks, entry.duplicates,
+                     entry.le)
+    if configuration not in _wide_ids:
+        _wide_ids[configuration] = Codebook(*configuration).size > 1 << 16
+    wide = _wide_ids[configuration]
+    flags = (DUPLICATES * entry.duplicates | BLANKS * entry.blanks |
+             WIDE_IDS * wide | WON * entry.won)
+    ids = _ids_struct("I" if wide else "H", rounds)
+    return (RECORD.pack(entry.mode, flags, entry.no_of_colours, entry.le,
+                        rounds, entry.secret) +
+            ids.pack(*entry.guesses) + bytes(entry.feedback))
+
+
+class GameLogWriter:
+    """
+    Buffered writer appending records of games to a log file
+
+    Attributes:
+        path (str): Path of log file
+        _file (BufferedWriter): Log file opened for appending
+
+    Methods:
+        __init__: opens log file
+        write: appends one game
+        flush: writes buffered records to the file
+        close: flushes and closes the file
+        __enter__: returns writer
+        __exit__: closes writer
+    """
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        """
+        Opens log file for appending. New file starts with FILE_HEADER
+
+        Args:
+            path (str): Path of log file
+            buffer_size (int, optional): Bytes buffered before writing.
+            Defaults to BUFFER_SIZE.
+
+        Raises:
+            ValueError: If existing file is not a game log
+        """
+        self.path = path
+        self._file = open(path, "ab", buffering=buffer_size)
+        if self._file.tell() == 0:
+            self._file.write(FILE_HEADER.pack(MAGIC, VERSION))
+        else:
+            _check_header(path)
+
+    def write(self, entry):
+        """
+        Appends one game
+
+        Args:
+            entry (LoggedGame): Game to be appended
+        """
+        self._file.write(pack_game(entry))
+
+    def flush(self):
+        """
+        Writes buffered records to the file
+        """
+        self._file.flush()
+
+    def close(self):
+        """
+        Flushes and closes the file
+        """
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def _check_header(path):
+    """
+    Checks whether file is a game log
+
+    Args:
+        path (str): Path of the file
+
+    Raises:
+        ValueError: If file is not a game log of known version
+    """
+    with open(path, "rb") as filehandle:
+        header = filehandle.read(FILE_HEADER.size)
+    if len(header) < FILE_HEADER.size or \
+            FILE_HEADER.unpack(header) != (MAGIC, VERSION):
+        raise ValueError(f"{path} is not a game log")
+
+
+def read_games(path, buffer_size=BUFFER_SIZE):
+    """
+    Reads games one by one, so memory use does not depend on
+    the size of the log. Incomplete record at the end of the file,
+    left by interrupted writer, is skipped
+
+    Args:
+        path (str): Path of log file
+        buffer_size (int, optional): Bytes read at once.
+        Defaults to BUFFER_SIZE.
+
+    Raises:
+        ValueError: If file is not a game log
+
+    Yields:
+        LoggedGame: Consecutive games
+    """
+    _check_header(path)
+    record_size = RECORD.size
+    unpack_record = RECORD.unpack
+    with open(path, "rb", buffering=buffer_size) as filehandle:
+        filehandle.seek(FILE_HEADER.size)
+        read = filehandle.read
+        while True:
+            header = read(record_size)
+            if len(header) < record_size:
+                return
+            mode, flags, no_of_colours, le, rounds, secret = \
+                unpack_record(header)
+            ids = _ids_struct("I" if flags & WIDE_IDS else "H", rounds)
+            body = read(ids.size + rounds)
+            if len(body) < ids.size + rounds:
+                return
+            yield LoggedGame(mode, no_of_colours, bool(flags & BLANKS),
+                             bool(flags & DUPLICATES), le, secret,
+                             ids.unpack_from(body), body[ids.size:],
+                             bool(flags & WON))
+
+
+def log_game(game):
+    """
+    Appends game to GAME_LOG, if it is set
+
+    Args:
+        game (Game): Finished game
+    """
+    global _default_writer
+    if GAME_LOG is None:
+        return
+    if _default_writer is None:
+        _default_writer = GameLogWriter(GAME_LOG)
+        atexit.register(_default_writer.close)
+    _default_writer.write(game.log_entry())
+
+
+def replay(entry):
+    """
+    Shows game round by round with user_interface.ai_guess_printer
+
+    Args:
+        entry (LoggedGame): Game to be shown
+    """
+    colours = game_logic.game_colours(entry.blanks, entry.no_of_colours)
+    codebook = Codebook(len(colours), entry.duplicates, entry.le)
+    guesses = []
+    correctness = []
+    for guess_id, feedback in zip(entry.guesses, entry.feedback):
+        guesses.append(decode(codebook.unrank(guess_id), colours))
+        correctness.append(feedback_pins(feedback,
+                                         game_logic.RED_PIN,
+                                         game_logic.WHITE_PIN))
+        user_interface.ai_guess_printer(guesses, correctness)
+
+
+def summarize(path):
+    """
+    Computes statistics of all games in the log
+
+    Args:
+        path (str): Path of log file
+
+    Returns:
+        dict: Number of games, wins, mean and max number of guesses
+    """
+    games = wins = total_guesses = max_guesses = 0
+    for entry in read_games(path):
+        games += 1
+        wins += entry.won
+        total_guesses += len(entry.guesses)
+        max_guesses = max(max_guesses, len(entry.guesses))
+    return {
+        "games": games,
+        "wins": wins,
+        "mean_guesses": total_guesses / games if games else 0.0,
+        "max_guesses": max_guesses
+    }
+
+
+def main():
+    """
+    Prints statistics of the log or replays one of its games
+    """
+    import argparse
+    parser = argparse.ArgumentParser(description="Mastermind game log")
+    parser.add_argument("path")
+    parser.add_argument("--replay", type=int, metavar="GAME",
+                        help="number of game to be replayed, from 0")
+    args = parser.parse_args()
+    if args.replay is None:
+        for name, value in summarize(args.path).items():
+            print(f"{name}: {value}")
+        return
+    for number, entry in enumerate(read_games(args.path)):
+        if number == args.replay:
+            replay(entry)
+            return
+    print(f"There is no game {args.replay}")
+
+
+if __name__ == "__main__":
+    main()
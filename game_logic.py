@@ -1,23 +1,281 @@
+import os
 import user_interface
-from bots import Bot_clever, Bot_random, bot_set_combination
+import scoring
+import feedback_table
+import game_log
+from bots import (
+                  Bot_background,
+                  Bot_book,
+                  Bot_clever,
+                  Bot_random,
+                  bot_set_combination,
+                  )
 COMBINATION_LENGTH = 4
 ALLOWED_COLOURS = ["Red", "Purple", "Yellow", "Blue", "Green", "White"]
+PALETTE = ALLOWED_COLOURS + ["Orange", "Pink", "Brown", "Cyan"]
+# Colours available for bigger variants of the game
 EMPTY_NOTATION = "Empty"  # literal used to denote an empty space
 WHITE_PIN = "White"  # literal used to denote a white pin
 RED_PIN = "Red"  # literal used to denote a red pin
-OPTIONS = ["2 Players", "Easy AI", "Hard AI", "Rules"]
+OPTIONS = ["2 Players", "Easy AI", "Hard AI", "Expert AI", "Rules"]
 CONFIGURATIONS = [
     "No duplicates, no empty spaces",
     "No duplicates, empty spaces allowed",
     "Duplicates allowed, no empty spaces",
     "Duplicates and empty spaces allowed"
 ]
+SETTINGS = [(False, False), (False, True), (True, False), (True, True)]
+# Duplicates and empty spaces allowance for every configuration
+VARIANTS = [
+    "Classic: 4 elements, 6 colours",
+    "Super Mastermind: 5 elements, 8 colours",
+    "Grand: 6 elements, 10 colours"
+]
+VARIANT_SIZES = [(COMBINATION_LENGTH, len(ALLOWED_COLOURS)), (5, 8), (6, 10)]
+# Combination length and number of colours for every variant
 NO_OF_ROUNDS = 25
-MODES = [0, 1, 2, 3]
+MODES = [0, 1, 2, 3, 4]
 # Mode 0 - Player 1 chooses the combination, Player 2 guesses it
 # Mode 1 - AI chooses the combination, Player guesses it
 # Mode 2 - Player chooses the combination, Easy AI guesses it
 # Mode 3 - Player chooses the combination, Hard AI guesses it
+# Mode 4 - Player chooses the combination, Expert AI guesses it
+AI_PLAYERS = {
+    MODES[2]: Bot_random,
+    MODES[3]: Bot_clever,
+    MODES[4]: Bot_book
+}
+AI_MOVE_TIME = float(os.environ.get("MASTERMIND_MOVE_TIME", 2))
+# Seconds, within which AI chooses a guess after getting feedback
+
+
+def game_colours(blanks: bool, no_of_colours=len(ALLOWED_COLOURS)):
+    """
+    Returns colours allowed in a game
+
+    Args:
+        blanks (bool): Denotes whether empty spaces are allowed
+        no_of_colours (int, optional): Number of colours from PALETTE.
+        Defaults to number of ALLOWED_COLOURS.
+
+    Returns:
+        list: Allowed colours
+    """
+    colours = []
+    colours.extend(PALETTE[:no_of_colours])
+    if blanks is True:
+        colours.append(EMPTY_NOTATION)
+    return colours
+
+
+_shared_colours = {}  # Colour lists shared by games of the same configuration
+
+
+def _game_colours(blanks, no_of_colours):
+    """
+    Returns colours allowed in a game, shared by all games
+    of the same configuration. The list must not be modified
+
+    Args:
+        blanks (bool): Denotes whether empty spaces are allowed
+        no_of_colours (int): Number of colours from PALETTE
+
+    Returns:
+        list: Allowed colours
+    """
+    key = (blanks, no_of_colours)
+    if key not in _shared_colours:
+        _shared_colours[key] = game_colours(blanks, no_of_colours)
+    return _shared_colours[key]
+
+
+class _Rounds:
+    """
+    Base class for list-like views of compact game state. Views are
+    created on access, so games keep only bytes
+
+    Attributes:
+        _game (Game): Viewed game
+
+    Methods:
+        __init__: creates view object
+        __len__: returns number of elements
+        __getitem__: returns element or list of elements
+        __iter__: iterates over elements
+        __eq__: compares elements with other sequence
+        __repr__: returns elements in list form
+    """
+    __slots__ = ("_game",)
+
+    def __init__(self, game):
+        """
+        Creates view object
+
+        Args:
+            game (Game): Viewed game
+        """
+        self._game = game
+
+    def __len__(self):
+        """
+        Placeholder for inheriting classes
+        """
+        return 0
+
+    def _item(self, index):
+        """
+        Placeholder for inheriting classes, which return element
+        with non-negative index
+        """
+        pass
+
+    def __getitem__(self, index):
+        """
+        Returns element or list of elements
+
+        Args:
+            index (int or slice): Index of element
+
+        Raises:
+            IndexError: If index is out of range
+
+        Returns:
+            list: Element or list of elements
+        """
+        length = len(self)
+        if isinstance(index, slice):
+            return [self._item(n) for n in range(*index.indices(length))]
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError("round index out of range")
+        return self._item(index)
+
+    def __iter__(self):
+        """
+        Iterates over elements
+
+        Returns:
+            iterator: Consecutive elements
+        """
+        return map(self._item, range(len(self)))
+
+    def __eq__(self, other):
+        """
+        Compares elements with other sequence
+
+        Args:
+            other (iterable): Compared sequence
+
+        Returns:
+            bool: True if elements are equal. Otherwise False
+        """
+        return list(self) == list(other)
+
+    def __repr__(self):
+        """
+        Returns elements in list form
+
+        Returns:
+            str: Elements in list form
+        """
+        return repr(list(self))
+
+
+class _Guesses(_Rounds):
+    """
+    List-like view of guesses of a game, stored as colour indexes.
+    Inherits from _Rounds
+
+    Methods:
+        __len__: returns number of guesses
+        _item: returns guess in colour names
+        append: appends guess
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        """
+        Returns number of guesses
+
+        Returns:
+            int: Number of guesses
+        """
+        return self._game.rounds_played()
+
+    def _item(self, index):
+        """
+        Returns guess in colour names
+
+        Args:
+            index (int): Number of guess
+
+        Returns:
+            list: Guess
+        """
+        game = self._game
+        start = game._comb_len + index * (game._comb_len + 1)
+        return scoring.decode(game._record[start:start + game._comb_len],
+                              game._colours)
+
+    def append(self, guess):
+        """
+        Appends guess
+
+        Args:
+            guess (list): Guess in colour names
+        """
+        game = self._game
+        game._record += bytes(scoring.encode(guess, game._colours))
+
+
+class _Correctness(_Rounds):
+    """
+    List-like view of correctness of guesses, stored as packed feedback.
+    Inherits from _Rounds
+
+    Methods:
+        __len__: returns number of checked guesses
+        _item: returns red and white pins of a guess
+        append: appends correctness of a guess
+    """
+    __slots__ = ()
+
+    def __len__(self):
+        """
+        Returns number of checked guesses
+
+        Returns:
+            int: Number of checked guesses
+        """
+        game = self._game
+        return (len(game._record) - game._comb_len) // (game._comb_len + 1)
+
+    def _item(self, index):
+        """
+        Returns red and white pins of a guess
+
+        Args:
+            index (int): Number of guess
+
+        Returns:
+            list: Red pins and white pins
+        """
+        game = self._game
+        position = (index + 2) * (game._comb_len + 1) - 2
+        return scoring.feedback_pins(game._record[position],
+                                     RED_PIN,
+                                     WHITE_PIN)
+
+    def append(self, correctness):
+        """
+        Appends correctness of the last guess
+
+        Args:
+            correctness (list): Red pins and white pins
+        """
+        feedback = scoring.pins_feedback(correctness, RED_PIN)
+        self._game._record += bytes((feedback,))
 
 
 class DuplicatesDetectedError(Exception):
@@ -31,32 +289,55 @@ class DuplicatesDetectedError(Exception):
 
 class Game:
     """
-    A class used to store elements of a game and run it
+    A class used to store elements of a game and run it.
+    State is compact: combinations are kept as colour indexes and
+    correctness as packed feedback, all in a single immutable byte string,
+    which is replaced when round is added
 
     Attributes:
         _mode (int): Running mode of the game
-        _allowed_colours (list): Colours that can be picked
+        _colours (list): Colours that can be picked, shared between games
         _duplicates (bool): Information whether duplicates are allowed
-        _combination (list): Correct combination
-        _guesses (list): Guesses of the player
-        _guess_correctness (list): Correctness of player's guesses
+        _comb_len (int): Length of combination
+        _record (bytes): Colour indexes of correct combination followed
+        by colour indexes and packed feedback of every guess
         _game_won (bool): Information whether correct combination was guessed
+        _table (FeedbackTable): Feedback for every pair of combinations
+
+    Properties:
+        _allowed_colours (list): Colours that can be picked
+        _combination (list): Correct combination
+        _guesses (list-like): Guesses of the player
+        _guess_correctness (list-like): Correctness of player's guesses
 
     Methods:
         __init__: creates game object
         allowed_colours: returns allowed colours
         _check_length: returns information whether combination has good length
         check_duplicates: checks for duplicates in a given combination
+        validate_combination: checks whether combination can be played
         set_combination: chooses combination and returns it
+        _score_last_guess: returns packed feedback for last guess
         check_colours: returns number of correct colours in a combination
         check_colours_and_place: returns number of red pins
         check_combination: returns list with correctness of combination
         guess_combination: guesses combination
+        play_guess: plays given guess and returns its correctness
         check_if_won: checks if game has been won in the last guess
+        is_won: returns information whether game has been won
+        is_finished: returns information whether game has ended
+        rounds_played: returns number of guesses made so far
+        combination: returns correct combination
+        log_entry: returns compact record of the game
         game_result: displays game results to player(s)
         guessing_phase: used for running guessing in the game
     """
-    def __init__(self, mode, duplicates: bool, blanks: bool):
+    __slots__ = ("_mode", "_colours", "_duplicates", "_comb_len", "_table",
+                 "_record", "_game_won")
+
+    def __init__(self, mode, duplicates: bool, blanks: bool,
+                 le=COMBINATION_LENGTH, no_of_colours=len(ALLOWED_COLOURS),
+                 combination=None):
         """
         Creates game object
 
@@ -64,25 +345,84 @@ class Game:
             mode (int): Denotes mode that the game is running in
             duplicates (bool): Denotes whether duplicates are allowed
             blanks (bool): Denotes whether empty spaces are allowed
+            le (int, optional): Length of combination.
+            Defaults to COMBINATION_LENGTH.
+            no_of_colours (int, optional): Number of colours from PALETTE.
+            Defaults to number of ALLOWED_COLOURS.
+            combination (list, optional): Correct combination. Defaults to
+            None, which means it is chosen by AI (mode 1) or by player
         """
         self._mode = mode
-        self._allowed_colours = []
-        self._allowed_colours.extend(ALLOWED_COLOURS)
+        self._colours = _game_colours(blanks, no_of_colours)
         self._duplicates = duplicates
-        if blanks is True:
-            self._allowed_colours.append(EMPTY_NOTATION)
-        if self._mode == MODES[1]:
+        self._comb_len = le
+        self._table = feedback_table.load_table(len(self._colours),
+                                                self._duplicates,
+                                                self._comb_len)
+        self._record = bytes(le)
+        self._game_won = False
+        if combination is not None:
+            self._combination = self.validate_combination(combination)
+        elif self._mode == MODES[1]:
             self._combination = bot_set_combination(self._allowed_colours,
                                                     self._duplicates,
-                                                    COMBINATION_LENGTH)
+                                                    self._comb_len)
         else:
             self._combination = self.set_combination()
-        self._guesses = []
-        self._guess_correctness = []
-        self._game_won = False
+
+    @property
+    def _allowed_colours(self):
+        """
+        Returns colours that can be picked
+
+        Returns:
+            list: Allowed colours
+        """
+        return self._colours
+
+    @property
+    def _combination(self):
+        """
+        Returns correct combination
+
+        Returns:
+            list: Correct combination
+        """
+        return scoring.decode(self._record[:self._comb_len], self._colours)
+
+    @_combination.setter
+    def _combination(self, combination):
+        """
+        Sets correct combination
+
+        Args:
+            combination (list): Correct combination
+        """
+        self._record = bytes(scoring.encode(combination, self._colours)) + \
+            self._record[self._comb_len:]
+
+    @property
+    def _guesses(self):
+        """
+        Returns guesses of the player
+
+        Returns:
+            _Guesses: List-like view of guesses
+        """
+        return _Guesses(self)
+
+    @property
+    def _guess_correctness(self):
+        """
+        Returns correctness of player's guesses
+
+        Returns:
+            _Correctness: List-like view of correctness
+        """
+        return _Correctness(self)
 
     def allowed_colours(self):
-        return self._allowed_colours
+        return self._colours
 
     def _check_length(self, combination):
         """
@@ -92,11 +432,11 @@ class Game:
             combination (list): Combination to be checked
 
         Returns:
-            bool: True if length of combination is equal to COMBINATION_LENGTH.
+            bool: True if length of combination is equal to _comb_len.
             Otherwise False
         """
         try:
-            return COMBINATION_LENGTH == len(combination)
+            return self._comb_len == len(combination)
         except TypeError:
             return False
 
@@ -110,10 +450,34 @@ class Game:
         Returns:
             bool: True if no duplicates were detected. Otherwise False
         """
-        no_dupes = [i for n, i in enumerate(comb) if i not in comb[:n]]
-        if no_dupes == comb:
-            return True
-        return False
+        return len(set(comb)) == len(comb)
+
+    def validate_combination(self, combination):
+        """
+        Checks whether combination has proper length, allowed colours
+        and no unpermitted duplicates
+
+        Args:
+            combination (list): Combination to be checked
+
+        Raises:
+            ValueError: If combination has wrong length or colours
+            DuplicatesDetectedError: If unpermitted duplicates were detected
+
+        Returns:
+            list: Checked combination
+        """
+        combination = list(combination)
+        if not self._check_length(combination):
+            raise ValueError(f"{combination} should be {self._comb_len} "
+                             "elements long")
+        for colour in combination:
+            if colour not in self._allowed_colours:
+                raise ValueError(f"{colour} is not an allowed colour")
+        if self._duplicates is False:
+            if self.check_duplicates(combination) is False:
+                raise DuplicatesDetectedError(combination)
+        return combination
 
     def set_combination(self):
         """
@@ -129,12 +493,24 @@ class Game:
         while not self._check_length(choice):
             choice = user_interface.set_combination(self.allowed_colours(),
                                                     self._duplicates,
-                                                    COMBINATION_LENGTH)
+                                                    self._comb_len)
         if self._duplicates is False:
             if self.check_duplicates(choice) is False:
                 raise DuplicatesDetectedError(choice)
         return choice
 
+    def _score_last_guess(self):
+        """
+        Scores last chosen combination against correct combination
+
+        Returns:
+            int: Packed feedback (see scoring.pack_feedback)
+        """
+        le = self._comb_len
+        start = le + (self.rounds_played() - 1) * (le + 1)
+        return self._table.score(self._record[start:start + le],
+                                 self._record[:le])
+
     def check_colours(self):
         """
         Checks number of correct colours in a last chosen combination
@@ -142,19 +518,7 @@ class Game:
         Returns:
             int: Number of correct colours
         """
-        white_count = 0
-        if self._duplicates is False:
-            for guess in self._guesses[-1]:
-                if guess in self._combination:
-                    white_count += 1
-        if self._duplicates is True:
-            combination_temp = []
-            combination_temp.extend(self._combination)
-            for guess in self._guesses[-1]:
-                if guess in combination_temp:
-                    white_count += 1
-                    combination_temp.remove(guess)
-        return white_count
+        return sum(scoring.unpack_feedback(self._score_last_guess()))
 
     def check_colours_and_place(self):
         """
@@ -164,11 +528,7 @@ class Game:
         Returns:
             int: Number of elements with correct colour and place
         """
-        red_count = 0
-        for guess, code in zip(self._guesses[-1], self._combination):
-            if guess == code:
-                red_count += 1
-        return red_count
+        return scoring.unpack_feedback(self._score_last_guess())[0]
 
     def check_combination(self):
         """
@@ -177,9 +537,9 @@ class Game:
         Returns:
             list: Red pins and white pins for last chosen combination
         """
-        red_count = self.check_colours_and_place()
-        white_count = self.check_colours() - red_count
-        return [RED_PIN] * red_count + [WHITE_PIN] * white_count
+        return scoring.feedback_pins(self._score_last_guess(),
+                                     RED_PIN,
+                                     WHITE_PIN)
 
     def guess_combination(self, ai):
         """
@@ -195,20 +555,98 @@ class Game:
             while(not self._check_length(guess)):
                 guess = user_interface.set_combination(self.allowed_colours(),
                                                        self._duplicates,
-                                                       COMBINATION_LENGTH,
+                                                       self._comb_len,
                                                        self._guesses,
                                                        self._guess_correctness)
         else:
             guess = ai.guess_combination()
         self._guesses.append(guess)
 
+    def play_guess(self, guess):
+        """
+        Plays given guess: appends it and its correctness to tables
+        of guesses and checks if game has been won
+
+        Args:
+            guess (list): Checked guess (see validate_combination)
+
+        Returns:
+            list: Red pins and white pins for the guess
+        """
+        self._guesses.append(guess)
+        correctness = self.check_combination()
+        self._guess_correctness.append(correctness)
+        self.check_if_won()
+        return correctness
+
     def check_if_won(self):
         """
         Checks if the last guess was game-winning. If so, sets game_won to True
         """
-        if len(self._guess_correctness[-1]) == COMBINATION_LENGTH:
-            if WHITE_PIN not in self._guess_correctness[-1]:
-                self._game_won = True
+        checked = len(self._guess_correctness)
+        if checked and checked == self.rounds_played() and \
+                self._record[-1] == scoring.pack_feedback(self._comb_len, 0):
+            self._game_won = True
+
+    def is_won(self):
+        """
+        Returns information whether game has been won
+
+        Returns:
+            bool: True if correct combination was guessed. Otherwise False
+        """
+        return self._game_won
+
+    def is_finished(self):
+        """
+        Returns information whether game has ended
+
+        Returns:
+            bool: True if game has been won or guess limit is reached.
+            Otherwise False
+        """
+        return self._game_won or self.rounds_played() >= NO_OF_ROUNDS
+
+    def rounds_played(self):
+        """
+        Returns number of guesses made so far
+
+        Returns:
+            int: Number of guesses
+        """
+        return len(self._record) // (self._comb_len + 1)
+
+    def combination(self):
+        """
+        Returns correct combination
+
+        Returns:
+            list: Correct combination
+        """
+        return self._combination
+
+    def log_entry(self):
+        """
+        Returns compact record of the game: configuration, id of correct
+        combination, ids of guesses and their packed feedback
+
+        Returns:
+            game_log.LoggedGame: Record of the game
+        """
+        le = self._comb_len
+        record = self._record
+        rounds = len(self._guess_correctness)
+        blanks = EMPTY_NOTATION in self._colours
+        guesses = tuple(self._table.rank(record[start:start + le])
+                        for start in range(le, le + rounds * (le + 1),
+                                           le + 1))
+        feedback = bytes(record[start]
+                         for start in range(2 * le, le + rounds * (le + 1),
+                                            le + 1))
+        return game_log.LoggedGame(self._mode, len(self._colours) - blanks,
+                                   blanks, self._duplicates, le,
+                                   self._table.rank(record[:le]), guesses,
+                                   feedback, self._game_won)
 
     def game_result(self):
         """
@@ -229,29 +667,29 @@ class Game:
         """
         Used for running guessing phase in the game.
         Creates AI Players if necessary, then runs guessing cycle
-        (guessing and checking) until game is won or guess limit is reached
+        (guessing and checking) until game is won or guess limit is reached.
+        AI thinks about the next guess in background, while the player
+        looks at the previous one
         """
         ai = None
-        if self._mode == MODES[2]:
-            ai = Bot_random(self._allowed_colours,
-                            self._duplicates,
-                            COMBINATION_LENGTH)
-        if self._mode == MODES[3]:
-            ai = Bot_clever(self._allowed_colours,
-                            self._duplicates,
-                            COMBINATION_LENGTH)
+        if self._mode in AI_PLAYERS:
+            ai = Bot_background(AI_PLAYERS[self._mode](self._allowed_colours,
+                                                       self._duplicates,
+                                                       self._comb_len),
+                                AI_MOVE_TIME)
         while len(self._guesses) < NO_OF_ROUNDS:
             self.guess_combination(ai)
             self._guess_correctness.append(self.check_combination())
+            self.check_if_won()
             if ai is not None:
+                if not self._game_won and len(self._guesses) < NO_OF_ROUNDS:
+                    ai.update_possible_combinations(
+                        self._guess_correctness[-1], RED_PIN)
                 user_interface.ai_guess_printer(self._guesses,
                                                 self._guess_correctness)
-            self.check_if_won()
             if self._game_won:
                 break
-            if self._mode == MODES[3]:
-                ai.update_possible_combinations(self._guess_correctness[-1],
-                                                RED_PIN)
+        game_log.log_game(self)
         self.game_result()
 
 
@@ -0,0 +1,103 @@
+import importlib
+import subprocess
+import sys
+COMMANDS = {
+    "play": ("run_game", "main_menu", "interactive game (default)"),
+    "batch": ("run_game", "batch_main", "games without prompts, JSON lines"),
+    "autoplay": ("autoplay", "main", "watch games between AI Players"),
+    "tournament": ("tournament", "main", "bots playing many games"),
+    "analyze": ("analyzer", "main", "optimal strategy of configurations"),
+    "server": ("server", "main", "server hosting games over network"),
+    "log": ("game_log", "main", "statistics and replay of game log"),
+    "benchmarks": ("benchmarks", "main", "benchmarks of hot paths"),
+}  # Module, function and description of every command
+DEFAULT_COMMAND = "play"
+IMPORT_TIMES = "--import-times"
+USAGE = [
+    f"usage: python -m mastermind [{IMPORT_TIMES}] [command] [arguments]",
+    "",
+    "Modules of a command are imported only when it is run, so commands",
+    "without menus do not load curses. With " + IMPORT_TIMES + ", time of",
+    "importing modules of the command is reported instead of running it.",
+    "",
+    "commands:"
+] + [f"  {name:<12}{description}"
+     for name, (_, _, description) in COMMANDS.items()]
+
+
+def import_times(module):
+    """
+    Measures time of importing module with all its dependencies
+    in a fresh interpreter. Modules loaded at start of interpreter
+    are not counted
+
+    Args:
+        module (str): Name of the module
+
+    Returns:
+        list: Pairs of module name and its own import time in microseconds,
+        in order of import, followed by pair of module and total time
+    """
+    process = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                              f"import {module}"],
+                             capture_output=True, text=True, check=True)
+    times = []
+    for line in process.stderr.splitlines():
+        fields = line.split("|")
+        if not line.startswith("import time:") or \
+                not fields[1].strip().isdigit():
+            continue
+        name = fields[2].strip()
+        times.append((name, int(fields[0].split(":")[1])))
+        if fields[2] == " " + name:  # Imported directly, not as dependency
+            if name == module:
+                return times + [(module, int(fields[1]))]
+            times = []
+    raise ImportError(f"{module} was not imported")
+
+
+def report_import_times(module, top=15):
+    """
+    Prints total import time of module and modules importing the longest
+
+    Args:
+        module (str): Name of the module
+        top (int, optional): Number of modules listed. Defaults to 15.
+    """
+    *times, (_, total) = import_times(module)
+    print(f"Importing {module}: {total / 1000:.1f} ms, "
+          f"{len(times)} modules")
+    for name, self_time in sorted(times, key=lambda item: -item[1])[:top]:
+        print(f"{self_time / 1000:8.1f} ms  {name}")
+
+
+def main(argv=None):
+    """
+    Runs command given in command line, importing only its modules
+
+    Args:
+        argv (list, optional): Command line arguments. Defaults to None,
+        which means sys.argv without program name
+    """
+    argv = sys.argv[1:] if argv is None else list(argv)
+    timing = IMPORT_TIMES in argv[:1]
+    if timing:
+        argv = argv[1:]
+    if argv[:1] in (["-h"], ["--help"]):
+        print("\n".join(USAGE))
+        return
+    if argv and argv[0] not in COMMANDS:
+        sys.exit("\n".join(USAGE + ["", f"unknown command: {argv[0]}"]))
+    name = argv[0] if argv else DEFAULT_COMMAND
+    argv = argv[1:]
+    module_name, function_name, _ = COMMANDS[name]
+    if timing:
+        report_import_times(module_name)
+        return
+    sys.argv = [f"mastermind {name}"] + argv
+    module = importlib.import_module(module_name)
+    getattr(module, function_name)()
+
+
+if __name__ == "__main__":
+    main()
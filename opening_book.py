@@ -0,0 +1,203 @@
+import os
+import mmap
+import struct
+import scoring
+import feedback_table
+import bots
+path_to_file = os.path.dirname(__file__)
+BOOK_DIR = os.environ.get("MASTERMIND_BOOK_DIR",
+                          os.path.join(path_to_file, "books"))
+MAGIC = b"MMBK"
+HEADER = struct.Struct("<4sHBB")  # magic, no. of codes, colours, length
+NODE = struct.Struct("<HB")  # guess id, number of children
+CHILD = struct.Struct("<BI")  # feedback, offset of child node
+_loaded_books = {}  # Books already loaded in this process
+
+
+def build_book(no_of_colours, duplicates, le):
+    """
+    Computes strategy tree of Bot_knuth for given configuration
+    and serializes it. Every node is a guess id followed by
+    (feedback, child offset) pairs. Winning feedback has no child
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+
+    Returns:
+        bytearray: Serialized strategy tree
+    """
+    colours = list(range(no_of_colours))
+    bot = bots.Bot_knuth(colours, duplicates, le)
+    table = bot._table
+    win = scoring.pack_feedback(le, 0)
+    book = bytearray(HEADER.pack(MAGIC, table.size, no_of_colours, le))
+
+    def add_node(possible, symmetry):
+        bot._possible_combinations = possible
+        bot._symmetry = symmetry
+        guess_id = bot._best_guess()
+        symmetry = symmetry.after(table.code(guess_id))
+        row = table.row(guess_id)
+        parts = {}
+        for combination in possible:
+            parts.setdefault(row[combination], []).append(combination)
+        parts.pop(win, None)
+        offset = len(book)
+        book.extend(NODE.pack(guess_id, len(parts)))
+        children_offset = len(book)
+        book.extend(bytes(CHILD.size * len(parts)))
+        for n, feedback in enumerate(sorted(parts)):
+            child = add_node(parts[feedback], symmetry)
+            CHILD.pack_into(book, children_offset + n * CHILD.size,
+                            feedback, child)
+        return offset
+
+    add_node(list(range(table.size)), bot._symmetry)
+    return book
+
+
+class OpeningBook:
+    """
+    Read-only strategy tree for one configuration
+
+    Attributes:
+        _buffer (bytes, bytearray or mmap): Serialized strategy tree
+
+    Methods:
+        __init__: creates book object
+        root: returns offset of the first node
+        guess: returns guess id stored in a node
+        child: returns node reached after given feedback
+    """
+    def __init__(self, buffer):
+        """
+        Creates book object
+
+        Args:
+            buffer (bytes, bytearray or mmap): Serialized strategy tree
+        """
+        self._buffer = buffer
+
+    def root(self):
+        """
+        Returns offset of the first node
+
+        Returns:
+            int: Offset of the first node
+        """
+        return HEADER.size
+
+    def guess(self, node):
+        """
+        Returns guess id stored in a node
+
+        Args:
+            node (int): Offset of the node
+
+        Returns:
+            int: Id of the guess
+        """
+        return NODE.unpack_from(self._buffer, node)[0]
+
+    def child(self, node, feedback):
+        """
+        Returns node reached after given feedback
+
+        Args:
+            node (int): Offset of the node
+            feedback (int): Packed feedback for guess stored in the node
+
+        Returns:
+            int: Offset of the child node or None if there is no such node
+        """
+        no_of_children = NODE.unpack_from(self._buffer, node)[1]
+        start = node + NODE.size
+        for n in range(no_of_children):
+            child_feedback, child = CHILD.unpack_from(self._buffer,
+                                                      start + n * CHILD.size)
+            if child_feedback == feedback:
+                return child
+        return None
+
+
+def book_path(no_of_colours, duplicates, le, directory=BOOK_DIR):
+    """
+    Returns path of the file storing book for given configuration
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        directory (str, optional): Directory with books.
+        Defaults to BOOK_DIR.
+
+    Returns:
+        str: Path to book file
+    """
+    dupes = "d" if duplicates else "u"
+    return os.path.join(directory, f"book_{no_of_colours}_{dupes}_{le}.bin")
+
+
+def _map_book(path, no_of_colours, le):
+    """
+    Memory-maps book file if it exists and matches configuration
+
+    Args:
+        path (str): Path to book file
+        no_of_colours (int): Number of allowed colours
+        le (int): Length of combination
+
+    Returns:
+        mmap: Mapped book or None if file is missing or damaged
+    """
+    try:
+        with open(path, "rb") as filehandle:
+            buffer = mmap.mmap(filehandle.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    if len(buffer) < HEADER.size:
+        return None
+    magic, _, colours, length = HEADER.unpack_from(buffer)
+    if (magic, colours, length) != (MAGIC, no_of_colours, le):
+        return None
+    return buffer
+
+
+def load_book(no_of_colours, duplicates, le, directory=BOOK_DIR):
+    """
+    Returns book for given configuration. Book is memory-mapped from disk,
+    so processes share it. Missing book is built and saved
+
+    Args:
+        no_of_colours (int): Number of allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        directory (str, optional): Directory with books.
+        Defaults to BOOK_DIR.
+
+    Returns:
+        OpeningBook: Book for given configuration
+    """
+    key = (no_of_colours, duplicates, le, directory)
+    if key in _loaded_books:
+        return _loaded_books[key]
+    path = book_path(no_of_colours, duplicates, le, directory)
+    buffer = _map_book(path, no_of_colours, le)
+    if buffer is None:
+        buffer = build_book(no_of_colours, duplicates, le)
+        feedback_table.save_buffer(path, buffer)
+    book = OpeningBook(buffer)
+    _loaded_books[key] = book
+    return book
+
+
+if __name__ == "__main__":
+    for no_of_colours, duplicates in [(6, False), (7, False),
+                                      (6, True), (7, True)]:
+        path = book_path(no_of_colours, duplicates, 4)
+        feedback_table.save_buffer(path,
+                                   build_book(no_of_colours, duplicates, 4))
+        print(f"{path}: {os.path.getsize(path)} bytes")
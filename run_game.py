@@ -1,4 +1,21 @@
-from game_logic import Game, OPTIONS, MODES, CONFIGURATIONS
+import json
+import os
+import sys
+from random import Random
+from bots import CODEBREAKERS
+from engine import play_game
+from feedback_table import load_table
+from game_logic import (
+                        Game,
+                        OPTIONS,
+                        MODES,
+                        CONFIGURATIONS,
+                        SETTINGS,
+                        VARIANTS,
+                        VARIANT_SIZES,
+                        game_colours,
+                        )
+from scoring import decode, encode, unpack_feedback
 import user_interface
 
 
@@ -9,10 +26,11 @@ def run_game(mode, settings):
     Args:
         mode (int): Stores information about game mode to be used
         settings (tuple): Stores information about game parameters:
-        whether blanks and / or duplicates are allowed
+        whether blanks and / or duplicates are allowed, combination length
+        and number of colours
         )
     """
-    game = Game(mode, settings[0], settings[1])
+    game = Game(mode, *settings)
     user_interface.switch_message(mode, MODES)
     game.guessing_phase()
 
@@ -40,6 +58,11 @@ def main_menu():
             run_game(MODES[3], settings)
             user_interface.second_match()
             run_game(MODES[3], settings)
+        elif selected == OPTIONS[3]:  # Player vs Expert AI
+            settings = choose_settings()
+            run_game(MODES[1], settings)
+            user_interface.second_match()
+            run_game(MODES[4], settings)
         else:
             rules()
         end_game = user_interface.what_next()
@@ -47,23 +70,18 @@ def main_menu():
 
 def choose_settings():
     """
-    Allows for choice of game settings (duplicates and blanks)
+    Allows for choice of game variant and settings (duplicates and blanks)
 
     Returns:
-        tuple: 2-elements long, both are bools.
+        tuple: 4-elements long.
         First one is for duplicates (whether they are allowed)
         Second one is for empty spaces (whether they are allowed)
+        Third one is combination length
+        Fourth one is number of colours
     """
+    variant = user_interface.choose_variant(VARIANTS)
     selected = user_interface.choose_settings(CONFIGURATIONS)
-    if selected == 0:
-        settings = (False, False)
-    elif selected == 1:
-        settings = (False, True)
-    elif selected == 2:
-        settings = (True, False)
-    elif selected == 3:
-        settings = (True, True)
-    return settings
+    return SETTINGS[selected] + VARIANT_SIZES[variant]
 
 
 def rules():
@@ -74,5 +92,128 @@ def rules():
     main_menu()
 
 
+def batch_games(configuration, variant, codebreaker, no_of_games,
+                secrets=None, seed=None):
+    """
+    Plays games without any prompts, one by one, so that memory use
+    does not depend on the number of games. Secrets are checked
+    before any game is played
+
+    Args:
+        configuration (int): Index of game configuration in SETTINGS
+        variant (int): Index of game variant in VARIANT_SIZES
+        codebreaker (str): Name of AI Player guessing combinations
+        (key of CODEBREAKERS)
+        no_of_games (int): Number of games to be played
+        secrets (list, optional): Combinations to be guessed, used in turn.
+        Defaults to None, which means combinations chosen by
+        bot_set_combination
+        seed (int, optional): Seed of codemaker and codebreaker.
+        Defaults to None, which means random seed
+
+    Raises:
+        ValueError: If one of secrets cannot be played
+
+    Returns:
+        generator: Result of consecutive game as dict
+    """
+    duplicates, blanks = SETTINGS[configuration]
+    le, no_of_colours = VARIANT_SIZES[variant]
+    colours = game_colours(blanks, no_of_colours)
+    table = load_table(len(colours), duplicates, le)
+    for secret in secrets or []:
+        if not set(secret) <= set(colours):
+            raise ValueError(f"{' '.join(secret)} has unknown colours")
+        table.rank(encode(secret, colours))
+    return _batch_results(colours, duplicates, le, table, codebreaker,
+                          no_of_games, secrets, seed)
+
+
+def _batch_results(colours, duplicates, le, table, codebreaker, no_of_games,
+                   secrets, seed):
+    """
+    Plays games of batch_games with checked secrets
+
+    Args:
+        colours (list): Allowed colours
+        duplicates (bool): True if duplicates are enabled, False otherwise
+        le (int): Length of combination
+        table (FeedbackTable): Feedback for every pair of combinations
+        codebreaker (str): Name of AI Player guessing combinations
+        no_of_games (int): Number of games to be played
+        secrets (list): Combinations to be guessed, None for combinations
+        chosen by bot_set_combination
+        seed (int): Seed of codemaker and codebreaker, None for random seed
+
+    Yields:
+        dict: Result of consecutive game
+    """
+    rng = Random(seed)
+    for number in range(no_of_games):
+        secret = secrets[number % len(secrets)] if secrets else None
+        record = play_game(colours, duplicates, le, CODEBREAKERS[codebreaker],
+                           secret, rng=rng)
+        yield {
+            "game": number,
+            "secret": decode(table.code(record.secret), colours),
+            "guesses": [decode(table.code(guess_id), colours)
+                        for guess_id in record.guesses],
+            "feedback": [list(unpack_feedback(feedback))
+                         for feedback in record.feedback],
+            "won": record.won,
+            "think_time": record.think_time
+        }
+
+
+def batch_main():
+    """
+    Plays games with parameters given in command line and writes
+    result of every game to standard output as a line of JSON
+    """
+    import argparse
+    parser = argparse.ArgumentParser(
+        description="Mastermind games without prompts, one JSON line "
+                    "per game")
+    parser.add_argument("--games", type=int, default=None,
+                        help="defaults to number of secrets or 1")
+    parser.add_argument("--configuration", type=int, default=2,
+                        choices=range(len(CONFIGURATIONS)))
+    parser.add_argument("--variant", type=int, default=0,
+                        choices=range(len(VARIANTS)))
+    parser.add_argument("--codebreaker", choices=CODEBREAKERS,
+                        default="Bot_clever")
+    parser.add_argument("--secret", nargs="+", action="append",
+                        metavar="COLOUR", dest="secrets",
+                        help="combination to be guessed, can be repeated; "
+                             "by default codemaker AI chooses them")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    no_of_games = args.games
+    if no_of_games is None:
+        no_of_games = len(args.secrets) if args.secrets else 1
+    if no_of_games < 1:
+        parser.error("--games must be positive")
+    try:
+        games = batch_games(args.configuration, args.variant,
+                            args.codebreaker, no_of_games, args.secrets,
+                            args.seed)
+    except ValueError as error:
+        parser.error(str(error))
+    try:
+        for result in games:
+            sys.stdout.write(json.dumps(result, separators=(",", ":")))
+            sys.stdout.write("\n")
+        sys.stdout.flush()
+    except BrokenPipeError:
+        # Reader of the output has finished, e.g. head. Python flushes
+        # stdout at exit again, so it is redirected to devnull
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(1)
+
+
 if __name__ == "__main__":
-    main_menu()
+    if len(sys.argv) > 1:
+        batch_main()
+    else:
+        main_menu()
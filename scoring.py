@@ -0,0 +1,113 @@
+RED_SHIFT = 4  # Bits reserved for the number of white pins in packed feedback
+WHITE_MASK = (1 << RED_SHIFT) - 1
+
+
+def encode(combination, colours):
+    """
+    Converts combination of colour names into tuple of integer pegs
+
+    Args:
+        combination (list): Combination of colours
+        colours (list): Allowed colours, position in list is the peg value
+
+    Returns:
+        tuple: Integer-coded combination
+    """
+    return tuple(colours.index(colour) for colour in combination)
+
+
+def decode(code, colours):
+    """
+    Converts tuple of integer pegs back into list of colour names
+
+    Args:
+        code (tuple): Integer-coded combination
+        colours (list): Allowed colours, position in list is the peg value
+
+    Returns:
+        list: Combination of colours
+    """
+    return [colours[peg] for peg in code]
+
+
+def pack_feedback(red, white):
+    """
+    Packs number of red and white pins into single integer
+
+    Args:
+        red (int): Number of red pins
+        white (int): Number of white pins
+
+    Returns:
+        int: Packed feedback
+    """
+    return red << RED_SHIFT | white
+
+
+def unpack_feedback(feedback):
+    """
+    Unpacks feedback created by pack_feedback
+
+    Args:
+        feedback (int): Packed feedback
+
+    Returns:
+        tuple: Number of red pins and number of white pins
+    """
+    return feedback >> RED_SHIFT, feedback & WHITE_MASK
+
+
+def score(guess, secret, no_of_colours):
+    """
+    Scores integer-coded guess against integer-coded secret
+
+    Args:
+        guess (tuple): Integer-coded guess
+        secret (tuple): Integer-coded secret combination
+        no_of_colours (int): Number of allowed colours
+
+    Returns:
+        int: Packed feedback (see pack_feedback)
+    """
+    red = 0
+    guess_counts = [0] * no_of_colours
+    secret_counts = [0] * no_of_colours
+    for guess_peg, secret_peg in zip(guess, secret):
+        if guess_peg == secret_peg:
+            red += 1
+        else:
+            guess_counts[guess_peg] += 1
+            secret_counts[secret_peg] += 1
+    white = sum(map(min, guess_counts, secret_counts))
+    return red << RED_SHIFT | white
+
+
+def feedback_pins(feedback, red_pin, white_pin):
+    """
+    Converts packed feedback into list of pins shown to the player
+
+    Args:
+        feedback (int): Packed feedback
+        red_pin (str): Literal used to denote a red pin
+        white_pin (str): Literal used to denote a white pin
+
+    Returns:
+        list: Red pins followed by white pins
+    """
+    red, white = unpack_feedback(feedback)
+    return [red_pin] * red + [white_pin] * white
+
+
+def pins_feedback(pins, red_pin):
+    """
+    Converts list of pins back into packed feedback
+
+    Args:
+        pins (list): Red and white pins
+        red_pin (str): Literal used to denote a red pin
+
+    Returns:
+        int: Packed feedback
+    """
+    red = pins.count(red_pin)
+    return pack_feedback(red, len(pins) - red)
@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from os import cpu_count
+from game_logic import (
+                        AI_PLAYERS,
+                        CONFIGURATIONS,
+                        MODES,
+                        NO_OF_ROUNDS,
+                        RED_PIN,
+                        SETTINGS,
+                        VARIANT_SIZES,
+                        WHITE_PIN,
+                        DuplicatesDetectedError,
+                        Game,
+                        )
+HOST = "127.0.0.1"
+PORT = 7653
+MAX_LINE = 1024  # Longest accepted command in bytes
+IDLE_TIMEOUT = 600  # Seconds of silence after which client is disconnected
+HELP = [
+    "NEW <mode> <configuration> [<variant> [<colour> ...]]",
+    "    mode: 0 - 2 players, 1 - guess AI's combination,",
+    "    2, 3, 4 - Easy, Hard, Expert AI guesses given combination",
+    "    configuration: " + ", ".join(f"{number} - {name}" for number, name
+                                      in enumerate(CONFIGURATIONS)),
+    "    variant: " + ", ".join(f"{number} - {le} elements, {colours} colours"
+                                for number, (le, colours)
+                                in enumerate(VARIANT_SIZES)),
+    "GUESS <colour> ...",
+    "QUIT"
+]
+
+
+class Session:
+    """
+    A class used to run games of one client of the server.
+    Bots and tables are used in worker threads, so that computations
+    of one session do not stall the others
+
+    Attributes:
+        _executor (Executor): Workers running blocking computations
+        _game (Game): Current game, None if there is no game
+        _ai (Bot): AI Player guessing in current game, None if player guesses
+
+    Methods:
+        __init__: creates session object
+        handle: yields replies for one command
+        _new_game: starts new game
+        _guess: plays guess of the player
+        _ai_guesses: plays guesses of AI until the end of the game
+        _end_lines: yields replies for the end of the game
+    """
+    def __init__(self, executor=None):
+        """
+        Creates session object
+
+        Args:
+            executor (Executor, optional): Workers running blocking
+            computations. Defaults to None, which means default executor
+            of the event loop
+        """
+        self._executor = executor
+        self._game = None
+        self._ai = None
+
+    async def handle(self, line):
+        """
+        Yields replies for one command
+
+        Args:
+            line (str): Command of the client
+
+        Yields:
+            str: Consecutive lines of reply
+        """
+        command, *arguments = line.split() or [""]
+        command = command.upper()
+        try:
+            if command == "NEW":
+                async for reply in self._new_game(arguments):
+                    yield reply
+            elif command == "GUESS":
+                for reply in self._guess(arguments):
+                    yield reply
+            elif command == "HELP":
+                for reply in HELP:
+                    yield reply
+            elif command == "QUIT":
+                yield "BYE"
+            else:
+                yield f"ERROR Unknown command {command}, try HELP"
+        except (ValueError, DuplicatesDetectedError) as error:
+            yield f"ERROR {error}"
+
+    async def _new_game(self, arguments):
+        """
+        Starts new game. In modes with AI guessing, AI plays whole game
+
+        Args:
+            arguments (list): Mode, configuration, optional variant
+            and combination to be guessed
+
+        Raises:
+            ValueError: If arguments are invalid
+
+        Yields:
+            str: Consecutive lines of reply
+        """
+        if len(arguments) < 2:
+            raise ValueError("NEW needs mode and configuration, try HELP")
+        mode, configuration = int(arguments[0]), int(arguments[1])
+        variant = int(arguments[2]) if len(arguments) > 2 else 0
+        combination = arguments[3:] or None
+        if mode not in MODES or not 0 <= configuration < len(SETTINGS) or \
+                not 0 <= variant < len(VARIANT_SIZES):
+            raise ValueError("Mode, configuration or variant out of range")
+        if mode != MODES[1] and combination is None:
+            raise ValueError("Combination to be guessed is required")
+        if mode == MODES[1]:
+            combination = None
+        settings = SETTINGS[configuration] + VARIANT_SIZES[variant]
+        loop = asyncio.get_running_loop()
+        self._game = await loop.run_in_executor(
+            self._executor, lambda: Game(mode, *settings,
+                                         combination=combination))
+        self._ai = None
+        yield "OK " + " ".join(self._game.allowed_colours())
+        if mode in AI_PLAYERS:
+            self._ai = await loop.run_in_executor(
+                self._executor, AI_PLAYERS[mode], self._game.allowed_colours(),
+                settings[0], settings[2])
+            async for reply in self._ai_guesses():
+                yield reply
+
+    def _guess(self, arguments):
+        """
+        Plays guess of the player
+
+        Args:
+            arguments (list): Guessed combination
+
+        Raises:
+            ValueError: If there is no game to be guessed or guess is invalid
+
+        Yields:
+            str: Consecutive lines of reply
+        """
+        game = self._game
+        if game is None or self._ai is not None or game.is_finished():
+            raise ValueError("No game to be guessed, start one with NEW")
+        correctness = game.play_guess(game.validate_combination(arguments))
+        yield f"FEEDBACK {correctness.count(RED_PIN)} " \
+              f"{correctness.count(WHITE_PIN)}"
+        yield from self._end_lines()
+
+    async def _ai_guesses(self):
+        """
+        Plays guesses of AI until the end of the game. Every guess
+        is computed in a worker
+
+        Yields:
+            str: Consecutive lines of reply
+        """
+        game, ai = self._game, self._ai
+        loop = asyncio.get_running_loop()
+        while not game.is_finished():
+            guess = await loop.run_in_executor(self._executor,
+                                               ai.guess_combination)
+            correctness = game.play_guess(guess)
+            yield "GUESS " + " ".join(guess)
+            yield f"FEEDBACK {correctness.count(RED_PIN)} " \
+                  f"{correctness.count(WHITE_PIN)}"
+            if not game.is_finished():
+                await loop.run_in_executor(self._executor,
+                                           ai.update_possible_combinations,
+                                           correctness, RED_PIN)
+        for reply in self._end_lines():
+            yield reply
+
+    def _end_lines(self):
+        """
+        Yields replies for the end of the game
+
+        Yields:
+            str: WON with number of guesses or LOST with correct combination,
+            nothing if game is not finished
+        """
+        game = self._game
+        if game.is_won():
+            yield f"WON {game.rounds_played()}"
+        elif game.rounds_played() >= NO_OF_ROUNDS:
+            yield "LOST " + " ".join(game.combination())
+
+
+async def handle_client(reader, writer, executor=None):
+    """
+    Serves one client until it quits, disconnects or stays idle
+    for IDLE_TIMEOUT seconds
+
+    Args:
+        reader (StreamReader): Commands of the client
+        writer (StreamWriter): Replies to the client
+        executor (Executor, optional): Workers running blocking
+        computations. Defaults to None.
+    """
+    session = Session(executor)
+    try:
+        writer.write(b"MASTERMIND ready, try HELP\n")
+        await writer.drain()
+        while True:
+            try:
+                line = await asyncio.wait_for(reader.readline(),
+                                              IDLE_TIMEOUT)
+            except ValueError:
+                writer.write(b"ERROR Line too long\n")
+                break
+            if not line:
+                break
+            command = line.decode("utf-8", "replace")
+            async for reply in session.handle(command):
+                writer.write(reply.encode() + b"\n")
+                await writer.drain()
+            if command.strip().upper() == "QUIT":
+                break
+    except (asyncio.TimeoutError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def start_server(host=HOST, port=PORT, path=None, workers=None):
+    """
+    Starts server accepting clients over TCP or Unix socket
+
+    Args:
+        host (str, optional): Address of TCP server. Defaults to HOST.
+        port (int, optional): Port of TCP server. Defaults to PORT.
+        path (str, optional): Path of Unix socket. Defaults to None,
+        which means TCP server
+        workers (int, optional): Number of threads running bots.
+        Defaults to None, which means number of processors
+
+    Returns:
+        Server: Started server
+    """
+    executor = ThreadPoolExecutor(workers or cpu_count())
+
+    def client_connected(reader, writer):
+        return handle_client(reader, writer, executor)
+
+    if path is not None:
+        return await asyncio.start_unix_server(client_connected, path,
+                                               limit=MAX_LINE)
+    return await asyncio.start_server(client_connected, host, port,
+                                      limit=MAX_LINE)
+
+
+async def serve(host=HOST, port=PORT, path=None, workers=None):
+    """
+    Runs server until it is cancelled
+
+    Args:
+        host (str, optional): Address of TCP server. Defaults to HOST.
+        port (int, optional): Port of TCP server. Defaults to PORT.
+        path (str, optional): Path of Unix socket. Defaults to None,
+        which means TCP server
+        workers (int, optional): Number of threads running bots.
+        Defaults to None, which means number of processors
+    """
+    server = await start_server(host, port, path, workers)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    """
+    Runs server with parameters given in command line
+    """
+    parser = argparse.ArgumentParser(description="Mastermind server")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", metavar="PATH", default=None,
+                        help="listen on Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.unix, args.workers))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+from itertools import permutations
+
+
+class Symmetry:
+    """
+    Symmetries of the game, which keep all previous guesses unchanged:
+    permutations of positions combined with relabelling of colours.
+    Colours absent from previous guesses can be relabelled freely.
+    Feedback of a guess is the same for all combinations related by
+    a symmetry, so guesses from one class are equally good and only
+    the smallest of them has to be evaluated
+
+    Attributes:
+        no_of_colours (int): Number of allowed colours
+        le (int): Length of combination
+        guesses (tuple): Integer-coded previous guesses
+        _elements (list): Pairs of position permutation and mapping of
+        colours used in previous guesses, which keep every guess unchanged
+        _free (list): Colours absent from previous guesses, in ascending order
+
+    Methods:
+        __init__: creates symmetry object
+        _colour_map: returns relabelling of colours matching permutation
+    of positions
+        after: returns symmetries left after one more guess
+        is_trivial: checks whether symmetries can reduce guesses
+        _images: iterates over combinations related to given one
+        canonical: returns the smallest combination related to given one
+        is_canonical: checks whether combination is the smallest in its class
+        representatives: returns ids of the smallest combination of
+    every class
+        iter_representatives: yields ids of representatives one by one
+    """
+    def __init__(self, no_of_colours, le, guesses=()):
+        """
+        Creates symmetry object
+
+        Args:
+            no_of_colours (int): Number of allowed colours
+            le (int): Length of combination
+            guesses (tuple, optional): Integer-coded previous guesses.
+            Defaults to (), which means beginning of the game.
+        """
+        self.no_of_colours = no_of_colours
+        self.le = le
+        self.guesses = tuple(guesses)
+        used = {colour for guess in self.guesses for colour in guess}
+        self._free = [colour for colour in range(no_of_colours)
+                      if colour not in used]
+        self._elements = []
+        for positions in permutations(range(le)):
+            colour_map = self._colour_map(positions)
+            if colour_map is not None:
+                self._elements.append((positions, colour_map))
+
+    def _colour_map(self, positions):
+        """
+        Returns relabelling of colours, which together with given permutation
+        of positions keeps every previous guess unchanged
+
+        Args:
+            positions (tuple): Source position for every position
+
+        Returns:
+            dict: Mapping of colours used in previous guesses,
+            None if there is no such relabelling
+        """
+        colour_map = {}
+        for guess in self.guesses:
+            for position, source in enumerate(positions):
+                colour = colour_map.setdefault(guess[source], guess[position])
+                if colour != guess[position]:
+                    return None
+        if len(set(colour_map.values())) != len(colour_map):
+            return None
+        return colour_map
+
+    def after(self, guess):
+        """
+        Returns symmetries left after one more guess
+
+        Args:
+            guess (tuple): Integer-coded guess
+
+        Returns:
+            Symmetry: Symmetries keeping also the new guess unchanged
+        """
+        return Symmetry(self.no_of_colours, self.le,
+                        self.guesses + (tuple(guess),))
+
+    def is_trivial(self):
+        """
+        Checks whether every class contains a single combination
+
+        Returns:
+            bool: True if symmetries cannot reduce guesses. Otherwise False
+        """
+        return len(self._elements) == 1 and len(self._free) <= 1
+
+    def _images(self, code):
+        """
+        Iterates over combinations related to given one. Colours absent
+        from previous guesses are relabelled in order of first appearance,
+        which gives the smallest image for every position permutation
+
+        Args:
+            code (tuple): Integer-coded combination
+
+        Yields:
+            tuple: Related combination
+        """
+        for positions, colour_map in self._elements:
+            relabel = dict(colour_map)
+            free = iter(self._free)
+            image = []
+            for position in positions:
+                colour = code[position]
+                if colour not in relabel:
+                    relabel[colour] = next(free)
+                image.append(relabel[colour])
+            yield tuple(image)
+
+    def canonical(self, code):
+        """
+        Returns the smallest combination related to given one
+
+        Args:
+            code (tuple): Integer-coded combination
+
+        Returns:
+            tuple: Representative of the class of combination
+        """
+        return min(self._images(code))
+
+    def is_canonical(self, code):
+        """
+        Checks whether combination is the smallest in its class
+
+        Args:
+            code (tuple): Integer-coded combination
+
+        Returns:
+            bool: True if combination represents its class. Otherwise False
+        """
+        code = tuple(code)
+        return all(image >= code for image in self._images(code))
+
+    def representatives(self, codebook):
+        """
+        Returns ids of the smallest combination of every class.
+        They are also the smallest ids within classes
+
+        Args:
+            codebook (Codebook): Combinations of the configuration
+
+        Returns:
+            list or range: Ids of representatives in ascending order
+        """
+        if self.is_trivial():
+            return range(codebook.size)
+        return list(self.iter_representatives(codebook))
+
+    def iter_representatives(self, codebook, stop=None):
+        """
+        Yields ids of the smallest combination of every class, finding
+        them one by one, so that search can start before all are known
+
+        Args:
+            codebook (Codebook): Combinations of the configuration
+            stop (callable, optional): Checked before every combination,
+            enumeration ends when it returns True. Defaults to None.
+
+        Yields:
+            int: Ids of representatives in ascending order
+        """
+        trivial = self.is_trivial()
+        for code_id, code in enumerate(codebook):
+            if stop is not None and stop():
+                return
+            if trivial or self.is_canonical(code):
+                yield code_id
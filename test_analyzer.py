@@ -0,0 +1,67 @@
+import analyzer
+from game_logic import COMBINATION_LENGTH, SETTINGS, game_colours
+from symmetry import Symmetry
+
+
+def test_lower_bound_fills_levels():
+    small = analyzer.Analyzer(3, True, 2)
+    assert small._levels == 4
+    assert small.lower_bound(1) == 1
+    assert small.lower_bound(5) == 1 + 4 * 2
+    assert small.lower_bound(6) == 1 + 4 * 2 + 3
+    assert small.capacity(2) == 5
+
+
+def test_total_and_depth_match_exhaustive_search():
+    for configuration, total, depth in [((4, True, 3), 206, 4),
+                                        ((3, True, 4), 246, 4),
+                                        ((5, False, 3), 196, 4)]:
+        solver = analyzer.Analyzer(*configuration)
+        mask = (1 << solver.size) - 1
+        symmetry = Symmetry(configuration[0], configuration[2])
+        assert solver.total(mask, symmetry) == total
+        assert solver.depth(mask, symmetry) == depth
+        assert not solver.solvable(mask, symmetry, depth - 1)
+
+
+def test_total_without_byte_lanes(monkeypatch):
+    monkeypatch.setattr(analyzer, "LANE_LIMIT", 2)
+    solver = analyzer.Analyzer(4, True, 3)
+    mask = (1 << solver.size) - 1
+    assert solver.total(mask, Symmetry(4, 3), 150) >= 150
+    assert solver.total(mask, Symmetry(4, 3)) == 206
+
+
+def test_lane_keys_match_partitions():
+    solver = analyzer.Analyzer(5, True, 3)
+    mask = int("1011001110001111" * 5, 2) & ((1 << solver.size) - 1)
+    ids = analyzer.mask_to_ids(mask, solver.size)
+    keys = {key & 0xFFFF: key >> 16 for key in solver._lane_keys(ids)}
+    for guess_id, sizes in solver.partitions(mask, Symmetry(5, 3)):
+        bound = solver.guess_bound(len(ids), sizes)
+        assert keys[guess_id] == 2 * bound + (solver._win not in sizes)
+
+
+def test_total_is_cut_off_at_limit():
+    solver = analyzer.Analyzer(4, True, 3)
+    mask = (1 << solver.size) - 1
+    assert solver.total(mask, Symmetry(4, 3), 150) >= 150
+    assert solver.total(mask, Symmetry(4, 3)) == 206
+
+
+def test_analyze_in_process_pool():
+    result = analyzer.analyze(4, False, 3, workers=2)
+    assert result["total_guesses"] == 72
+    assert result["max_guesses"] == 4
+    assert result["mean_guesses"] == 72 / 24
+    assert len(result["mean_first_guess"]) == 3
+
+
+def test_every_configuration_has_optimal_result():
+    results = analyzer.load_results()
+    for duplicates, blanks in SETTINGS:
+        key = analyzer.result_key(len(game_colours(blanks)), duplicates,
+                                  COMBINATION_LENGTH)
+        result = results[key]
+        assert result["mean_guesses"] == \
+            result["total_guesses"] / result["combinations"]
@@ -0,0 +1,65 @@
+import io
+import autoplay
+import user_interface
+SETTINGS = (True, False, 4, 6)
+
+
+def test_autoplay_statistics():
+    stream = io.StringIO()
+    statistics = autoplay.autoplay(SETTINGS, "Bot_knuth", 5, seed=3,
+                                   renderer=user_interface.Renderer(stream))
+    assert statistics["games"] == statistics["wins"] == 5
+    assert statistics["max_guesses"] <= 5
+    assert "Combination guessed in" in stream.getvalue().splitlines()[-1]
+
+
+def test_zero_pacing_caps_frames():
+    frames = []
+    times = iter([0.0, 0.0, 0.01, 0.02, 0.04, 0.04])
+    renderer = user_interface.Renderer(io.StringIO())
+    renderer.board = lambda *args: frames.append(len(args[1]))
+    spectator = autoplay.Spectator(
+        ["Red", "Blue"], autoplay.load_table(2, True, 2), "Board",
+        fps=50, renderer=renderer, clock=lambda: next(times))
+    spectator.start()
+    for rounds in range(1, 5):
+        spectator.observe(0, [1] * rounds, bytes([0x02] * rounds))
+    assert frames == [1, 4]
+
+
+def test_spectator_pacing(monkeypatch):
+    prompts = []
+    sleeps = []
+    monkeypatch.setattr("builtins.input", prompts.append)
+    stream = io.StringIO()
+    for pacing in autoplay.PACINGS:
+        spectator = autoplay.Spectator(
+            ["Red", "Blue"], autoplay.load_table(2, True, 2), "Board",
+            pacing, delay=0.25, renderer=user_interface.Renderer(stream),
+            clock=lambda: 0.0, sleep=sleeps.append)
+        spectator.start()
+        spectator.observe(0, [1], bytes([0x02]))
+        spectator.observe(0, [1, 0], bytes([0x02, 0x20]))
+    assert sleeps == [0.25, 0.25]
+    assert prompts == ["Press Enter for next guess"] * 2
+    assert stream.getvalue().endswith(
+        "Guess: ['Red', 'Red']. Result: ['Red', 'Red']\n\n")
+
+
+def test_new_game_is_drawn_from_scratch():
+    stream = io.StringIO()
+    times = iter([0.0, 0.0, 0.05, 0.05, 0.1, 0.1])
+    spectator = autoplay.Spectator(
+        ["Red", "Blue"], autoplay.load_table(2, True, 2), "Board",
+        fps=50, renderer=user_interface.Renderer(stream),
+        clock=lambda: next(times))
+    spectator.start()
+    spectator.observe(0, [1], bytes([0x02]))
+    spectator.observe(0, [1, 0], bytes([0x02, 0x20]))
+    spectator.start()
+    stream.seek(0)
+    stream.truncate()
+    spectator.observe(3, [3], bytes([0x11]))
+    spectator.observe(3, [3, 2], bytes([0x11, 0x02]))
+    assert stream.getvalue().startswith(user_interface.CLEAR + "Board\n")
+    assert user_interface.LINES_UP.format(1) in stream.getvalue()
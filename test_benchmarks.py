@@ -0,0 +1,22 @@
+import benchmarks
+
+
+def test_find_regressions():
+    baseline = {"a": 1.0, "b": 1.0}
+    results = {"a": 1.1, "b": 2.0, "c": 5.0}
+    regressions = benchmarks.find_regressions(results, baseline, 1.5)
+    assert regressions == {"b": 2.0}
+
+
+def test_cases_cover_every_hot_path():
+    cases = benchmarks._cases(3)
+    assert set(cases) == {
+        "Game.check_combination",
+        "Game.check_duplicates",
+        "Bot_clever.__init__",
+        "Bot_clever._possibilities",
+        "Bot_clever.update_possible_combinations",
+        "bot_set_combination"
+    }
+    for function in cases.values():
+        function()
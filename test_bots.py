@@ -1,7 +1,13 @@
+import random
+import threading
 from itertools import permutations
+from time import monotonic
+import pytest
 import bots
+import scoring
 COMBINATION_LENGTH = 4
 ALLOWED_COLOURS = ["Red", "Purple", "Yellow", "Blue", "Green", "White"]
+PALETTE = ALLOWED_COLOURS + ["Orange", "Pink", "Brown", "Cyan"]
 
 
 def test_create_bot():
@@ -36,6 +42,12 @@ def test_create_bot_clever():
     assert len(bot._possible_combinations) == exp_length
 
 
+def test_create_bot_clever_is_lazy():
+    bot = bots.Bot_clever(PALETTE, True, 6)
+    assert isinstance(bot._possible_combinations, range)
+    assert len(bot._possible_combinations) == 10 ** 6
+
+
 def test_bot_clever_guess_combination():
     bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
     combination = bot.guess_combination()
@@ -44,72 +56,25 @@ def test_bot_clever_guess_combination():
         assert colour in ALLOWED_COLOURS
 
 
-def test_bot_clever_possible_colors_in_guess():
-    bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
-    bot._last_guess = ["Red", "Green", "Blue", "White"]
-    cor_len = 3
-    result = bot._possible_cols_in_guess(cor_len)
-    assert len(result) == 4
-
-
-def test_bot_clever_possible_colors_not_in_guess():
-    bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
-    bot._last_guess = ["Red", "Green", "Blue", "White"]
-    cor_len = 3
-    result = bot._possible_cols_not_in_guess(cor_len)
-    assert len(result) == 2
-
-
-def test_bot_clever_poss_col_combs():
-    bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
-    bot._last_guess = ["Red", "Green", "Blue", "White"]
-    cor_len = 3
-    in_guess = bot._possible_cols_in_guess(cor_len)
-    not_in_guess = bot._possible_cols_not_in_guess(cor_len)
-    result = bot._poss_col_combs(in_guess, not_in_guess)
-    assert len(result) == 8
-
-
-def test_bot_clever_poss_combs():
-    bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
-    bot._last_guess = ["Red", "Green", "Blue", "White"]
-    cor_len = 3
-    in_guess = bot._possible_cols_in_guess(cor_len)
-    not_in_guess = bot._possible_cols_not_in_guess(cor_len)
-    poss_col_combs = bot._poss_col_combs(in_guess, not_in_guess)
-    result = bot._poss_combs(poss_col_combs)
-    assert len(result) == 24*8
-
-
-def test_bot_clever_remove_wrong_combs():
+def test_bot_clever_possibilities_no_dupes():
     bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
     bot._last_guess = ["Red", "Green", "Blue", "White"]
-    cor_len = 3
-    in_guess = bot._possible_cols_in_guess(cor_len)
-    not_in_guess = bot._possible_cols_not_in_guess(cor_len)
-    poss_col_combs = bot._poss_col_combs(in_guess, not_in_guess)
-    poss_combs = bot._poss_combs(poss_col_combs)
-    result = bot._rem_wrong_combs(poss_combs, 3)
+    result = list(bot._possibilities(["Red", "Red", "Red"], "Red"))
     assert len(result) == 8
 
 
-def test_bot_clever_possibilities_no_dupes():
+def test_bot_clever_possibilities_use_white_pins():
     bot = bots.Bot_clever(ALLOWED_COLOURS, False, COMBINATION_LENGTH)
     bot._last_guess = ["Red", "Green", "Blue", "White"]
-    cor_len = 3
-    in_guess = bot._possible_cols_in_guess(cor_len)
-    not_in_guess = bot._possible_cols_not_in_guess(cor_len)
-    poss_col_combs = bot._poss_col_combs(in_guess, not_in_guess)
-    poss_combs = bot._poss_combs(poss_col_combs)
-    poss_combs = bot._rem_wrong_combs(poss_combs, 3)
-    result = bot._possibilities(["Red", "Red", "Red"], "Red")
-    assert len(result) == 8
+    result = list(bot._possibilities(["Red", "Red", "White", "White"],
+                                     "Red"))
+    assert len(result) == 6
 
 
 def test_bot_clever_possibilities_with_dupes():
     bot = bots.Bot_clever(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
     bot._last_guess = ["Red", "Red", "Blue", "White"]
-    result = bot._possibilities(["Red", "Red", "Red"], "Red")
+    result = list(bot._possibilities(["Red", "Red", "Red"], "Red"))
     assert len(result) == 20
 
 
@@ -120,6 +85,31 @@ def test_bot_clever_update_possible_combinations():
     assert len(bot._possible_combinations) == 20
 
 
+def test_bot_clever_guess_is_consistent_with_feedback():
+    bot = bots.Bot_clever(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    last_guess = ["Red", "Red", "Blue", "White"]
+    bot._last_guess = last_guess
+    bot.update_possible_combinations(["Red", "White"], "Red")
+    for _ in range(10):
+        guess = bot.guess_combination()
+        feedback = scoring.score(scoring.encode(last_guess, ALLOWED_COLOURS),
+                                 scoring.encode(guess, ALLOWED_COLOURS),
+                                 len(ALLOWED_COLOURS))
+        assert feedback == scoring.pack_feedback(1, 1)
+
+
+def test_bot_clever_guess_does_not_extract_ids():
+    bot = bots.Bot_clever(ALLOWED_COLOURS, True, COMBINATION_LENGTH,
+                          random.Random(4))
+    bot._last_guess = ["Red", "Red", "Blue", "White"]
+    bot.update_possible_combinations(["Red", "White"], "Red")
+    rng = random.Random(4)
+    guess = bot.guess_combination()
+    assert bot._possible_ids is None
+    expected = rng.choice(bot._possible_combinations)
+    assert scoring.encode(guess, ALLOWED_COLOURS) == bot._table.code(expected)
+
+
 def test_bot_set_combination():
     combination = bots.bot_set_combination(ALLOWED_COLOURS,
                                            False,
@@ -127,3 +117,140 @@ def test_bot_set_combination():
     assert len(combination) == COMBINATION_LENGTH
     for colour in combination:
         assert colour in ALLOWED_COLOURS
+
+
+def test_bot_knuth_opening_guess():
+    bot = bots.Bot_knuth(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    guess = bot.guess_combination()
+    guess_id = bot._table.rank(scoring.encode(guess, ALLOWED_COLOURS))
+    assert max(bot._partition_sizes(guess_id).values()) == 256
+
+
+def test_bot_knuth_solves_in_five_guesses():
+    for secret in [(0, 0, 0, 0), (5, 4, 3, 2), (1, 3, 1, 3), (2, 2, 5, 0)]:
+        bot = bots.Bot_knuth(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+        for _ in range(5):
+            guess = scoring.encode(bot.guess_combination(), ALLOWED_COLOURS)
+            feedback = scoring.score(guess, secret, len(ALLOWED_COLOURS))
+            if guess == secret:
+                break
+            pins = scoring.feedback_pins(feedback, "Red", "White")
+            bot.update_possible_combinations(pins, "Red")
+        assert guess == secret
+
+
+def test_bot_entropy_guess_combination():
+    bot = bots.Bot_entropy(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    combination = bot.guess_combination()
+    assert combination == ["Red", "Purple", "Yellow", "Blue"]
+    bot.update_possible_combinations(["Red", "White"], "Red")
+    assert len(bot._possible_combinations) < 1296
+
+
+def test_bot_entropy_process_pool_matches_sequential():
+    bot = bots.Bot_entropy(ALLOWED_COLOURS, True, COMBINATION_LENGTH, 2)
+    bot.PARALLEL_THRESHOLD = 0
+    sequential = bots.Bot_entropy(ALLOWED_COLOURS, True, COMBINATION_LENGTH, 1)
+    assert bot._best_guess() == sequential._best_guess()
+
+
+def test_bot_clever_update_is_bitset_and():
+    bot = bots.Bot_clever(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    bot._last_guess = ["Red", "Red", "Blue", "White"]
+    bot.update_possible_combinations(["Red", "White"], "Red")
+    possible = bot._possible_combinations
+    assert possible.typecode == "H"
+    assert bot._remaining() == len(possible)
+    bot._last_guess = ["Green", "Green", "Green", "Green"]
+    bot.update_possible_combinations([], "Red")
+    assert bot._remaining() == len(bot._possible_combinations)
+    assert bot._remaining() < len(possible)
+    for combination in bot._possible_combinations:
+        assert combination in possible
+        code = bot._table.code(combination)
+        assert scoring.encode(["Green"], ALLOWED_COLOURS)[0] not in code
+
+
+def test_bot_knuth_symmetry_reduction_keeps_choice():
+    bot = bots.Bot_knuth(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    bot._last_guess = ["Red", "Red", "Blue", "White"]
+    bot.update_possible_combinations(["Red", "White"], "Red")
+    candidates = bot._guess_candidates()
+    assert len(candidates) < bot._table.size
+    assert bot._best_guess() == bot._best_guess(range(bot._table.size))
+
+
+def test_bot_knuth_deadline_returns_possible_guess():
+    bot = bots.Bot_knuth(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    bot._last_guess = ["Red", "Red", "Blue", "White"]
+    bot.update_possible_combinations(["Red", "White"], "Red")
+    bot.set_deadline(0)
+    guess_id = bot._best_guess()
+    assert guess_id == bot._possible_combinations[0]
+    bot.set_deadline(None)
+    assert bot._guess_score(bot._best_guess()) <= bot._guess_score(guess_id)
+
+
+def test_bot_knuth_deadline_does_not_wait_for_representatives():
+    bot = bots.Bot_knuth(PALETTE, True, 6)
+    bot._symmetry.representatives = None
+    start = monotonic()
+    bot.set_deadline(start + 0.1)
+    guess = bot.guess_combination()
+    assert monotonic() - start < 1
+    assert bot.provisional_guess() == guess
+    assert len(guess) == 6
+
+
+def test_bot_background_plays_like_wrapped_bot():
+    secret = (2, 2, 5, 0)
+    plain = bots.Bot_knuth(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    background = bots.Bot_background(
+        bots.Bot_knuth(ALLOWED_COLOURS, True, COMBINATION_LENGTH), 60)
+    for _ in range(5):
+        guess = plain.guess_combination()
+        assert background.guess_combination() == guess
+        code = scoring.encode(guess, ALLOWED_COLOURS)
+        if code == secret:
+            break
+        pins = scoring.feedback_pins(scoring.score(code, secret,
+                                                   len(ALLOWED_COLOURS)),
+                                     "Red", "White")
+        plain.update_possible_combinations(pins, "Red")
+        background.update_possible_combinations(pins, "Red")
+    assert code == secret
+
+
+def test_bot_background_reraises_errors():
+    bot = bots.Bot_clever(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    background = bots.Bot_background(bot)
+    background.guess_combination()
+    bot._possible_mask = 0
+    background.update_possible_combinations([], "Red")
+    with pytest.raises(IndexError):
+        background.guess_combination()
+
+
+def test_bot_background_plays_best_guess_found_by_deadline():
+    release = threading.Event()
+    played = []
+
+    class Slow(bots.Bot_clever):
+        def guess_combination(self):
+            release.wait(5)
+            return super().guess_combination()
+
+        def update_possible_combinations(self, guess_correctness, RED_PIN):
+            played.append(self._last_guess)
+            super().update_possible_combinations(guess_correctness, RED_PIN)
+
+    bot = Slow(ALLOWED_COLOURS, True, COMBINATION_LENGTH)
+    background = bots.Bot_background(bot, 0.05)
+    start = monotonic()
+    guess = background.guess_combination()
+    assert monotonic() - start < 1
+    assert guess == ["Red"] * 4
+    release.set()
+    background.update_possible_combinations(["Red"], "Red")
+    background.guess_combination()
+    assert played == [guess]
@@ -0,0 +1,43 @@
+from itertools import product, permutations
+import pytest
+from codebook import Codebook
+
+
+def test_codebook_matches_itertools_order():
+    for no_of_colours, duplicates, le in [(6, False, 4), (7, False, 4),
+                                          (6, True, 4), (7, True, 4)]:
+        codebook = Codebook(no_of_colours, duplicates, le)
+        if duplicates:
+            codes = list(product(range(no_of_colours), repeat=le))
+        else:
+            codes = list(permutations(range(no_of_colours), le))
+        assert len(codebook) == len(codes)
+        assert list(codebook) == codes
+        for code_id, code in enumerate(codes):
+            assert codebook.rank(code) == code_id
+            assert codebook.unrank(code_id) == code
+
+
+def test_codebook_big_configuration():
+    codebook = Codebook(10, False, 6)
+    assert codebook.size == 151200
+    code = (9, 8, 7, 6, 5, 4)
+    assert codebook.rank(code) == codebook.size - 1
+    assert codebook.unrank(codebook.size - 1) == code
+
+
+def test_codebook_is_legal():
+    codebook = Codebook(6, False, 4)
+    assert codebook.is_legal((0, 1, 2, 3)) is True
+    assert codebook.is_legal((0, 1, 2, 2)) is False
+    assert codebook.is_legal((0, 1, 2)) is False
+    assert codebook.is_legal((0, 1, 2, 6)) is False
+    assert Codebook(6, True, 4).is_legal((0, 1, 2, 2)) is True
+
+
+def test_codebook_rejects_illegal():
+    codebook = Codebook(6, False, 4)
+    with pytest.raises(ValueError):
+        codebook.rank((1, 1, 2, 3))
+    with pytest.raises(ValueError):
+        codebook.unrank(codebook.size)
@@ -0,0 +1,60 @@
+import time
+import pytest
+import engine
+import scoring
+from bots import Bot_book, Bot_clever, Bot_random
+ALLOWED_COLOURS = ["Red", "Purple", "Yellow", "Blue", "Green", "White"]
+
+
+def test_play_game_won():
+    secret = ["Red", "Red", "Blue", "Green"]
+    record = engine.play_game(ALLOWED_COLOURS, True, 4, Bot_clever, secret)
+    assert record.won is True
+    assert len(record.guesses) == len(record.feedback)
+    assert record.feedback[-1] == scoring.pack_feedback(4, 0)
+    assert record.guesses[-1] == record.secret
+
+
+def test_play_game_lost():
+    secret = ["Red", "Purple", "Blue", "Green"]
+    record = engine.play_game(ALLOWED_COLOURS, False, 4, Bot_random, secret,
+                              max_rounds=1)
+    assert len(record.guesses) == 1
+    assert record.won == (record.guesses[0] == record.secret)
+
+
+def test_play_games():
+    records = list(engine.play_games(ALLOWED_COLOURS, True, 4, Bot_book, 20))
+    assert len(records) == 20
+    for record in records:
+        assert record.won is True
+        assert len(record.guesses) <= 5
+
+
+def test_play_game_observer():
+    observed = []
+    record = engine.play_game(ALLOWED_COLOURS, True, 4, Bot_book,
+                              observer=lambda secret, guesses, feedback:
+                              observed.append((secret, list(guesses),
+                                               bytes(feedback))))
+    assert len(observed) == len(record.guesses)
+    assert observed[-1] == (record.secret, list(record.guesses),
+                            record.feedback)
+
+
+def test_play_game_needs_a_round():
+    with pytest.raises(ValueError):
+        engine.play_game(ALLOWED_COLOURS, True, 4, Bot_clever, max_rounds=0)
+
+
+def test_think_time_includes_learning_from_feedback():
+    class Slow(Bot_clever):
+        def update_possible_combinations(self, guess_correctness, RED_PIN):
+            time.sleep(0.01)
+            super().update_possible_combinations(guess_correctness, RED_PIN)
+
+    record = engine.play_game(ALLOWED_COLOURS, True, 4, Slow,
+                              ["Red", "Red", "Blue", "Green"],
+                              observer=lambda *args: time.sleep(0.05))
+    updates = len(record.guesses) - 1
+    assert 0.01 * updates <= record.think_time < 0.01 * updates + 0.05
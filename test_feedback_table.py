@@ -0,0 +1,87 @@
+import pytest
+import scoring
+import feedback_table
+
+
+def test_code_space_sizes():
+    assert len(feedback_table.code_space(6, False, 4)) == 360
+    assert len(feedback_table.code_space(7, False, 4)) == 840
+    assert len(feedback_table.code_space(6, True, 4)) == 1296
+    assert len(feedback_table.code_space(7, True, 4)) == 2401
+
+
+def test_build_table_matches_score():
+    codes = feedback_table.code_space(4, True, 3)
+    table = feedback_table.build_table(codes, 4)
+    for guess_id, guess in enumerate(codes):
+        for secret_id, secret in enumerate(codes):
+            expected = scoring.score(guess, secret, 4)
+            assert table[guess_id * len(codes) + secret_id] == expected
+
+
+def test_load_table_saves_and_maps(tmp_path):
+    table = feedback_table.load_table(5, False, 3, str(tmp_path))
+    path = feedback_table.table_path(5, False, 3, str(tmp_path))
+    with open(path, "rb") as filehandle:
+        assert len(filehandle.read()) == table.size ** 2
+    feedback_table._loaded_tables.clear()
+    mapped = feedback_table.load_table(5, False, 3, str(tmp_path))
+    assert mapped is not table
+    assert mapped.row(7) == table.row(7)
+
+
+def test_table_score():
+    table = feedback_table.load_table(6, True, 4)
+    guess = (3, 0, 5, 2)
+    secret = (0, 0, 3, 2)
+    assert table.score(guess, secret) == scoring.pack_feedback(2, 1)
+    guess_id = table.rank(guess)
+    secret_id = table.rank(secret)
+    assert table.feedback(guess_id, secret_id) == scoring.pack_feedback(2, 1)
+
+
+def test_lazy_table_matches_code_space():
+    for duplicates in [True, False]:
+        codes = feedback_table.code_space(6, duplicates, 4)
+        table = feedback_table.LazyFeedbackTable(6, duplicates, 4)
+        assert table.size == len(codes)
+        row = table.row(17)
+        for code_id, code in enumerate(codes):
+            assert table.code(code_id) == code
+            assert table.rank(code) == code_id
+            assert row[code_id] == scoring.score(codes[17], code, 6)
+
+
+def test_load_table_big_configuration_is_lazy():
+    table = feedback_table.load_table(10, True, 6)
+    assert isinstance(table, feedback_table.LazyFeedbackTable)
+    assert table.size == 10 ** 6
+
+
+def test_masks_and_ids():
+    flags = bytes([1, 0, 1, 1, 0])
+    mask = feedback_table.bytes_to_mask(flags)
+    assert mask == 0b01101
+    assert list(feedback_table.mask_to_ids(mask, 5)) == [0, 2, 3]
+    assert feedback_table.ids_to_mask([0, 2, 3], 5) == mask
+    assert feedback_table.ids_to_mask(range(5), 5) == 0b11111
+
+
+def test_nth_id_matches_extracted_ids():
+    table = feedback_table.load_table(7, True, 4)
+    mask = table.mask(100, table.feedback(100, 2000))
+    ids = feedback_table.mask_to_ids(mask, table.size)
+    assert [feedback_table.nth_id(mask, n) for n in range(len(ids))] == \
+        list(ids)
+    with pytest.raises(IndexError):
+        feedback_table.nth_id(mask, len(ids))
+
+
+def test_table_mask_matches_row():
+    table = feedback_table.load_table(6, False, 4)
+    row = table.row(11)
+    feedback = row[200]
+    mask = table.mask(11, feedback)
+    for secret_id in range(table.size):
+        assert (mask >> secret_id & 1) == (row[secret_id] == feedback)
+    assert table.mask(11, feedback) is mask
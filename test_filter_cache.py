@@ -0,0 +1,48 @@
+from filter_cache import FilterCache, MASK_CACHE
+from feedback_table import load_table
+from scoring import pack_feedback
+
+
+def test_hits_and_misses():
+    cache = FilterCache()
+    assert cache.get("a") is None
+    cache.put("a", 0b1011)
+    assert cache.get("a") == 0b1011
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_rate"] == 0.5
+    assert stats["entries"] == 1
+
+
+def test_least_recently_used_evicted():
+    cache = FilterCache(max_bytes=2)
+    cache.put("a", 0xff)
+    cache.put("b", 0xff)
+    cache.get("a")
+    cache.put("c", 0xff)
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("a") == 0xff
+    assert cache.get("b") is None
+
+
+def test_resize_and_clear():
+    cache = FilterCache()
+    cache.put("a", 1 << 100)
+    cache.resize(1)
+    assert cache.stats()["entries"] == 0
+    assert cache.stats()["bytes"] == 0
+    cache.clear()
+    assert cache.stats()["evictions"] == 0
+
+
+def test_tables_share_cache():
+    table = load_table(6, True, 4)
+    feedback = pack_feedback(1, 1)
+    hits = MASK_CACHE.hits
+    first = table.mask(7, feedback)
+    assert table.mask(7, feedback) is first
+    assert MASK_CACHE.hits > hits
+    expected = [i for i in range(table.size)
+                if table.feedback(7, i) == feedback]
+    assert [i for i in range(table.size) if first >> i & 1] == expected
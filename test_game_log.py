@@ -0,0 +1,70 @@
+import pytest
+import game_log
+import user_interface
+from game_log import GameLogWriter, LoggedGame, read_games, replay, summarize
+from game_logic import MODES, RED_PIN, WHITE_PIN, Game
+
+
+def test_write_and_read_games(tmp_path):
+    path = tmp_path / "games.log"
+    games = [
+        LoggedGame(2, 6, False, True, 4, 1295, (7, 1295), b"\x01\x40", True),
+        LoggedGame(3, 10, True, True, 6, 1771560, (0, 1771560),
+                   b"\x00\x60", True),
+        LoggedGame(1, 6, False, False, 4, 5, (), b"", False)
+    ]
+    with GameLogWriter(path) as writer:
+        writer.write(games[0])
+    with GameLogWriter(path) as writer:
+        for game in games[1:]:
+            writer.write(game)
+    assert list(read_games(path)) == games
+
+
+def test_truncated_record_is_skipped(tmp_path):
+    path = tmp_path / "games.log"
+    game = LoggedGame(2, 6, False, True, 4, 3, (1, 3), b"\x10\x40", True)
+    with GameLogWriter(path) as writer:
+        writer.write(game)
+        writer.write(game)
+    with open(path, "r+b") as filehandle:
+        filehandle.truncate(path.stat().st_size - 1)
+    assert list(read_games(path)) == [game]
+    assert summarize(path) == {"games": 1, "wins": 1, "mean_guesses": 2.0,
+                               "max_guesses": 2}
+
+
+def test_not_a_game_log(tmp_path):
+    path = tmp_path / "games.log"
+    path.write_bytes(b"not a log")
+    with pytest.raises(ValueError):
+        list(read_games(path))
+    with pytest.raises(ValueError):
+        GameLogWriter(path)
+
+
+def test_guessing_phase_is_logged_and_replayed(tmp_path, monkeypatch):
+    path = tmp_path / "games.log"
+    combination = ["Red", "Empty", "Blue", "Red"]
+    printed = []
+    monkeypatch.setattr(game_log, "GAME_LOG", str(path))
+    monkeypatch.setattr(game_log, "_default_writer", None)
+    monkeypatch.setattr(user_interface, "ai_guess_printer",
+                        lambda guesses, correctness:
+                        printed.append((list(guesses), list(correctness))))
+    monkeypatch.setattr(user_interface, "game_won", lambda *args: None)
+    game = Game(MODES[3], True, True, combination=combination)
+    game.guessing_phase()
+    game_log._default_writer.close()
+    [entry] = read_games(path)
+    assert entry == game.log_entry()
+    assert entry.won and entry.mode == MODES[3]
+    assert (entry.no_of_colours, entry.blanks, entry.le) == (6, True, 4)
+    played = printed[-1]
+    printed.clear()
+    replay(entry)
+    assert printed[-1] == played
+    assert played[0][-1] == combination
+    assert played[1][-1] == [RED_PIN] * 4
+    assert all(pin in (RED_PIN, WHITE_PIN) for pins in played[1]
+               for pin in pins)
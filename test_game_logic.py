@@ -6,6 +6,7 @@ from game_logic import (
                         EMPTY_NOTATION,
                         WHITE_PIN,
                         RED_PIN,
+                        PALETTE,
                         )
 from bots import Bot_clever
 
@@ -23,6 +24,24 @@ def test_create_game(monkeypatch):  # ogarnąć jak testować z inputami rzeczy
         assert element in ALLOWED_COLOURS
 
 
+def test_create_game_big_variant():
+    game = Game(MODES[1], True, True, 6, 10)
+    assert game._comb_len == 6
+    assert game._allowed_colours == PALETTE + [EMPTY_NOTATION]
+    assert len(game._combination) == 6
+    assert game._check_length(game._combination) is True
+
+
+def test_check_combination_big_variant():
+    game = Game(MODES[1], True, False, 5, 8)
+    game._combination = ["Pink", "Red", "Orange", "Orange", "Blue"]
+    game._guesses.append(["Orange", "Red", "Orange", "Pink", "Green"])
+    assert game.check_combination() == [RED_PIN, RED_PIN, WHITE_PIN, WHITE_PIN]
+    game._guess_correctness.append(game.check_combination())
+    game.check_if_won()
+    assert game._game_won is False
+
+
 def test_check_duplicates_no_dupes():
     game = Game(MODES[1], False, False)
     combination = ["Red", "Blue", "Purple", "White"]
@@ -127,3 +146,19 @@ def test_check_if_won_no_win():
     game.check_combination()
     game.check_if_won
     assert game._game_won is False
+
+
+def test_game_state_is_compact():
+    game = Game(MODES[1], True, False)
+    assert not hasattr(game, "__dict__")
+    game._combination = ["Red", "Red", "Blue", "Yellow"]
+    for guess in [["Blue", "Red", "White", "Yellow"],
+                  ["Red", "Red", "Blue", "Yellow"]]:
+        assert game.play_guess(guess) == game._guess_correctness[-1]
+    assert len(game._record) == COMBINATION_LENGTH * 3 + 2
+    assert game._guesses == [["Blue", "Red", "White", "Yellow"],
+                             ["Red", "Red", "Blue", "Yellow"]]
+    assert game._guess_correctness[0] == [RED_PIN, RED_PIN, WHITE_PIN]
+    assert game._combination == ["Red", "Red", "Blue", "Yellow"]
+    assert game.rounds_played() == 2
+    assert game.is_won() is True
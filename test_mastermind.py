@@ -0,0 +1,36 @@
+import subprocess
+import sys
+import pytest
+import mastermind
+
+
+def test_batch_modules_do_not_load_menus():
+    process = subprocess.run(
+        [sys.executable, "-c",
+         "import sys, engine, game_log, game_logic\n"
+         "print(sorted({'pick', 'curses', 'argparse'} & set(sys.modules)))"],
+        capture_output=True, text=True, check=True)
+    assert process.stdout.strip() == "[]"
+
+
+def test_import_times():
+    *times, (module, total) = mastermind.import_times("scoring")
+    assert module == "scoring"
+    assert "scoring" in [name for name, _ in times]
+    assert total >= max(self_time for _, self_time in times)
+
+
+def test_main_runs_command(monkeypatch):
+    calls = []
+
+    class Module:
+        def main():
+            calls.append(list(sys.argv))
+
+    monkeypatch.setattr(sys, "argv", ["mastermind.py"])
+    monkeypatch.setattr(mastermind.importlib, "import_module",
+                        lambda name: calls.append(name) or Module)
+    mastermind.main(["log", "games.log"])
+    assert calls == ["game_log", ["mastermind log", "games.log"]]
+    with pytest.raises(SystemExit):
+        mastermind.main(["unknown"])
@@ -0,0 +1,39 @@
+import scoring
+import feedback_table
+import opening_book
+import bots
+ALLOWED_COLOURS = ["Red", "Purple", "Yellow", "Blue", "Green", "White"]
+
+
+def test_book_solves_every_combination():
+    table = feedback_table.load_table(6, True, 4)
+    book = opening_book.load_book(6, True, 4)
+    win = scoring.pack_feedback(4, 0)
+    rounds = []
+    for secret_id in range(table.size):
+        node = book.root()
+        for attempt in range(1, 10):
+            feedback = table.feedback(book.guess(node), secret_id)
+            if feedback == win:
+                break
+            node = book.child(node, feedback)
+        rounds.append(attempt)
+    assert max(rounds) == 5
+
+
+def test_build_book_round_trip(tmp_path):
+    book = opening_book.load_book(4, False, 3, str(tmp_path))
+    path = opening_book.book_path(4, False, 3, str(tmp_path))
+    with open(path, "rb") as filehandle:
+        assert filehandle.read() == opening_book.build_book(4, False, 3)
+    assert book.child(book.root(), scoring.pack_feedback(3, 0)) is None
+
+
+def test_bot_book_guesses_from_book():
+    bot = bots.Bot_book(ALLOWED_COLOURS, False, 4)
+    book = opening_book.load_book(6, False, 4)
+    guess = bot.guess_combination()
+    assert scoring.encode(guess, ALLOWED_COLOURS) == \
+        bot._table.code(book.guess(book.root()))
+    bot.update_possible_combinations(["White"], "Red")
+    assert bot._node == book.child(book.root(), scoring.pack_feedback(0, 1))
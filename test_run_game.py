@@ -0,0 +1,73 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+import run_game
+
+
+def test_batch_games_with_secrets():
+    secrets = [["Red", "Red", "Blue", "Blue"], ["Green"] * 4]
+    results = list(run_game.batch_games(2, 0, "Bot_knuth", 3, secrets, 0))
+    assert [result["game"] for result in results] == [0, 1, 2]
+    assert [result["secret"] for result in results] == secrets + secrets[:1]
+    for result in results:
+        assert result["won"]
+        assert result["guesses"][-1] == result["secret"]
+        assert result["feedback"][-1] == [4, 0]
+        assert len(result["guesses"]) == len(result["feedback"]) <= 5
+
+
+def test_batch_games_are_reproducible():
+    first = list(run_game.batch_games(3, 1, "Bot_clever", 2, seed=5))
+    second = list(run_game.batch_games(3, 1, "Bot_clever", 2, seed=5))
+    assert [result["guesses"] for result in first] == \
+        [result["guesses"] for result in second]
+    assert len(first[0]["secret"]) == 5
+
+
+def test_batch_games_illegal_secret():
+    with pytest.raises(ValueError):
+        run_game.batch_games(0, 0, "Bot_clever", 1,
+                             [["Red", "Red", "Blue", "Blue"]])
+    with pytest.raises(ValueError):
+        run_game.batch_games(0, 0, "Bot_clever", 1,
+                             [["Red", "Pink", "Blue", "Green"]])
+
+
+def test_batch_main_writes_json_lines(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["run_game.py", "--games", "4",
+                                      "--codebreaker", "Bot_random",
+                                      "--seed", "1"])
+    run_game.batch_main()
+    lines = capsys.readouterr().out.splitlines()
+    assert [json.loads(line)["game"] for line in lines] == [0, 1, 2, 3]
+
+
+@pytest.mark.parametrize("arguments", [["--games", "-3"],
+                                       ["--secret", "Red", "Pink"]])
+def test_batch_main_rejects_arguments(monkeypatch, capsys, arguments):
+    monkeypatch.setattr(sys, "argv", ["run_game.py"] + arguments)
+    with pytest.raises(SystemExit) as error:
+        run_game.batch_main()
+    assert error.value.code == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_batch_main_does_not_hide_errors_of_games(monkeypatch):
+    def broken_game(*args, **kwargs):
+        raise ValueError("broken bot")
+
+    monkeypatch.setattr(sys, "argv", ["run_game.py"])
+    monkeypatch.setattr(run_game, "play_game", broken_game)
+    with pytest.raises(ValueError, match="broken bot"):
+        run_game.batch_main()
+
+
+def test_batch_main_stops_at_closed_pipe():
+    process = subprocess.run(
+        f"{sys.executable} run_game.py --games 2000 --codebreaker Bot_random"
+        " | head -1", shell=True, capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.abspath(run_game.__file__)))
+    assert json.loads(process.stdout)["game"] == 0
+    assert process.stderr == ""
@@ -0,0 +1,35 @@
+import scoring
+COLOURS = ["Red", "Purple", "Yellow", "Blue", "Green", "White"]
+
+
+def test_encode_decode():
+    combination = ["Blue", "Red", "White", "Blue"]
+    code = scoring.encode(combination, COLOURS)
+    assert code == (3, 0, 5, 3)
+    assert scoring.decode(code, COLOURS) == combination
+
+
+def test_pack_unpack_feedback():
+    feedback = scoring.pack_feedback(2, 1)
+    assert scoring.unpack_feedback(feedback) == (2, 1)
+
+
+def test_score_reds_and_whites():
+    guess = scoring.encode(["Blue", "Red", "White", "Yellow"], COLOURS)
+    secret = scoring.encode(["Red", "Red", "Blue", "Yellow"], COLOURS)
+    assert scoring.score(guess, secret, len(COLOURS)) == \
+        scoring.pack_feedback(2, 1)
+
+
+def test_score_duplicates_counted_once():
+    guess = scoring.encode(["Red", "Red", "Red", "Blue"], COLOURS)
+    secret = scoring.encode(["Blue", "Red", "Green", "Green"], COLOURS)
+    assert scoring.score(guess, secret, len(COLOURS)) == \
+        scoring.pack_feedback(1, 1)
+
+
+def test_feedback_pins():
+    feedback = scoring.pack_feedback(1, 2)
+    pins = scoring.feedback_pins(feedback, "Red", "White")
+    assert pins == ["Red", "White", "White"]
+    assert scoring.pins_feedback(pins, "Red") == feedback
@@ -0,0 +1,65 @@
+import asyncio
+import server
+
+
+async def _client(port, commands):
+    reader, writer = await asyncio.open_connection(server.HOST, port)
+    replies = [await reader.readline()]
+    for command in commands:
+        writer.write(command.encode() + b"\n")
+    await writer.drain()
+    replies.extend([line async for line in reader])
+    writer.close()
+    return [reply.decode().strip() for reply in replies]
+
+
+async def _play(commands, clients=1):
+    tcp = await server.start_server(port=0, workers=2)
+    port = tcp.sockets[0].getsockname()[1]
+    async with tcp:
+        return await asyncio.gather(*(_client(port, commands)
+                                      for _ in range(clients)))
+
+
+def test_player_guesses_ai_combination():
+    replies, = asyncio.run(_play(["NEW 1 0",
+                                  "GUESS Red Red Blue White",
+                                  "GUESS Red Blue",
+                                  "GUESS Red Blue Green White",
+                                  "QUIT"]))
+    assert replies[0].startswith("MASTERMIND")
+    assert replies[1] == "OK Red Purple Yellow Blue Green White"
+    assert replies[2].startswith("ERROR")
+    assert replies[3].startswith("ERROR")
+    assert replies[4].startswith("FEEDBACK")
+    assert replies[-1] == "BYE"
+
+
+def test_many_sessions_with_ai_codebreakers():
+    commands = ["NEW 3 2 0 Red Red Blue White",
+                "NEW 4 0 0 Red Blue Green White",
+                "QUIT"]
+    for replies in asyncio.run(_play(commands, clients=30)):
+        wins = [reply for reply in replies if reply.startswith("WON")]
+        assert len(wins) == 2
+        second = replies.index("OK Red Purple Yellow Blue Green White", 2)
+        guesses = [[reply for reply in game if reply.startswith("GUESS")]
+                   for game in (replies[:second], replies[second:])]
+        assert guesses[0][-1] == "GUESS Red Red Blue White"
+        assert guesses[1][-1] == "GUESS Red Blue Green White"
+        assert replies[-1] == "BYE"
+
+
+def test_session_reports_errors():
+    async def run():
+        session = server.Session()
+        return [[reply async for reply in session.handle(line)]
+                for line in ["NEW 2 0", "NEW 9 0 0", "FOO",
+                             "NEW 0 0 0 Red Red Blue White", "GUESS Red"]]
+    replies = asyncio.run(run())
+    assert replies[0] == ["ERROR Combination to be guessed is required"]
+    assert replies[1][0].startswith("ERROR")
+    assert replies[2][0].startswith("ERROR Unknown command")
+    assert replies[3] == ["ERROR ['Red', 'Red', 'Blue', 'White'] contains "
+                          "duplicates - not allowed"]
+    assert replies[4][0].startswith("ERROR No game")
@@ -0,0 +1,56 @@
+from codebook import Codebook
+from feedback_table import load_table
+from symmetry import Symmetry
+
+
+def test_first_guesses_collapse_to_patterns():
+    assert len(Symmetry(6, 4).representatives(Codebook(6, True, 4))) == 5
+    assert len(Symmetry(6, 4).representatives(Codebook(6, False, 4))) == 1
+
+
+def test_canonical_is_smallest_in_class():
+    symmetry = Symmetry(6, 4)
+    assert symmetry.canonical((5, 3, 5, 1)) == (0, 0, 1, 2)
+    assert symmetry.is_canonical((0, 0, 1, 2))
+    assert not symmetry.is_canonical((0, 1, 0, 2))
+
+
+def test_symmetries_keep_previous_guesses():
+    symmetry = Symmetry(6, 4).after((0, 0, 1, 1))
+    assert symmetry.canonical((0, 0, 1, 1)) == (0, 0, 1, 1)
+    assert symmetry.canonical((1, 1, 0, 0)) == (1, 1, 0, 0)
+    assert symmetry.canonical((1, 0, 1, 1)) == (0, 0, 0, 1)
+    assert symmetry.canonical((5, 0, 4, 1)) == (0, 2, 1, 3)
+    assert symmetry.canonical((0, 1, 0, 1)) == (0, 1, 0, 1)
+
+
+def test_trivial_symmetry_keeps_all_guesses():
+    symmetry = Symmetry(6, 4).after((0, 1, 2, 3)).after((4, 0, 1, 2))
+    assert symmetry.is_trivial()
+    assert symmetry.representatives(Codebook(6, True, 4)) == range(1296)
+
+
+def test_classes_have_equal_partitions():
+    table = load_table(6, True, 4)
+    codebook = table.codebook
+    symmetry = Symmetry(6, 4).after((0, 0, 1, 2))
+    guess = table.rank((0, 0, 1, 2))
+    possible = [code_id for code_id in range(table.size)
+                if table.feedback(guess, code_id) == table.feedback(guess, 7)]
+    for code in codebook:
+        canonical = table.rank(symmetry.canonical(code))
+        row = table.row(table.rank(code))
+        canonical_row = table.row(canonical)
+        assert sorted(row[i] for i in possible) == \
+            sorted(canonical_row[i] for i in possible)
+
+
+def test_representatives_are_found_lazily():
+    codebook = Codebook(10, True, 6)
+    symmetry = Symmetry(10, 6)
+    representatives = symmetry.iter_representatives(codebook)
+    assert [next(representatives) for _ in range(3)] == [0, 1, 11]
+    assert list(symmetry.iter_representatives(codebook, lambda: True)) == []
+    small = Symmetry(6, 4)
+    assert list(small.iter_representatives(Codebook(6, True, 4))) == \
+        small.representatives(Codebook(6, True, 4))
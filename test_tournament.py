@@ -0,0 +1,50 @@
+import tournament
+from engine import GameRecord
+
+
+def test_statistics_add_and_merge():
+    first = tournament.Statistics()
+    first.add(GameRecord(0, (1, 2, 0), b"\x01\x02\x40", True, 0.3))
+    second = tournament.Statistics()
+    second.add(GameRecord(5, (1,), b"\x01", False, 0.1))
+    first.merge(second)
+    assert first.games == 2
+    assert first.max_guesses == 3
+    assert first.mean_guesses() == 2
+    assert first.win_rate() == 0.5
+    assert abs(first.time_per_move() - 0.1) < 1e-9
+
+
+def test_game_rng_is_reproducible():
+    first = tournament.game_rng(7, 3)
+    second = tournament.game_rng(7, 3)
+    assert first.random() == second.random()
+    other = tournament.game_rng(7, 4)
+    assert other.random() != tournament.game_rng(7, 3).random()
+
+
+def test_run_tournament_does_not_depend_on_workers():
+    sequential = tournament.run_tournament("Bot_clever", 2, 40, seed=1,
+                                           workers=1, chunk_size=7)
+    parallel = tournament.run_tournament("Bot_clever", 2, 40, seed=1,
+                                         workers=2, chunk_size=7)
+    assert sequential.games == parallel.games == 40
+    assert sequential.total_guesses == parallel.total_guesses
+    assert sequential.max_guesses == parallel.max_guesses
+    assert sequential.wins == 40
+
+
+def test_cache_statistics_collected():
+    statistics = tournament.run_tournament("Bot_clever", 2, 50, workers=1)
+    assert statistics.cache_hits + statistics.cache_misses > 0
+    assert 0.0 < statistics.cache_hit_rate() <= 1.0
+
+
+def test_main_reports_missing_optimum(monkeypatch, capsys):
+    monkeypatch.setattr("sys.argv", ["tournament.py", "--configuration", "3",
+                                     "--games", "2", "--workers", "1"])
+    tournament.main()
+    assert "4.6764" in capsys.readouterr().out.splitlines()[-1]
+    monkeypatch.setattr(tournament, "load_results", lambda: {})
+    tournament.main()
+    assert "not available" in capsys.readouterr().out.splitlines()[-1]
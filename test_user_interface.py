@@ -1,3 +1,4 @@
+import io
 import user_interface
 
 
@@ -28,6 +29,35 @@ def test_second_match(capsys, monkeypatch):
     assert result.out == output
 
 
+def test_renderer_draws_only_new_rows(monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda _: "")
+    stream = io.StringIO()
+    renderer = user_interface.Renderer(stream)
+    guesses = [["Red", "Blue", "Red", "Blue"], ["Blue", "Red", "Red", "Red"]]
+    correctness = [["Red", "White"], ["White"]]
+    renderer.board("AI Guesses:", guesses[:1], correctness[:1])
+    renderer.prompt("Press Enter")
+    first = stream.getvalue()
+    assert first == user_interface.CLEAR + "AI Guesses:\n" + \
+        user_interface.guess_printer(guesses[:1], correctness[:1]) + "\n"
+    renderer.board("AI Guesses:", guesses, correctness)
+    assert stream.getvalue()[len(first):] == \
+        user_interface.LINES_UP.format(2) + user_interface.CLEAR_BELOW + \
+        user_interface.guess_printer(guesses[1:], correctness[1:]) + "\n"
+    renderer.forget()
+    renderer.board("AI Guesses:", guesses, correctness)
+    assert stream.getvalue().endswith(
+        user_interface.CLEAR + "AI Guesses:\n" +
+        user_interface.guess_printer(guesses, correctness) + "\n")
+
+
+def test_clear_screen_does_not_start_processes(capsys, monkeypatch):
+    monkeypatch.setattr(user_interface.Renderer, "_ansi_enabled", True)
+    monkeypatch.setattr(user_interface.os, "system", None)
+    user_interface.clear_screen()
+    assert capsys.readouterr().out == user_interface.CLEAR
+
+
 if __name__ == "__main__":
     test_colorful_string_gen()
     test_colorful_string_gen_color_not_in_range()
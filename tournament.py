@@ -0,0 +1,239 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from os import cpu_count
+from random import Random
+from analyzer import load_results, result_key
+from bots import CODEBREAKERS
+from engine import play_game
+from filter_cache import MASK_CACHE
+from game_logic import (
+                        CONFIGURATIONS,
+                        COMBINATION_LENGTH,
+                        NO_OF_ROUNDS,
+                        SETTINGS,
+                        game_colours,
+                        )
+
+
+class Statistics:
+    """
+    A class used to collect results of many games
+
+    Attributes:
+        games (int): Number of played games
+        wins (int): Number of games won within the limit of rounds
+        total_guesses (int): Number of guesses in all games
+        max_guesses (int): Number of guesses in the longest game
+        think_time (float): Seconds spent by codebreakers on choosing
+        all guesses and learning from their feedback
+        cache_hits (int): Candidate filters taken from MASK_CACHE
+        cache_misses (int): Candidate filters computed and added to MASK_CACHE
+
+    Methods:
+        __init__: creates statistics object
+        add: adds result of one game
+        merge: adds statistics collected by other worker
+        mean_guesses: returns mean number of guesses per game
+        win_rate: returns fraction of won games
+        time_per_move: returns mean number of seconds per guess
+        cache_hit_rate: returns fraction of filters taken from MASK_CACHE
+    """
+    def __init__(self):
+        """
+        Creates empty statistics object
+        """
+        self.games = 0
+        self.wins = 0
+        self.total_guesses = 0
+        self.max_guesses = 0
+        self.think_time = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def add(self, record):
+        """
+        Adds result of one game
+
+        Args:
+            record (GameRecord): Result of the game
+        """
+        self.games += 1
+        self.wins += record.won
+        self.total_guesses += len(record.guesses)
+        self.max_guesses = max(self.max_guesses, len(record.guesses))
+        self.think_time += record.think_time
+
+    def merge(self, other):
+        """
+        Adds statistics collected by other worker
+
+        Args:
+            other (Statistics): Statistics to be added
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.total_guesses += other.total_guesses
+        self.max_guesses = max(self.max_guesses, other.max_guesses)
+        self.think_time += other.think_time
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+
+    def mean_guesses(self):
+        """
+        Returns mean number of guesses per game
+
+        Returns:
+            float: Mean number of guesses
+        """
+        return self.total_guesses / self.games if self.games else 0.0
+
+    def win_rate(self):
+        """
+        Returns fraction of games won within the limit of rounds
+
+        Returns:
+            float: Fraction of won games
+        """
+        return self.wins / self.games if self.games else 0.0
+
+    def time_per_move(self):
+        """
+        Returns mean number of seconds spent on one guess
+
+        Returns:
+            float: Seconds per guess
+        """
+        if not self.total_guesses:
+            return 0.0
+        return self.think_time / self.total_guesses
+
+    def cache_hit_rate(self):
+        """
+        Returns fraction of candidate filters taken from MASK_CACHE
+
+        Returns:
+            float: Fraction of cache lookups, which were hits
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+
+def game_rng(seed, game_no):
+    """
+    Returns source of randomness for one game. It depends only on
+    tournament seed and game number, so results do not depend on
+    the number of workers
+
+    Args:
+        seed (int): Seed of the tournament
+        game_no (int): Number of the game
+
+    Returns:
+        Random: Source of randomness for the game
+    """
+    return Random(f"{seed}:{game_no}")
+
+
+def _play_chunk(job):
+    """
+    Plays range of games of the tournament. Used by worker processes
+
+    Args:
+        job (tuple): Name of codebreaker, configuration number, seed,
+        number of the first game and number of the game after the last
+
+    Returns:
+        Statistics: Statistics of played games
+    """
+    codebreaker, configuration, seed, start, stop = job
+    duplicates, blanks = SETTINGS[configuration]
+    colours = game_colours(blanks)
+    statistics = Statistics()
+    hits, misses = MASK_CACHE.hits, MASK_CACHE.misses
+    for game_no in range(start, stop):
+        statistics.add(play_game(colours,
+                                 duplicates,
+                                 COMBINATION_LENGTH,
+                                 CODEBREAKERS[codebreaker],
+                                 max_rounds=NO_OF_ROUNDS,
+                                 rng=game_rng(seed, game_no)))
+    statistics.cache_hits = MASK_CACHE.hits - hits
+    statistics.cache_misses = MASK_CACHE.misses - misses
+    return statistics
+
+
+def run_tournament(codebreaker, configuration, no_of_games, seed=0,
+                   workers=None, chunk_size=500):
+    """
+    Plays many games in a process pool and merges their statistics
+
+    Args:
+        codebreaker (str): Name of codebreaker (key of CODEBREAKERS)
+        configuration (int): Number of configuration from CONFIGURATIONS
+        no_of_games (int): Number of games to be played
+        seed (int, optional): Seed of the tournament. Defaults to 0.
+        workers (int, optional): Number of processes. Defaults to None,
+        which means number of processors
+        chunk_size (int, optional): Number of games sent to a worker at once.
+        Defaults to 500.
+
+    Returns:
+        Statistics: Statistics of all games
+    """
+    jobs = [(codebreaker, configuration, seed, start,
+             min(start + chunk_size, no_of_games))
+            for start in range(0, no_of_games, chunk_size)]
+    statistics = Statistics()
+    if workers == 1:
+        for job in jobs:
+            statistics.merge(_play_chunk(job))
+        return statistics
+    with ProcessPoolExecutor(workers or cpu_count()) as pool:
+        for result in pool.map(_play_chunk, jobs):
+            statistics.merge(result)
+    return statistics
+
+
+def main():
+    """
+    Runs tournament with parameters given in command line
+    and prints its statistics
+    """
+    parser = argparse.ArgumentParser(description="Mastermind bot tournament")
+    parser.add_argument("--bot", choices=CODEBREAKERS, default="Bot_clever")
+    parser.add_argument("--configuration", type=int, default=2,
+                        choices=range(len(CONFIGURATIONS)))
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-bytes", type=int, default=None,
+                        help="limit of candidate filter cache per process")
+    args = parser.parse_args()
+    if args.cache_bytes is not None:
+        os.environ["MASTERMIND_FILTER_CACHE_BYTES"] = str(args.cache_bytes)
+        MASK_CACHE.resize(args.cache_bytes)
+    statistics = run_tournament(args.bot, args.configuration, args.games,
+                                args.seed, args.workers)
+    print(f"{args.bot}, {CONFIGURATIONS[args.configuration]}")
+    print(f"Games: {statistics.games}")
+    print(f"Mean guesses: {statistics.mean_guesses():.4f}")
+    print(f"Max guesses: {statistics.max_guesses}")
+    print(f"Win rate: {statistics.win_rate():.4f}")
+    print(f"Time per move: {statistics.time_per_move() * 1000:.3f} ms")
+    print(f"Filter cache hit rate: {statistics.cache_hit_rate():.4f}")
+    duplicates, blanks = SETTINGS[args.configuration]
+    optimal = load_results().get(result_key(len(game_colours(blanks)),
+                                            duplicates, COMBINATION_LENGTH))
+    if not optimal:
+        print("Optimal mean guesses: not available, run analyzer.py "
+              f"--configuration {args.configuration} --save")
+        return
+    gap = statistics.mean_guesses() - optimal["mean_guesses"]
+    print(f"Optimal mean guesses: {optimal['mean_guesses']:.4f} "
+          f"(gap {gap:+.4f}), optimal max guesses: "
+          f"{optimal['max_guesses']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,153 @@
-from pick import pick
 import os
+import sys
 CURSOR = "=>"  # Cursor for pick method
 path_to_file = os.path.dirname(__file__)
 instructions_path = os.path.join(path_to_file, './instructions.txt')
+CLEAR = "\033[H\033[2J"  # ANSI: cursor to top left corner, clear screen
+CLEAR_BELOW = "\033[J"  # ANSI: clear screen from cursor to the end
+LINES_UP = "\033[{}F"  # ANSI: cursor to the beginning of n-th line above
+
+
+class Renderer:
+    """
+    A class used to draw screens in terminal with ANSI escape codes,
+    without starting other processes. Board of guesses is drawn
+    incrementally: if it is still on the screen, only new rows are written,
+    so cost of drawing a move does not depend on number of guesses
+
+    Attributes:
+        _stream (TextIO): Output of the renderer, None for sys.stdout
+        _rows (int): Rows of the board on the screen, None if screen
+        does not show the board
+        _lines_below (int): Lines written below the board
+
+    Properties:
+        stream (TextIO): Output of the renderer
+
+    Methods:
+        __init__: creates renderer object
+        write: writes text to the output
+        forget: marks that screen does not show the board
+        clear: clears the screen
+        board: draws board of guesses, writing only new rows if possible
+        line: writes line below the board
+        prompt: shows prompt below the board and waits for Enter
+    """
+    _ansi_enabled = os.name != "nt"  # Windows console needs enabling once
+
+    def __init__(self, stream=None):
+        """
+        Creates renderer object
+
+        Args:
+            stream (TextIO, optional): Output of the renderer.
+            Defaults to None, which means current sys.stdout
+        """
+        self._stream = stream
+        self._rows = None
+        self._lines_below = 0
+
+    @property
+    def stream(self):
+        """
+        Returns output of the renderer
+
+        Returns:
+            TextIO: Output of the renderer
+        """
+        return sys.stdout if self._stream is None else self._stream
+
+    def write(self, text):
+        """
+        Writes text to the output at once
+
+        Args:
+            text (str): Text to be written
+        """
+        self.stream.write(text)
+        self.stream.flush()
+
+    def forget(self):
+        """
+        Marks that screen does not show the board any more
+        """
+        self._rows = None
+
+    def clear(self):
+        """
+        Clears the screen
+        """
+        if not Renderer._ansi_enabled:
+            os.system("")  # Enables ANSI escape codes in Windows console
+            Renderer._ansi_enabled = True
+        self.write(CLEAR)
+        self.forget()
+
+    def board(self, title, guesses, correctness):
+        """
+        Draws title and rows of guesses followed by an empty line.
+        If the board with fewer rows is on the screen, lines below it
+        are cleared and only new rows are written
+
+        Args:
+            title (str): Line above the board
+            guesses (list): Guesses
+            correctness (list): Correctness of guesses
+        """
+        rows = len(correctness)
+        if self._rows is None or self._rows > rows:
+            self.clear()
+            text = f"{title}\n{guess_printer(guesses, correctness)}\n"
+        else:
+            text = (LINES_UP.format(self._lines_below + 1) + CLEAR_BELOW +
+                    guess_printer(guesses[self._rows:],
+                                  correctness[self._rows:]) + "\n")
+        self.write(text)
+        self._rows = rows
+        self._lines_below = 0
+
+    def line(self, text):
+        """
+        Writes line below the board
+
+        Args:
+            text (str): Line to be written
+        """
+        self.write(text + "\n")
+        self._lines_below += 1
+
+    def prompt(self, message):
+        """
+        Shows prompt below the board and waits for Enter
+
+        Args:
+            message (str): Prompt to be shown
+        """
+        input(message)
+        self._lines_below += 1
+
+
+RENDERER = Renderer()  # Draws all screens of the game
+
+
+def pick(*args, **kwargs):
+    """
+    Shows menu of pick package. The package, which loads curses,
+    is imported on first menu, so that programs without menus start faster
+
+    Returns:
+        tuple or list: Chosen option or options with their indexes
+    """
+    from pick import pick as pick_menu
+    RENDERER.forget()
+    return pick_menu(*args, **kwargs)
 
 
 def clear_screen():
     """
-    Clears terminal
+    Clears terminal with ANSI escape codes
     """
-    os.system('cls' if os.name == 'nt' else 'clear')
+    RENDERER.clear()
 
 
 def rules():
@@ -46,6 +184,21 @@ def choose_settings(configurations):
     return result[1]
 
 
+def choose_variant(variants):
+    """
+    Allows player to choose combination length and number of colours
+
+    Args:
+        variants (list): Possible game variants
+
+    Returns:
+        int: Number representing chosen option
+    """
+    title = "Please choose the game variant:"
+    result = pick(variants, title, CURSOR)
+    return result[1]
+
+
 def main_menu(options):
     """
     Allows player to choose game mode
@@ -90,10 +243,8 @@ def guess_printer(guesses, correctness):
     Returns:
         str: Guesses and their correctness in string form
     """
-    guess_info = ""
-    for guess, result in (zip(guesses, correctness)):
-        guess_info += f"Guess: {guess}. Result: {result}\n"
-    return guess_info
+    return "".join(f"Guess: {guess}. Result: {result}\n"
+                   for guess, result in zip(guesses, correctness))
 
 
 def set_combination(cols, dupes, le, guesses=None, correctness=None):
@@ -128,15 +279,15 @@ def set_combination(cols, dupes, le, guesses=None, correctness=None):
 
 def ai_guess_printer(guesses, correctness):
     """
-    Displays guesses if AI is guessing
+    Displays guesses if AI is guessing. Only the new guess is drawn,
+    if previous ones are on the screen
 
     Args:
         guesses (list): Previous guesses
         correctness (list): Correctness of previous guesses
     """
-    clear_screen()
-    print(f"AI Guesses:\n{guess_printer(guesses, correctness)}")
-    input("Press Enter for next guess")
+    RENDERER.board("AI Guesses:", guesses, correctness)
+    RENDERER.prompt("Press Enter for next guess")
 
 
 def colourful_string_gen(array):
@@ -159,6 +310,10 @@ def colourful_string_gen(array):
         "Blue": f"{colours_prefix}0;36m",
         "Green": f"{colours_prefix}0;32m",
         "Yellow": f"{colours_prefix}0;33m",
+        "Orange": f"{colours_prefix}38;5;208m",
+        "Pink": f"{colours_prefix}38;5;213m",
+        "Brown": f"{colours_prefix}38;5;94m",
+        "Cyan": f"{colours_prefix}0;96m",
         "End": f" {colours_prefix}0m"
     }
     end = colours["End"]